@@ -1,30 +1,252 @@
-from fastapi import FastAPI, APIRouter, Depends
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from fastapi import FastAPI, APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from common.dto.auth_dto import RegisterRequest, LoginRequest
-from common.db_setup import get_db
-from common.security import create_access_token, verify_password, get_password_hash
-from common.entity import User
+from common.dto.auth_dto import RegisterRequest, LoginRequest, RefreshRequest
+from common.db_setup import get_db, get_async_db, get_read_db, get_async_read_db, USE_ASYNC_DB
+from common.security import create_access_token, create_refresh_token, refresh_token_digest, verify_password_async, get_password_hash_async
+from common.hashing_pool import hashing_pool
+from common.entity import User, RefreshToken
+from common.count_strategy import invalidate_count
 from common.dto.base_response_dto import ResponseDto
+from common.monitoring import router as monitoring_router, register_stats
+from common.rate_limit import login_rate_limiter, client_ip
+from common.metrics import MetricsMiddleware
+from common.read_replicas import ReadYourWritesMiddleware
 from common.error_types import ErrorType
 
+logger = logging.getLogger(__name__)
+
+
+# 종료 시 해시 작업자 프로세스도 함께 종료 (남아 있으면 리스닝 소켓을 계속 잡고 있다)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    hashing_pool.shutdown()
+
+
 app = FastAPI(
     title="Auth Service API",
     description="회원가입 및 로그인을 위한 백엔드 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 router = APIRouter(prefix="/auth")
+register_stats("login_rate_limit", login_rate_limiter.stats)
 
-@router.post("/register", description="회원가입 API")
-def register(user: RegisterRequest, db: Session = Depends(get_db)):
-    # 사용자 중복 확인
-    existing_user = db.query(User).filter(User.login_email == user.login_email).first()
-    if existing_user:
-        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+# 만료된 refresh token 정리 주기와 한 번에 삭제하는 최대 행 수
+REFRESH_TOKEN_PURGE_INTERVAL_SECONDS = float(os.getenv("REFRESH_TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+REFRESH_TOKEN_PURGE_BATCH_SIZE = int(os.getenv("REFRESH_TOKEN_PURGE_BATCH_SIZE", "1000"))
 
-    # 새로운 사용자 추가
-    hashed_password = get_password_hash(user.password)
-    new_user = User(
+
+class SessionStats:
+    """bcrypt 검증을 거치는 전체 로그인과 refresh token 재발급 횟수"""
+
+    def __init__(self):
+        self.logins = 0
+        self.refreshes = 0
+        self.refresh_rejected = 0
+        self.refresh_reuse_detected = 0
+        self.logouts = 0
+        self.purged_tokens = 0
+        self._lock = threading.Lock()
+
+    def count(self, name, amount: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def stats(self):
+        total = self.logins + self.refreshes
+        return {
+            "logins": self.logins,
+            "refreshes": self.refreshes,
+            "refresh_rejected": self.refresh_rejected,
+            "refresh_reuse_detected": self.refresh_reuse_detected,
+            "logouts": self.logouts,
+            "purged_tokens": self.purged_tokens,
+            "refresh_ratio": round(self.refreshes / total, 4) if total else 0.0,
+        }
+
+
+session_stats = SessionStats()
+register_stats("sessions", session_stats.stats)
+
+
+class TokenPurgeSchedule:
+    """만료된 refresh token 삭제 시점 (로그인 / refresh 요청에서 주기가 지났을 때만 실행)"""
+
+    def __init__(self, interval_seconds: float, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._next_run = 0.0
+        self._lock = threading.Lock()
+
+    # 주기가 지났으면 다음 실행 시각을 미루고 True (동시에 여러 요청이 삭제하지 않도록)
+    def due(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_run:
+                return False
+            self._next_run = now + self.interval_seconds
+            return True
+
+    # 한 번에 다 지우지 못했으면 다음 요청에서 이어서 삭제
+    def finished(self, deleted: int):
+        if deleted >= self.batch_size:
+            with self._lock:
+                self._next_run = 0.0
+
+
+token_purge_schedule = TokenPurgeSchedule(REFRESH_TOKEN_PURGE_INTERVAL_SECONDS, REFRESH_TOKEN_PURGE_BATCH_SIZE)
+
+
+# 이메일로 사용자 조회 (블로킹 DB 작업이므로 스레드풀에서 실행)
+def find_user_by_email(db: Session, login_email: str):
+    return db.query(User).filter(User.login_email == login_email).first()
+
+
+def save_user(db: Session, user: User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def save_refresh_token(db: Session, refresh_token: RefreshToken):
+    db.add(refresh_token)
+    db.commit()
+    purge_expired_tokens(db)
+
+
+async def find_user_by_email_async(db: AsyncSession, login_email: str):
+    return (await db.execute(select(User).where(User.login_email == login_email))).scalars().first()
+
+
+# access token과 새 refresh token 발급 (refresh token은 원문 대신 digest만 저장)
+def issue_tokens(user_id: int):
+    refresh_token, digest, expires_at = create_refresh_token()
+    data = {"access_token": create_access_token(user_id), "refresh_token": refresh_token}
+    return data, RefreshToken(user_id=user_id, token_hash=digest, expires_at=expires_at)
+
+
+# 유효한 refresh token을 폐기하면서 사용자 ID 반환 (같은 토큰으로 동시에 요청해도 한 요청만 성공)
+def rotate_refresh_token_stmt(digest: bytes, now: datetime):
+    return (update(RefreshToken)
+            .where(RefreshToken.token_hash == digest, RefreshToken.revoked_at.is_(None), RefreshToken.expires_at > now)
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id))
+
+
+def revoked_token_owner_stmt(digest: bytes):
+    return select(RefreshToken.user_id).where(RefreshToken.token_hash == digest, RefreshToken.revoked_at.is_not(None))
+
+
+def revoke_user_tokens_stmt(user_id: int, now: datetime):
+    return (update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now))
+
+
+# 만료된 refresh token 삭제 (expires_at 인덱스로 최대 limit개)
+# 폐기된 토큰도 만료 전까지는 재사용 감지에 필요하므로 남겨두고, 만료된 뒤에 삭제한다
+def purge_expired_tokens_stmt(now: datetime, limit: int):
+    expired = select(RefreshToken.id).where(RefreshToken.expires_at < now).limit(limit)
+    return delete(RefreshToken).where(RefreshToken.id.in_(expired.scalar_subquery()))
+
+
+# 토큰은 이미 저장되었으므로 정리에 실패해도 요청은 성공시키고 다음 주기에 다시 시도
+def purge_expired_tokens(db: Session):
+    if not token_purge_schedule.due():
+        return
+    try:
+        deleted = db.execute(purge_expired_tokens_stmt(datetime.utcnow(), token_purge_schedule.batch_size)).rowcount
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("failed to purge expired refresh tokens")
+        return
+    session_stats.count("purged_tokens", deleted)
+    token_purge_schedule.finished(deleted)
+
+
+async def purge_expired_tokens_async(db: AsyncSession):
+    if not token_purge_schedule.due():
+        return
+    try:
+        deleted = (await db.execute(purge_expired_tokens_stmt(datetime.utcnow(), token_purge_schedule.batch_size))).rowcount
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        logger.exception("failed to purge expired refresh tokens")
+        return
+    session_stats.count("purged_tokens", deleted)
+    token_purge_schedule.finished(deleted)
+
+
+def revoke_token_stmt(digest: bytes, now: datetime):
+    return (update(RefreshToken)
+            .where(RefreshToken.token_hash == digest, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now))
+
+
+# refresh token 교체 후 새 토큰 반환 (유효하지 않으면 None)
+def refresh_session(db: Session, refresh_token: str):
+    digest = refresh_token_digest(refresh_token)
+    now = datetime.utcnow()
+    user_id = db.execute(rotate_refresh_token_stmt(digest, now)).scalar()
+    if user_id is None:
+        # 이미 폐기된 토큰이 다시 사용되면 탈취된 것으로 보고 해당 사용자의 refresh token을 모두 폐기
+        reused_by = db.execute(revoked_token_owner_stmt(digest)).scalar()
+        if reused_by is not None:
+            db.execute(revoke_user_tokens_stmt(reused_by, now))
+            session_stats.count("refresh_reuse_detected")
+        db.commit()
+        return None
+    data, new_token = issue_tokens(user_id)
+    save_refresh_token(db, new_token)
+    return data
+
+
+async def refresh_session_async(db: AsyncSession, refresh_token: str):
+    digest = refresh_token_digest(refresh_token)
+    now = datetime.utcnow()
+    user_id = (await db.execute(rotate_refresh_token_stmt(digest, now))).scalar()
+    if user_id is None:
+        reused_by = (await db.execute(revoked_token_owner_stmt(digest))).scalar()
+        if reused_by is not None:
+            await db.execute(revoke_user_tokens_stmt(reused_by, now))
+            session_stats.count("refresh_reuse_detected")
+        await db.commit()
+        return None
+    data, new_token = issue_tokens(user_id)
+    db.add(new_token)
+    await db.commit()
+    await purge_expired_tokens_async(db)
+    return data
+
+
+def refresh_response(data):
+    if data is None:
+        session_stats.count("refresh_rejected")
+        return ResponseDto.error_response(ErrorType.INVALID_CREDENTIALS)
+    session_stats.count("refreshes")
+    return ResponseDto.success_response(data=data)
+
+
+def build_user(user: RegisterRequest, hashed_password: str):
+    return User(
         login_email=user.login_email,
         password=hashed_password,
         name=user.name,
@@ -32,25 +254,105 @@ def register(user: RegisterRequest, db: Session = Depends(get_db)):
         age=user.age,
         phone=user.phone
     )
-    db.add(new_user)
+
+
+# bcrypt 작업은 이벤트 루프를 막지 않도록 hashing_pool에서 처리
+@router.post("/register", description="회원가입 API")
+async def register(user: RegisterRequest, db: Session = Depends(get_db)):
+    # 사용자 중복 확인
+    existing_user = await run_in_threadpool(find_user_by_email, db, user.login_email)
+    if existing_user:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+
+    # 새로운 사용자 추가
+    hashed_password = await get_password_hash_async(user.password)
+    new_user = build_user(user, hashed_password)
+    await run_in_threadpool(save_user, db, new_user)
+    invalidate_count(User)
+    return ResponseDto.success_response(data=new_user.to_dict())
+
+# 시도 한도를 넘은 로그인 요청은 DB 세션(복제본 연결 포함)을 열거나 bcrypt 검증을 하기 전에 429 응답
+# (경로 데코레이터의 dependencies는 핸들러 인자의 DB 의존성보다 먼저 실행됨)
+def check_login_rate_limit(user: LoginRequest, request: Request):
+    login_rate_limiter.check(client_ip(request), user.login_email)
+
+@router.post("/login", description="로그인 API", dependencies=[Depends(check_login_rate_limit)])
+async def login(user: LoginRequest, db: Session = Depends(get_db),
+                read_db: Session = Depends(get_read_db)):
+    existing_user = await run_in_threadpool(find_user_by_email, read_db, user.login_email)
+    if not existing_user or not await verify_password_async(user.password, existing_user.password):
+        login_rate_limiter.record_failure(user.login_email)
+        return ResponseDto.error_response(ErrorType.INVALID_CREDENTIALS)
+
+    # 토큰 생성 시 user ID 사용
+    data, refresh_token = issue_tokens(existing_user.id)
+    await run_in_threadpool(save_refresh_token, db, refresh_token)
+    session_stats.count("logins")
+    return ResponseDto.success_response(data=data)
+
+# access token 만료 시 비밀번호(bcrypt) 검증 없이 refresh token으로 재발급 (사용한 refresh token은 폐기)
+@router.post("/refresh", description="토큰 재발급 API")
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    return refresh_response(refresh_session(db, body.refresh_token))
+
+@router.post("/logout", description="로그아웃 API (refresh token 폐기)")
+def logout(body: RefreshRequest, db: Session = Depends(get_db)):
+    db.execute(revoke_token_stmt(refresh_token_digest(body.refresh_token), datetime.utcnow()))
     db.commit()
-    db.refresh(new_user)
+    session_stats.count("logouts")
+    return ResponseDto.success_response()
+
+
+
+# AsyncSession 기반 핸들러 (USE_ASYNC_DB=true 인 경우 위의 핸들러 대신 사용)
+async_router = APIRouter(prefix="/auth")
+
+@async_router.post("/register", description="회원가입 API")
+async def register_async(user: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    # 사용자 중복 확인
+    existing_user = await find_user_by_email_async(db, user.login_email)
+    if existing_user:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+
+    # 새로운 사용자 추가
+    hashed_password = await get_password_hash_async(user.password)
+    new_user = build_user(user, hashed_password)
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    invalidate_count(User)
     return ResponseDto.success_response(data=new_user.to_dict())
 
-@router.post("/login", description="로그인 API")
-def login(user: LoginRequest, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.login_email == user.login_email).first()
-    print(existing_user)
-    if not existing_user or not verify_password(user.password, existing_user.password):
+@async_router.post("/login", description="로그인 API", dependencies=[Depends(check_login_rate_limit)])
+async def login_async(user: LoginRequest, db: AsyncSession = Depends(get_async_db),
+                      read_db: AsyncSession = Depends(get_async_read_db)):
+    existing_user = await find_user_by_email_async(read_db, user.login_email)
+    if not existing_user or not await verify_password_async(user.password, existing_user.password):
+        login_rate_limiter.record_failure(user.login_email)
         return ResponseDto.error_response(ErrorType.INVALID_CREDENTIALS)
 
     # 토큰 생성 시 user ID 사용
-    token = create_access_token(existing_user.id)
-    return ResponseDto.success_response(data={"access_token": token})
+    data, refresh_token = issue_tokens(existing_user.id)
+    db.add(refresh_token)
+    await db.commit()
+    await purge_expired_tokens_async(db)
+    session_stats.count("logins")
+    return ResponseDto.success_response(data=data)
+
+@async_router.post("/refresh", description="토큰 재발급 API")
+async def refresh_async(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    return refresh_response(await refresh_session_async(db, body.refresh_token))
 
+@async_router.post("/logout", description="로그아웃 API (refresh token 폐기)")
+async def logout_async(body: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    await db.execute(revoke_token_stmt(refresh_token_digest(body.refresh_token), datetime.utcnow()))
+    await db.commit()
+    session_stats.count("logouts")
+    return ResponseDto.success_response()
 
-app.include_router(router)
+app.include_router(async_router if USE_ASYNC_DB else router)
+app.include_router(monitoring_router)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    from common.server import run
+    run(app, port=8001)
@@ -0,0 +1,38 @@
+"""
+동기 / 비동기 DB 경로 비교 벤치마크
+
+실행 중인 post_service(또는 user_service)에 많은 동시 커넥션(기본 500개)으로 조회 요청을 보낸다.
+같은 서비스를 USE_ASYNC_DB=false / true 로 각각 띄운 뒤 --label을 바꿔 실행하여 결과를 비교한다.
+
+    USE_ASYNC_DB=true uvicorn post_service.main:app --port 8003
+    python -m benchmarks.async_db_benchmark --base-url http://localhost:8003 --path "/posts/?limit=10" --label async
+"""
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from benchmarks.load import run_load
+from common.security import create_access_token
+
+
+async def main(args):
+    headers = {"Authorization": f"Bearer {create_access_token(args.user_id)}"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=120) as client:
+        # 커넥션 및 DB 풀을 미리 데운다
+        await run_load(lambda _: client.get(args.path), min(args.concurrency, args.requests), args.concurrency)
+        result = await run_load(lambda _: client.get(args.path), args.requests, args.concurrency)
+    print(json.dumps({"label": args.label, "path": args.path, "concurrency": args.concurrency, **result}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동기 / 비동기 DB 경로 동시 접속 벤치마크")
+    parser.add_argument("--base-url", default="http://localhost:8003")
+    parser.add_argument("--path", default="/posts/?limit=10", help="요청할 경로")
+    parser.add_argument("--requests", type=int, default=10000, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=500, help="동시 커넥션 수")
+    parser.add_argument("--user-id", type=int, default=1, help="토큰을 발급할 사용자 id")
+    parser.add_argument("--label", default="", help="결과 구분용 이름 (예: sync, async)")
+    asyncio.run(main(parser.parse_args()))
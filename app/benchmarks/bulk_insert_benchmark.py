@@ -0,0 +1,84 @@
+"""
+일괄 등록 벤치마크
+
+실행 중인 post_service / user_service에 같은 수의 행을 단건 API(POST /posts, POST /users)와
+일괄 API(POST /posts/bulk, POST /users/bulk, JSON 배열 및 NDJSON)로 각각 넣어 걸린 시간을 비교한다.
+사용자 등록은 bcrypt 해시가 대부분의 시간을 차지하므로 --user-rows로 행 수를 따로 정할 수 있다.
+
+    python -m benchmarks.bulk_insert_benchmark --post-url http://localhost:8003 --user-url http://localhost:8002 \\
+        --rows 10000 --user-rows 10000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import orjson
+
+from benchmarks.load import run_load
+from common.security import create_access_token
+
+
+def post_rows(count, label):
+    return [{"title": f"Bulk benchmark {label} {index}", "content": "content " * 20} for index in range(count)]
+
+
+def user_rows(count, label):
+    run_id = int(time.time() * 1000)
+    return [
+        {"login_email": f"bulk-bench-{run_id}-{label}-{index}@example.com", "password": "benchpassword",
+         "name": "Bulk Bench", "gender": "Female", "age": 30, "phone": "000000000"}
+        for index in range(count)
+    ]
+
+
+async def single(client, path, rows, concurrency):
+    result = await run_load(lambda index: client.post(path, json=rows[index]), len(rows), concurrency)
+    return {"rows": len(rows), "elapsed_s": result["elapsed_s"], "rows_per_s": result["rps"],
+            "errors": result["errors"]}
+
+
+async def bulk(client, path, rows, ndjson):
+    if ndjson:
+        body = b"\n".join(orjson.dumps(row) for row in rows)
+        headers = {"Content-Type": "application/x-ndjson"}
+    else:
+        body = orjson.dumps(rows)
+        headers = {"Content-Type": "application/json"}
+    started = time.perf_counter()
+    response = await client.post(path, content=body, headers=headers)
+    elapsed = time.perf_counter() - started
+    data = response.json().get("data") or {}
+    return {"rows": len(rows), "elapsed_s": round(elapsed, 3), "rows_per_s": round(len(rows) / elapsed, 2),
+            "inserted": data.get("inserted"), "failed": data.get("failed")}
+
+
+async def compare(base_url, path, make_rows, count, concurrency, headers):
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=None) as client:
+        return {
+            "single": await single(client, path, make_rows(count, "single"), concurrency),
+            "bulk_json": await bulk(client, f"{path}bulk", make_rows(count, "json"), ndjson=False),
+            "bulk_ndjson": await bulk(client, f"{path}bulk", make_rows(count, "ndjson"), ndjson=True),
+        }
+
+
+async def main(args):
+    headers = {"Authorization": f"Bearer {create_access_token(args.user_id)}"}
+    results = {}
+    if args.rows:
+        results["posts"] = await compare(args.post_url, "/posts/", post_rows, args.rows, args.concurrency, headers)
+    if args.user_rows:
+        results["users"] = await compare(args.user_url, "/users/", user_rows, args.user_rows, args.concurrency, headers)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="단건 / 일괄 등록 API 비교")
+    parser.add_argument("--post-url", default="http://localhost:8003")
+    parser.add_argument("--user-url", default="http://localhost:8002")
+    parser.add_argument("--rows", type=int, default=10000, help="게시글 행 수 (0이면 생략)")
+    parser.add_argument("--user-rows", type=int, default=10000, help="사용자 행 수 (0이면 생략)")
+    parser.add_argument("--concurrency", type=int, default=1, help="단건 API 동시 요청 수")
+    parser.add_argument("--user-id", type=int, default=1, help="토큰을 발급할 사용자 id (게시글 작성자)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,55 @@
+import asyncio
+import math
+import time
+
+
+# 지연 시간 목록에서 백분위수 계산 (nearest-rank)
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# 측정 결과 요약 (지연 시간 단위: ms)
+def summarize(latencies, elapsed, errors=0, status_counts=None):
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_counts": status_counts or {},
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2) if latencies_ms else 0.0,
+    }
+
+
+# total 번의 요청을 concurrency 개의 작업자로 나누어 실행하고 결과를 요약
+async def run_load(send, total, concurrency):
+    """send(index)는 httpx.Response를 반환하는 코루틴 함수"""
+    latencies = []
+    status_counts = {}
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await send(index)
+                status = str(response.status_code)
+            except Exception:
+                status = "exception"
+            latencies.append(time.perf_counter() - started)
+            status_counts[status] = status_counts.get(status, 0) + 1
+            if status != "200":
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors, status_counts)
@@ -0,0 +1,64 @@
+"""
+로그인 부하 테스트
+
+실행 중인 auth_service에 동시 로그인 요청을 보내 처리량과 p50/p95/p99 지연 시간을 측정한다.
+동시에 가벼운 엔드포인트(--probe-path)를 호출하여, bcrypt 작업 때문에 다른 요청이 밀리는지도 함께 측정한다.
+한 IP에서 모든 요청을 보내므로 auth_service는 로그인 시도 제한을 끄고 실행해야 한다 (켜져 있으면 대부분 429).
+
+    LOGIN_RATE_LIMIT_ENABLED=false uvicorn auth_service.main:app --port 8001
+    python -m benchmarks.login_load_test --base-url http://localhost:8001 --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+import httpx
+
+from benchmarks.load import run_load
+
+BENCH_USER = {
+    "login_email": "bench-login@example.com",
+    "password": "benchpassword",
+    "name": "Bench User",
+    "gender": "Male",
+    "age": 30,
+    "phone": "000000000"
+}
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        # 이미 등록된 경우 400 응답이 오지만 로그인에는 문제 없음
+        await client.post("/auth/register", json=BENCH_USER)
+        credentials = {"login_email": BENCH_USER["login_email"], "password": BENCH_USER["password"]}
+
+        login_task = asyncio.ensure_future(run_load(
+            lambda _: client.post("/auth/login", json=credentials), args.requests, args.concurrency
+        ))
+        probe_task = asyncio.ensure_future(run_load(
+            lambda _: client.get(args.probe_path), args.probe_requests, 1
+        ))
+        login_result, probe_result = await asyncio.gather(login_task, probe_task)
+
+    print(json.dumps({"label": args.label, "login": login_result, "probe": probe_result}, indent=2))
+    # 200 이외의 응답이 섞이면 측정값이 실제 로그인 처리 성능이 아니므로 경고
+    failed = {status: count for status, count in login_result["status_counts"].items() if status != "200"}
+    if failed:
+        print(f"warning: {login_result['errors']} of {login_result['requests']} logins were not 200: {failed}",
+              file=sys.stderr)
+        if "429" in failed:
+            print("warning: login rate limit is on; restart auth_service with LOGIN_RATE_LIMIT_ENABLED=false",
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="auth_service 로그인 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--requests", type=int, default=500, help="전체 로그인 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    parser.add_argument("--probe-path", default="/openapi.json", help="함께 측정할 가벼운 엔드포인트")
+    parser.add_argument("--probe-requests", type=int, default=200)
+    parser.add_argument("--label", default="", help="결과 구분용 이름 (예: before, after-process)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, func
+
+from common.entity import User, Post
+from common.security import get_password_hash
+
+BENCH_EMAIL = "bench-seed@example.com"
+BENCH_PASSWORD = "benchpassword"
+
+
+# 벤치마크용 사용자 조회 또는 생성
+def ensure_bench_user(db):
+    user = db.query(User).filter(User.login_email == BENCH_EMAIL).first()
+    if not user:
+        user = User(login_email=BENCH_EMAIL, password=get_password_hash(BENCH_PASSWORD),
+                    name="Bench User", gender="Male", age=30, phone="000000000")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    return user
+
+
+# 게시글이 count 개 이상이 되도록 합성 데이터를 여러 행 단위로 삽입
+def seed_posts(db, user_id, count, chunk_size=5000):
+    existing = db.query(func.count(Post.id)).scalar()
+    base_time = datetime.utcnow() - timedelta(days=365)
+    for start in range(existing, count, chunk_size):
+        rows = [
+            {
+                "user_id": user_id,
+                "title": f"Synthetic post {index}",
+                "content": f"Synthetic content {index}",
+                "updated_at": base_time + timedelta(seconds=index),
+            }
+            for index in range(start, min(start + chunk_size, count))
+        ]
+        db.execute(insert(Post), rows)
+        db.commit()
+    return max(existing, count)
+
+
+# 사용자가 count 명 이상이 되도록 합성 데이터를 삽입 (비밀번호 해시는 하나를 재사용)
+def seed_users(db, count, chunk_size=5000):
+    existing = db.query(func.count(User.id)).scalar()
+    password = get_password_hash(BENCH_PASSWORD)
+    for start in range(existing, count, chunk_size):
+        rows = [
+            {
+                "login_email": f"synthetic-{index}@example.com",
+                "password": password,
+                "name": f"Synthetic User {index}",
+                "gender": "Female",
+                "age": 20 + index % 50,
+                "phone": "000000000",
+            }
+            for index in range(start, min(start + chunk_size, count))
+        ]
+        db.execute(insert(User), rows)
+        db.commit()
+    return max(existing, count)
+
+
+SEARCH_VOCABULARY = [f"word{index}" for index in range(5000)]
+
+
+# 검색 벤치마크용 게시글 (단어 빈도가 Zipf 분포를 따르도록 어휘에서 뽑은 제목 / 내용)
+def seed_search_posts(db, user_id, count, chunk_size=5000, seed=42):
+    import random
+
+    existing = db.query(func.count(Post.id)).scalar()
+    generator = random.Random(seed + existing)
+    weights = [1 / (rank + 1) for rank in range(len(SEARCH_VOCABULARY))]
+    base_time = datetime.utcnow() - timedelta(days=365)
+    for start in range(existing, count, chunk_size):
+        rows = [
+            {
+                "user_id": user_id,
+                "title": " ".join(generator.choices(SEARCH_VOCABULARY, weights, k=5)),
+                "content": " ".join(generator.choices(SEARCH_VOCABULARY, weights, k=40)),
+                "updated_at": base_time + timedelta(seconds=index),
+            }
+            for index in range(start, min(start + chunk_size, count))
+        ]
+        db.execute(insert(Post), rows)
+        db.commit()
+    return max(existing, count)
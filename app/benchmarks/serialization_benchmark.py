@@ -0,0 +1,66 @@
+"""
+응답 직렬화 마이크로 벤치마크
+
+기존 경로(ResponseDto.success_response -> jsonable_encoder -> json.dumps, FastAPI 기본 동작)와
+orjson 경로(ResponseDto.fast_success_response)를 1 / 10 / 100개 게시글에 대해 비교한다. DB는 사용하지 않는다.
+
+    python -m benchmarks.serialization_benchmark --repeat 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from common.dto.base_response_dto import ResponseDto
+
+
+def make_rows(count):
+    now = datetime.utcnow()
+    return [
+        {"id": i, "user_id": 1, "title": f"Post {i}", "content": "content " * 20,
+         "updated_at": now - timedelta(seconds=i)}
+        for i in range(count)
+    ]
+
+
+def pydantic_path(rows):
+    return JSONResponse(jsonable_encoder(ResponseDto.success_response(data=rows, next_cursor="cursor"))).body
+
+
+def fast_path(rows):
+    return ResponseDto.fast_success_response(data=rows, next_cursor="cursor").body
+
+
+def measure(fn, rows, repeat):
+    fn(rows)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main(args):
+    results = []
+    for count in args.rows:
+        rows = make_rows(count)
+        # 두 경로의 결과 JSON이 같은지 먼저 확인
+        assert json.loads(pydantic_path(rows)) == json.loads(fast_path(rows))
+        pydantic_us = measure(pydantic_path, rows, args.repeat)
+        fast_us = measure(fast_path, rows, args.repeat)
+        results.append({
+            "rows": count,
+            "response_dto_us": round(pydantic_us, 1),
+            "fast_path_us": round(fast_us, 1),
+            "speedup": round(pydantic_us / fast_us, 1),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ResponseDto / orjson 응답 직렬화 비교")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 10, 100], help="응답에 포함할 게시글 수")
+    parser.add_argument("--repeat", type=int, default=2000, help="경로별 반복 횟수")
+    main(parser.parse_args())
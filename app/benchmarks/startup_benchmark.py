@@ -0,0 +1,64 @@
+"""
+서비스 기동 시간 측정
+
+각 서비스에 대해 새 인터프리터에서 앱 모듈 import에 걸린 시간과,
+common.server로 실행한 뒤 첫 요청(GET /pool-stats)에 응답하기까지 걸린 시간을 측정한다.
+
+    DATABASE_URL=sqlite:////tmp/startup.db python -m benchmarks.startup_benchmark --workers 1 --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.load import summarize
+from benchmarks.suite import APP_DIR, SERVICES
+
+
+def import_seconds(module):
+    code = f"import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, check=True, capture_output=True, text=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def ready_seconds(app_path, port, workers, timeout=60):
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "common.server", app_path, "--port", str(port),
+                                "--workers", str(workers)], cwd=APP_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/pool-stats", timeout=1).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"{app_path} did not start within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def main(args):
+    results = {}
+    for service, (app_path, port) in SERVICES.items():
+        module = app_path.split(":")[0]
+        imports = [import_seconds(module) for _ in range(args.repeat)]
+        readies = [ready_seconds(app_path, port, args.workers) for _ in range(args.repeat)]
+        results[service] = {
+            "import": summarize(imports, sum(imports)),
+            "ready": summarize(readies, sum(readies)),
+        }
+    print(json.dumps({"workers": args.workers, "database": os.getenv("DATABASE_URL", "default"), **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서비스 기동 시간 측정")
+    parser.add_argument("--workers", type=int, default=1, help="common.server 워커 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
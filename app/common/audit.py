@@ -0,0 +1,295 @@
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from common import db_setup
+from common.entity import AuditOutbox, UserDeleteLog, UserUpdateLog
+
+logger = logging.getLogger(__name__)
+
+# 감사 로그 기록 방식
+#   queue: 커밋 후 프로세스 내 큐에 넣고 백그라운드 스레드가 묶어서 INSERT (프로세스가 비정상 종료되면 큐의 로그는 유실)
+#   outbox: 사용자 변경과 같은 트랜잭션으로 audit_outbox에 저장하고 백그라운드 스레드가 로그 테이블로 옮김 (at-least-once)
+AUDIT_MODE = os.getenv("AUDIT_MODE", "queue").lower()
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+AUDIT_MAX_QUEUE = int(os.getenv("AUDIT_MAX_QUEUE", "10000"))
+# outbox 모드의 outbox_depth(COUNT 쿼리)를 다시 조회하기 전까지 재사용하는 시간
+AUDIT_OUTBOX_DEPTH_TTL_SECONDS = float(os.getenv("AUDIT_OUTBOX_DEPTH_TTL_SECONDS", "5"))
+
+# 종류별 (로그 엔티티, 이벤트 시각 컬럼)
+AUDIT_KINDS = {
+    "update": (UserUpdateLog, "updated_at"),
+    "delete": (UserDeleteLog, "deleted_at"),
+}
+
+_PENDING_KEY = "pending_audit_entries"
+# 종료 시 큐를 기다리고 있는 스레드를 깨우기 위한 값
+_WAKE_UP = object()
+
+
+class AuditWriter:
+    """감사 로그를 요청 트랜잭션 밖에서 묶어서 저장하는 writer"""
+
+    def __init__(self, mode: str, batch_size: int, flush_interval_ms: int, max_queue: int,
+                 outbox_depth_ttl: float = AUDIT_OUTBOX_DEPTH_TTL_SECONDS):
+        if mode not in ("queue", "outbox"):
+            raise ValueError(f"Unknown AUDIT_MODE: {mode}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.overflow = 0
+        self.batches = 0
+        self.flush_ms_total = 0.0
+        self.flush_ms_max = 0.0
+        self.flush_ms_last = 0.0
+        self.outbox_depth_ttl = outbox_depth_ttl
+        # (outbox 행 수, 조회 시각)
+        self._outbox_depth = None
+
+    def record(self, db, kind: str, values: dict):
+        """감사 로그 한 건을 기록 (db는 사용자 변경을 저장하는 세션, 호출자가 커밋해야 반영된다)
+
+        queue 모드는 커밋된 경우에만 큐에 넣고, outbox 모드는 같은 트랜잭션으로 audit_outbox에 저장한다.
+        """
+        values = {**values, AUDIT_KINDS[kind][1]: datetime.utcnow()}
+        if self.mode == "outbox":
+            payload = {**values, AUDIT_KINDS[kind][1]: values[AUDIT_KINDS[kind][1]].isoformat()}
+            db.add(AuditOutbox(kind=kind, payload=payload))
+        else:
+            # AsyncSession도 내부의 동기 Session으로 커밋 이벤트가 발생한다
+            session = getattr(db, "sync_session", db)
+            session.info.setdefault(_PENDING_KEY, []).append((self, kind, values))
+        self.start()
+
+    def _enqueue(self, kind: str, values: dict):
+        try:
+            self._queue.put_nowait((kind, values))
+        except queue.Full:
+            # 커밋 이벤트(비동기 핸들러에서는 이벤트 루프)에서 DB에 쓰지 않도록 버리고 집계 (유실이 안 되면 outbox 모드 사용)
+            self._count("overflow")
+            logger.warning("Audit queue is full, dropping %s entry", kind)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name=f"audit-{self.mode}", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_WAKE_UP)
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                if self.mode == "queue":
+                    batch = self._take_batch()
+                    if batch:
+                        with self._flush_lock:
+                            self._write_batch(batch)
+                else:
+                    with self._flush_lock:
+                        relayed = self._relay_once()
+                    if not relayed:
+                        self._stopping.wait(self.flush_interval)
+            except Exception:
+                logger.exception("Audit flush failed")
+                self._stopping.wait(self.flush_interval)
+
+    # 첫 항목이 들어온 뒤 batch_size 개가 모이거나 flush_interval이 지나면 묶음을 반환
+    def _take_batch(self):
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+        if first is _WAKE_UP:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            # 큐가 가득 차 종료 신호(_WAKE_UP)를 넣지 못한 경우에도 바로 종료
+            if remaining <= 0 or self._stopping.is_set():
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is _WAKE_UP:
+                break
+            batch.append(entry)
+        return batch
+
+    def flush(self):
+        """대기 중인 로그를 모두 저장 (종료 시, 테스트용)"""
+        with self._flush_lock:
+            if self.mode == "outbox":
+                while self._relay_once():
+                    pass
+                return
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        entry = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if entry is not _WAKE_UP:
+                        batch.append(entry)
+                if not batch:
+                    return
+                self._write_batch(batch)
+
+    @staticmethod
+    def _insert_entries(db, entries):
+        by_kind = {}
+        for kind, values in entries:
+            by_kind.setdefault(kind, []).append(values)
+        for kind, rows in by_kind.items():
+            db.execute(insert(AUDIT_KINDS[kind][0]), rows)
+
+    def _write_batch(self, entries):
+        started = time.perf_counter()
+        with db_setup.SessionLocal() as db:
+            try:
+                self._insert_entries(db, entries)
+                db.commit()
+                written, failed = len(entries), 0
+            except SQLAlchemyError:
+                # 한 건 때문에 묶음 전체가 유실되지 않도록 한 건씩 다시 저장 (예: 그 사이 삭제된 사용자의 수정 이력)
+                db.rollback()
+                try:
+                    written, failed = self._write_one_by_one(db, entries)
+                except SQLAlchemyError:
+                    logger.exception("Failed to store %d audit entries", len(entries))
+                    db.rollback()
+                    written, failed = 0, len(entries)
+        self._record_flush(started, written, failed)
+
+    def _write_one_by_one(self, db, entries, outbox_ids=None):
+        written = failed = 0
+        for position, entry in enumerate(entries):
+            try:
+                self._insert_entries(db, [entry])
+                if outbox_ids:
+                    db.execute(delete(AuditOutbox).where(AuditOutbox.id == outbox_ids[position]))
+                db.commit()
+                written += 1
+            except IntegrityError:
+                db.rollback()
+                logger.warning("Dropping audit entry that cannot be stored: %s", entry)
+                if outbox_ids:
+                    db.execute(delete(AuditOutbox).where(AuditOutbox.id == outbox_ids[position]))
+                    db.commit()
+                failed += 1
+        return written, failed
+
+    # outbox에서 한 묶음을 로그 테이블로 옮기고 옮긴 건수를 반환 (DB 오류 시 outbox에 남겨 다음에 다시 시도)
+    def _relay_once(self):
+        started = time.perf_counter()
+        with db_setup.SessionLocal() as db:
+            rows = db.execute(
+                select(AuditOutbox).order_by(AuditOutbox.id).limit(self.batch_size).with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not rows:
+                db.rollback()
+                self._outbox_depth = (0, time.monotonic())
+                return 0
+            ids = [row.id for row in rows]
+            entries = [(row.kind, self._from_payload(row.kind, row.payload)) for row in rows]
+            try:
+                self._insert_entries(db, entries)
+                db.execute(delete(AuditOutbox).where(AuditOutbox.id.in_(ids)))
+                db.commit()
+                written, failed = len(entries), 0
+            except IntegrityError:
+                db.rollback()
+                written, failed = self._write_one_by_one(db, entries, ids)
+        self._record_flush(started, written, failed)
+        return len(rows)
+
+    @staticmethod
+    def _from_payload(kind: str, payload: dict):
+        column = AUDIT_KINDS[kind][1]
+        return {**payload, column: datetime.fromisoformat(payload[column])}
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _record_flush(self, started: float, written: int, failed: int):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self.batches += 1
+            self.written += written
+            self.failed += failed
+            self.flush_ms_total += elapsed_ms
+            self.flush_ms_last = elapsed_ms
+            self.flush_ms_max = max(self.flush_ms_max, elapsed_ms)
+
+    def outbox_depth(self):
+        """outbox 행 수 (/stats, /metrics 조회마다 COUNT 하지 않도록 outbox_depth_ttl 동안 재사용)"""
+        cached = self._outbox_depth
+        if cached is not None and time.monotonic() - cached[1] < self.outbox_depth_ttl:
+            return cached[0]
+        with db_setup.SessionLocal() as db:
+            depth = db.execute(select(func.count(AuditOutbox.id))).scalar()
+        self._outbox_depth = (depth, time.monotonic())
+        return depth
+
+    def stats(self):
+        stats = {
+            "mode": self.mode,
+            "queue_depth": self._queue.qsize(),
+            "written": self.written,
+            "failed": self.failed,
+            "overflow": self.overflow,
+            "batches": self.batches,
+            "last_flush_ms": round(self.flush_ms_last, 2),
+            "avg_flush_ms": round(self.flush_ms_total / self.batches, 2) if self.batches else 0.0,
+            "max_flush_ms": round(self.flush_ms_max, 2),
+        }
+        if self.mode == "outbox":
+            stats["outbox_depth"] = self.outbox_depth()
+        return stats
+
+
+# queue 모드: 커밋된 세션의 감사 로그만 큐에 넣고, 롤백된 경우 버린다
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session):
+    for writer, kind, values in session.info.pop(_PENDING_KEY, ()):
+        writer._enqueue(kind, values)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+audit_writer = AuditWriter(AUDIT_MODE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL_MS, AUDIT_MAX_QUEUE)
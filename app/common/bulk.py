@@ -0,0 +1,111 @@
+import os
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+# 한 번에 검증 / INSERT 하는 행 수
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+# 요청 하나에 허용하는 최대 행 수
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "100000"))
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class InvalidBulkRequest(Exception):
+    """요청 본문 전체를 처리할 수 없을 때 발생 (JSON 배열이 아님, 행 수 초과 등)"""
+
+
+class _UnparsableRow:
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _parse_line(line: bytes):
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError as error:
+        return _UnparsableRow(f"Invalid JSON: {error}")
+
+
+# 요청 본문을 행 목록으로 읽기 (JSON 배열 또는 NDJSON, NDJSON은 스트림으로 읽으며 줄 단위로 파싱)
+async def read_bulk_rows(request):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        rows = []
+        buffer = b""
+        async for chunk in request.stream():
+            lines = (buffer + chunk).split(b"\n")
+            buffer = lines.pop()
+            rows.extend(_parse_line(line) for line in lines if line.strip())
+            if len(rows) > BULK_MAX_ROWS:
+                raise InvalidBulkRequest(f"Too many rows (max {BULK_MAX_ROWS})")
+        if buffer.strip():
+            rows.append(_parse_line(buffer))
+    else:
+        try:
+            rows = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            raise InvalidBulkRequest("Body must be a JSON array or NDJSON")
+        if not isinstance(rows, list):
+            raise InvalidBulkRequest("Body must be a JSON array or NDJSON")
+    if len(rows) > BULK_MAX_ROWS:
+        raise InvalidBulkRequest(f"Too many rows (max {BULK_MAX_ROWS})")
+    return rows
+
+
+def row_success(index: int, row_id: int):
+    return {"index": index, "success": True, "id": row_id}
+
+
+def row_failure(index: int, message: str):
+    return {"index": index, "success": False, "message": message}
+
+
+def _validation_message(error: ValidationError):
+    return "; ".join(f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}" for item in error.errors())
+
+
+# 한 묶음의 행을 DTO로 검증하여 (통과한 (index, dict) 목록, 실패 결과 목록)을 반환
+def validate_chunk(rows, start: int, dto_cls):
+    valid, failed = [], []
+    for index, row in enumerate(rows, start):
+        if isinstance(row, _UnparsableRow):
+            failed.append(row_failure(index, row.message))
+        elif not isinstance(row, dict):
+            failed.append(row_failure(index, "Row must be a JSON object"))
+        else:
+            try:
+                valid.append((index, dto_cls.model_validate(row).model_dump()))
+            except ValidationError as error:
+                failed.append(row_failure(index, _validation_message(error)))
+    return valid, failed
+
+
+async def run_bulk(rows, dto_cls, insert_chunk, prepare_chunk=None):
+    """rows를 BULK_CHUNK_SIZE 단위로 검증 후 INSERT 하고 행별 결과를 반환
+
+    insert_chunk(values)는 dict 목록을 한 번에 INSERT 하고 입력 순서대로 id 목록을 반환하는 코루틴 함수
+    (실패 시 롤백 후 예외 발생). prepare_chunk(valid)는 INSERT 전에 중복 확인 등을 하는 선택적 코루틴 함수로
+    (통과한 (index, dict) 목록, 실패 결과 목록)을 반환한다. 묶음 단위로 커밋되므로 한 묶음의 INSERT가 실패해도
+    이전 묶음은 유지된다.
+    """
+    results = []
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        valid, failed = validate_chunk(rows[start:start + BULK_CHUNK_SIZE], start, dto_cls)
+        results.extend(failed)
+        if valid and prepare_chunk is not None:
+            valid, failed = await prepare_chunk(valid)
+            results.extend(failed)
+        if not valid:
+            continue
+        try:
+            ids = await insert_chunk([values for _, values in valid])
+        except SQLAlchemyError:
+            results.extend(row_failure(index, "Insert failed") for index, _ in valid)
+            continue
+        results.extend(row_success(index, row_id) for (index, _), row_id in zip(valid, ids))
+
+    results.sort(key=lambda result: result["index"])
+    inserted = sum(1 for result in results if result["success"])
+    return {"inserted": inserted, "failed": len(results) - inserted, "results": results}
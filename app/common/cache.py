@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# 캐시 백엔드 설정 (memory | redis)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class InMemoryCacheBackend:
+    """프로세스 내 LRU + TTL 캐시"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RedisCacheBackend:
+    """Redis 호환 클라이언트(get / set(ex=) / delete)를 사용하는 캐시, 값은 JSON으로 저장"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        raw = self.client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl_seconds: float):
+        self.client.set(key, json.dumps(value, default=_json_default), ex=max(1, int(ttl_seconds)))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+
+# 설정에 따라 캐시 백엔드 생성 (redis 패키지는 redis 백엔드를 사용할 때만 필요)
+def create_cache_backend():
+    if CACHE_BACKEND == "redis":
+        import redis
+
+        return RedisCacheBackend(redis.Redis.from_url(REDIS_URL))
+    if CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend(CACHE_MAX_ENTRIES)
+    raise ValueError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+
+
+class _InflightLoad:
+    def __init__(self, future=None):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        # 비동기 로드의 결과를 기다리는 요청에게 전달할 future
+        self.future = future
+        # 로드 도중 같은 키에 쓰기 / 무효화가 있었으면 로드 결과(이전 값)를 캐시에 저장하지 않는다
+        self.stale = False
+
+
+class ReadThroughCache:
+    """캐시에 없으면 loader로 읽어 채우는 캐시
+
+    같은 키에 대한 동시 miss는 하나의 loader 호출로 합쳐진다(stampede 방지).
+    loader가 None을 반환하면(데이터 없음) 캐시하지 않는다.
+    loader 실행 중 같은 프로세스에서 set / invalidate가 호출되면 loader 결과는 캐시에 저장하지 않는다.
+    """
+
+    def __init__(self, backend, namespace: str, ttl_seconds: float):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stale_loads = 0
+        self._lock = threading.Lock()
+        # 로드 결과 저장과 쓰기 / 무효화 사이의 순서를 보장
+        self._write_lock = threading.Lock()
+        self._inflight = {}
+        self._async_inflight = {}
+
+    def _key(self, key):
+        return f"{self.namespace}:{key}"
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    # 로드 도중 쓰기가 없었을 때만 로드 결과를 저장
+    def _store_loaded(self, cache_key, load: _InflightLoad):
+        if load.value is None:
+            return
+        with self._write_lock:
+            if load.stale:
+                self._count("stale_loads")
+                return
+            self.backend.set(cache_key, load.value, self.ttl_seconds)
+
+    # 진행 중인 로드가 있으면 결과를 저장하지 않도록 표시한 뒤 write(캐시 변경) 실행
+    def _write(self, cache_key, write):
+        with self._write_lock:
+            for inflight in (self._inflight, self._async_inflight):
+                load = inflight.get(cache_key)
+                if load is not None:
+                    load.stale = True
+            write()
+
+    def get_or_load(self, key, loader):
+        cache_key = self._key(key)
+        value = self.backend.get(cache_key)
+        if value is not None:
+            self._count("hits")
+            return value
+
+        with self._lock:
+            load = self._inflight.get(cache_key)
+            is_leader = load is None
+            if is_leader:
+                load = self._inflight[cache_key] = _InflightLoad()
+        if not is_leader:
+            # 먼저 DB 조회를 시작한 요청의 결과를 기다린다
+            self._count("coalesced")
+            load.event.wait()
+            if load.error is not None:
+                raise load.error
+            return load.value
+
+        self._count("misses")
+        try:
+            load.value = loader()
+            self._store_loaded(cache_key, load)
+            return load.value
+        except BaseException as error:
+            load.error = error
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+            load.event.set()
+
+    async def get_or_load_async(self, key, loader):
+        """get_or_load의 비동기 버전 (loader는 코루틴 함수)"""
+        cache_key = self._key(key)
+        value = self.backend.get(cache_key)
+        if value is not None:
+            self._count("hits")
+            return value
+
+        load = self._async_inflight.get(cache_key)
+        if load is not None and load.future.get_loop() is asyncio.get_running_loop():
+            self._count("coalesced")
+            try:
+                return await asyncio.shield(load.future)
+            except asyncio.CancelledError:
+                # 먼저 조회를 시작한 요청이 취소된 경우에는 직접 조회 (이 요청이 취소된 경우는 그대로 전파)
+                if not load.future.cancelled():
+                    raise
+            return await self.get_or_load_async(key, loader)
+
+        self._count("misses")
+        load = _InflightLoad(asyncio.get_running_loop().create_future())
+        self._async_inflight[cache_key] = load
+        try:
+            load.value = await loader()
+            self._store_loaded(cache_key, load)
+            load.future.set_result(load.value)
+            return load.value
+        except Exception as error:
+            load.future.set_exception(error)
+            # 기다리는 요청이 없으면 "exception was never retrieved" 경고가 나지 않도록 소비
+            load.future.exception()
+            raise
+        finally:
+            # 취소(CancelledError) 등으로 결과 없이 끝나면 기다리는 요청이 멈추지 않도록 future도 취소
+            if not load.future.done():
+                load.future.cancel()
+            if self._async_inflight.get(cache_key) is load:
+                del self._async_inflight[cache_key]
+
+    # 쓰기 후 캐시에 최신 값을 바로 반영 (write-through)
+    def set(self, key, value):
+        cache_key = self._key(key)
+        self._write(cache_key, lambda: self.backend.set(cache_key, value, self.ttl_seconds))
+
+    def invalidate(self, key):
+        cache_key = self._key(key)
+        self._write(cache_key, lambda: self.backend.delete(cache_key))
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "stale_loads": self.stale_loads,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
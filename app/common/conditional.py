@@ -0,0 +1,59 @@
+import hashlib
+from datetime import datetime
+
+from fastapi import Response
+
+
+def _normalize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# 값들로부터 ETag 생성 (기본 weak, 표현이 버전으로 정확히 결정되면 strong)
+def make_etag(*parts, weak: bool = True):
+    raw = repr([_normalize(part) for part in parts]).encode()
+    tag = f'"{hashlib.sha1(raw).hexdigest()[:20]}"'
+    return f"W/{tag}" if weak else tag
+
+
+# 항목의 버전 (id와 updated_at, 작성자 정보를 포함한 응답은 작성자 정보도 포함)
+def _version(item: dict):
+    version = (item["id"], item.get("updated_at"))
+    if "author" in item:
+        version += (item["author"]["name"], item["author"]["login_email"])
+    return version
+
+
+# 게시글 ETag (id와 updated_at 기반, 수정할 때마다 updated_at이 바뀌므로 strong ETag로 If-Match에 사용)
+def post_etag(post: dict):
+    return make_etag(*_version(post), weak=False)
+
+
+# 목록 ETag (페이지에 포함된 각 항목의 id와 updated_at, 다음 페이지 커서 기반)
+def page_etag(items, next_cursor=None):
+    return make_etag([_version(item) for item in items], next_cursor)
+
+
+# 수정 시각이 없는 엔티티는 내용 전체로 ETag 생성
+def content_etag(data: dict):
+    return make_etag(sorted(data.items()))
+
+
+def _opaque(tag: str):
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+# If-None-Match / If-Match 헤더 값이 etag와 일치하는지 확인
+# If-None-Match는 weak 비교, If-Match는 strong 비교(weak ETag는 어떤 값과도 일치하지 않음, RFC 9110 8.8.3.2)
+def etag_matches(header_value, etag: str, strong: bool = False):
+    if not header_value:
+        return False
+    if header_value.strip() == "*":
+        return True
+    if strong:
+        return not etag.startswith("W/") and etag in (tag.strip() for tag in header_value.split(","))
+    return _opaque(etag) in (_opaque(tag) for tag in header_value.split(","))
+
+
+def not_modified(etag: str):
+    return Response(status_code=304, headers={"ETag": etag})
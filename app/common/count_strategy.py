@@ -0,0 +1,119 @@
+import os
+import uuid
+from enum import Enum
+
+from sqlalchemy import func, select, text
+
+from common.cache import create_cache_backend
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"  # 매 요청마다 COUNT(*) 실행
+    CACHED = "cached"  # COUNT(*) 결과를 TTL 동안 재사용, 쓰기 시 무효화
+    ESTIMATED = "estimated"  # PostgreSQL 통계(pg_class.reltuples) 기반 추정치
+
+
+# 배포 단위 기본 전략 및 캐시 유지 시간
+USER_COUNT_STRATEGY = CountStrategy(os.getenv("USER_COUNT_STRATEGY", CountStrategy.EXACT.value))
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+
+
+class CountCache:
+    """테이블별 전체 행 수를 TTL 동안 보관하는 캐시 (CACHE_BACKEND=redis이면 서비스 간에 공유)
+
+    무효화는 테이블의 세대(generation) 값을 바꾸는 방식이라, 무효화 이전에 시작한 COUNT(*) 결과가
+    무효화 이후에 저장되더라도 세대가 달라 사용되지 않는다.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        # 세대 값은 캐시된 행 수보다 오래 유지 (먼저 만료되면 이전 세대의 값이 다시 유효해짐)
+        self.generation_ttl_seconds = max(3600.0, ttl_seconds * 2)
+
+    # 캐시된 행 수(만료되었거나 세대가 다르면 None)와 현재 세대를 반환
+    def peek(self, key):
+        generation = self.backend.get(f"count-generation:{key}")
+        entry = self.backend.get(f"count:{key}")
+        if entry is not None and entry["generation"] == generation:
+            return entry["value"], generation
+        return None, generation
+
+    # peek에서 받은 세대와 함께 저장
+    def put(self, key, value, generation):
+        self.backend.set(f"count:{key}", {"value": value, "generation": generation}, self.ttl_seconds)
+
+    def get(self, key, loader):
+        value, generation = self.peek(key)
+        if value is None:
+            value = loader()
+            self.put(key, value, generation)
+        return value
+
+    def invalidate(self, key):
+        self.backend.set(f"count-generation:{key}", uuid.uuid4().hex, self.generation_ttl_seconds)
+
+
+count_cache = CountCache(create_cache_backend(), COUNT_CACHE_TTL_SECONDS)
+
+
+ESTIMATE_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)")
+
+
+def _exact_count_stmt(model):
+    return select(func.count()).select_from(model)
+
+
+def _exact_count(db, model):
+    return db.execute(_exact_count_stmt(model)).scalar()
+
+
+# PostgreSQL 이외의 DB에서는 추정치를 구할 수 없음
+def _supports_estimate(db):
+    return db.get_bind().dialect.name == "postgresql"
+
+
+# 한 번도 ANALYZE 되지 않은 테이블은 reltuples가 -1
+def _valid_estimate(estimate):
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+def _estimated_count(db, model):
+    if not _supports_estimate(db):
+        return None
+    return _valid_estimate(db.execute(ESTIMATE_SQL, {"table_name": model.__tablename__}).scalar())
+
+
+# 선택한 전략으로 전체 행 수를 구하고, 실제로 사용된 전략을 함께 반환
+def count_rows(db, model, strategy: CountStrategy = None):
+    strategy = strategy or USER_COUNT_STRATEGY
+    if strategy == CountStrategy.ESTIMATED:
+        estimate = _estimated_count(db, model)
+        if estimate is not None:
+            return estimate, CountStrategy.ESTIMATED
+        strategy = CountStrategy.EXACT
+    if strategy == CountStrategy.CACHED:
+        return count_cache.get(model.__tablename__, lambda: _exact_count(db, model)), CountStrategy.CACHED
+    return _exact_count(db, model), CountStrategy.EXACT
+
+
+# count_rows의 AsyncSession 버전
+async def count_rows_async(db, model, strategy: CountStrategy = None):
+    strategy = strategy or USER_COUNT_STRATEGY
+    if strategy == CountStrategy.ESTIMATED and _supports_estimate(db):
+        result = await db.execute(ESTIMATE_SQL, {"table_name": model.__tablename__})
+        estimate = _valid_estimate(result.scalar())
+        if estimate is not None:
+            return estimate, CountStrategy.ESTIMATED
+    if strategy == CountStrategy.CACHED:
+        value, generation = count_cache.peek(model.__tablename__)
+        if value is None:
+            value = (await db.execute(_exact_count_stmt(model))).scalar()
+            count_cache.put(model.__tablename__, value, generation)
+        return value, CountStrategy.CACHED
+    return (await db.execute(_exact_count_stmt(model))).scalar(), CountStrategy.EXACT
+
+
+# 행이 추가/삭제되었을 때 캐시된 행 수를 무효화 (auth_service의 회원가입도 redis 백엔드를 통해 user_service에 반영)
+def invalidate_count(model):
+    count_cache.invalidate(model.__tablename__)
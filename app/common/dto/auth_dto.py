@@ -12,4 +12,8 @@ class RegisterRequest(BaseModel):
 
 class LoginRequest(BaseModel):
     login_email: str
-    password: str
\ No newline at end of file
+    password: str
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
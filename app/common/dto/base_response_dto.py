@@ -1,19 +1,48 @@
+import orjson
+from fastapi import Response
 from pydantic import BaseModel
 from typing import Any, Optional
 from common.error_types import ErrorType
 
 
+class FastJSONResponse(Response):
+    """dict를 orjson으로 바로 직렬화하는 응답 (datetime 기본 지원, jsonable_encoder를 거치지 않음)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 class ResponseDto(BaseModel):
     success: bool
     message: Optional[str] = None
     data: Optional[Any] = None
     total_count: Optional[int] = None
     status_code: Optional[int] = None  # 상태 코드 추가
+    next_cursor: Optional[str] = None  # 커서 기반 페이지네이션의 다음 페이지 토큰
+    count_strategy: Optional[str] = None  # total_count 계산에 사용된 전략 (exact, cached, estimated)
 
     @staticmethod
-    def success_response(data: Any = None, total_count: int = None):
-        return ResponseDto(success=True, message="success", data=data, total_count=total_count, status_code=200)
+    def success_response(data: Any = None, total_count: int = None, next_cursor: str = None,
+                         count_strategy: str = None):
+        return ResponseDto(success=True, message="success", data=data, total_count=total_count, status_code=200,
+                           next_cursor=next_cursor, count_strategy=count_strategy)
 
     @staticmethod
     def error_response(error_type: ErrorType):
         return ResponseDto(success=False, message=error_type.message, status_code=error_type.status_code)
+
+    # success_response와 같은 형태의 응답을 pydantic 검증 없이 바로 직렬화
+    # data는 to_dict() 결과처럼 이미 신뢰할 수 있는 값이어야 한다
+    @staticmethod
+    def fast_success_response(data: Any = None, total_count: int = None, next_cursor: str = None,
+                              count_strategy: str = None, headers: dict = None):
+        return FastJSONResponse({
+            "success": True,
+            "message": "success",
+            "data": data,
+            "total_count": total_count,
+            "status_code": 200,
+            "next_cursor": next_cursor,
+            "count_strategy": count_strategy,
+        }, headers=headers)
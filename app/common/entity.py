@@ -1,15 +1,22 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON, LargeBinary, DDL, event, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from common.search import SEARCH_DDL
 
 Base = declarative_base()
 
+# PostgreSQL에서는 JSONB, 그 외 DB에서는 JSON(텍스트)으로 저장
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 
 # 기존 사용자 엔티티
 class User(Base):
     __tablename__ = "users"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     login_email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=False)
     name = Column(String, nullable=False)
@@ -31,11 +38,11 @@ class User(Base):
 # 유저 수정 이력 엔티티
 class UserUpdateLog(Base):
     __tablename__ = "user_update_logs"
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     updated_by = Column(String, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow)
-    changes = Column(String, nullable=False)  # 수정된 내용 기록
+    changes = Column(JSONType, nullable=False)  # 수정된 내용 기록 ({"필드": {"old": 이전 값, "new": 새 값}})
 
     def to_dict(self):
         return {
@@ -50,11 +57,11 @@ class UserUpdateLog(Base):
 # 유저 삭제 이력 엔티티
 class UserDeleteLog(Base):
     __tablename__ = "user_delete_logs"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False)
     login_email = Column(String, nullable=False)
     deleted_at = Column(DateTime, default=datetime.utcnow)
-    reason = Column(String, nullable=True)  # 삭제 사유 기록
+    reason = Column(Text, nullable=True)  # 삭제 사유 기록
 
     def to_dict(self):
         return {
@@ -66,20 +73,54 @@ class UserDeleteLog(Base):
         }
 
 
+# 감사 로그 outbox (AUDIT_MODE=outbox 에서 사용자 변경과 같은 트랜잭션으로 저장 후 common/audit.py가 로그 테이블로 옮김)
+class AuditOutbox(Base):
+    __tablename__ = "audit_outbox"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # update | delete
+    payload = Column(JSONType, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# refresh token (토큰 원문 대신 SHA-256 digest만 저장, 교체 / 로그아웃 시 revoked_at 기록)
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)
+    # 만료된 토큰 정리(auth_service purge_expired_tokens)용 인덱스 (migrations/versions/0006)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime)
+
+
 # 게시글 엔티티
 class Post(Base):
     __tablename__ = "posts"
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # 게시글 목록 정렬 / 커서 페이지네이션용 인덱스 (migrations/versions/0002)
+    __table_args__ = (Index("ix_posts_updated_at_id", "updated_at", "id"),)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     title = Column(String, nullable=False)
-    content = Column(String)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    content = Column(Text)
+    # 목록 커서(updated_at, id)에 사용하므로 NULL을 허용하지 않음 (직접 INSERT한 행은 DB 시각으로 채움, migrations/versions/0007)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    # 작성자 (목록에서 게시글마다 조회되지 않도록 lazy load를 막고 필요할 때 joinedload로 함께 조회)
+    user = relationship("User", lazy="raise")
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_author: bool = False):
+        data = {
             "id": self.id,
             "user_id": self.user_id,
             "title": self.title,
             "content": self.content,
             "updated_at": self.updated_at
         }
+        if include_author:
+            data["author"] = {"name": self.user.name, "login_email": self.user.login_email}
+        return data
+
+
+# create_all로 테이블을 만들 때도 마이그레이션과 같은 전문 검색 스키마를 만든다
+for dialect_name, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect=dialect_name))
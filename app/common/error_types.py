@@ -6,6 +6,7 @@ class ErrorType(Enum):
     INVALID_CREDENTIALS = ("Invalid credentials", 401)
     PERMISSION_DENIED = ("Permission denied", 403)
     BAD_REQUEST = ("Bad request", 400)
+    PRECONDITION_FAILED = ("Precondition failed", 412)
     SERVER_ERROR = ("Internal server error", 500)
 
     def __init__(self, message, status_code):
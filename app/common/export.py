@@ -0,0 +1,71 @@
+import csv
+import io
+import os
+from datetime import datetime
+from enum import Enum
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+from common import db_setup
+
+# 한 번에 DB에서 가져와 응답으로 내보내는 행 수 (서버 측 커서의 fetch 크기)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def render_batch(rows, fmt: ExportFormat, columns):
+    if fmt is ExportFormat.ndjson:
+        return b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
+    return _csv_lines([_csv_value(row[column]) for column in columns] for row in rows)
+
+
+# 응답이 끝날 때까지 세션을 유지해야 하므로 요청 의존성(get_db)이 아닌 별도 세션을 연다
+def _stream(stmt, fmt: ExportFormat, columns):
+    if fmt is ExportFormat.csv:
+        yield _csv_lines([columns])
+    with db_setup.SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)).mappings()
+        for partition in result.partitions():
+            yield render_batch(partition, fmt, columns)
+
+
+async def _stream_async(stmt, fmt: ExportFormat, columns):
+    if fmt is ExportFormat.csv:
+        yield _csv_lines([columns])
+    async with db_setup.AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.mappings().partitions():
+            yield render_batch(partition, fmt, columns)
+
+
+def export_response(stmt, fmt: ExportFormat, filename: str, async_session: bool = False):
+    """stmt(컬럼 select)의 결과를 서버 측 커서로 나누어 읽으며 NDJSON / CSV로 스트리밍
+
+    yield_per를 사용하므로 PostgreSQL에서는 named cursor로 EXPORT_BATCH_SIZE 행씩 가져오고,
+    전체 결과를 메모리에 올리지 않는다.
+    """
+    columns = [column.key for column in stmt.selected_columns]
+    body = _stream_async(stmt, fmt, columns) if async_session else _stream(stmt, fmt, columns)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt],
+                             headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'})
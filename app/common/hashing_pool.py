@@ -0,0 +1,93 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# 비밀번호 해시 작업 실행기 설정 (process | thread)
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "process").lower()
+# 동시에 실행할 해시 작업 수
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# 실행 중인 작업 외에 대기열에 쌓아둘 수 있는 최대 작업 수
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+
+
+# 실행기 작업자 하나가 처리할 묶음 (프로세스 실행기에서도 피클링할 수 있도록 모듈 함수로 둔다)
+def _apply_all(fn, items):
+    return [fn(item) for item in items]
+
+
+class HashingPoolBusy(Exception):
+    """대기열이 가득 차 해시 작업을 받을 수 없을 때 발생"""
+
+
+class HashingPool:
+    """bcrypt 같은 CPU 작업을 이벤트 루프 밖의 제한된 실행기에서 처리"""
+
+    def __init__(self, kind: str, max_workers: int, max_pending: int):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def _get_executor(self):
+        # fork 이전에 프로세스가 생성되지 않도록 처음 사용할 때 실행기를 만든다
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                            thread_name_prefix="password-hash")
+        return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_pending:
+                raise HashingPoolBusy()
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _release_when_done(self, future):
+        self._release()
+
+    async def run(self, fn, *args):
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # 요청이 취소되어도(클라이언트 연결 종료 등) 실행 중인 작업이 끝날 때까지 자리를 유지
+        future.add_done_callback(self._release_when_done)
+        return await asyncio.wrap_future(future)
+
+    async def map(self, fn, items):
+        """대량 작업용: items를 작업자 수만큼 묶어 병렬로 처리하고 입력 순서대로 결과를 반환"""
+        items = list(items)
+        if not items:
+            return []
+        batch_size = -(-len(items) // self.max_workers)
+        batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+        results = await asyncio.gather(*(self.run(_apply_all, fn, batch) for batch in batches))
+        return [result for batch in results for result in batch]
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+hashing_pool = HashingPool(PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,341 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# true이면 응답에 X-Query-Count / Server-Timing 헤더 추가 (N+1 쿼리 확인용, 운영에서는 끄기)
+METRICS_DEBUG_HEADERS = os.getenv("METRICS_DEBUG_HEADERS", "false").lower() == "true"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# 여러 워커 프로세스로 실행할 때 워커별 지표를 모아두는 디렉터리 (common.server가 워커 2개 이상이면 설정)
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+# 다른 워커가 지표 파일을 갱신하는 주기 (/metrics, /stats는 최대 이 시간만큼 이전 값을 합산)
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "5"))
+
+
+class Histogram:
+    """Prometheus 형식으로 내보내는 누적 히스토그램 (라벨 조합별 버킷 / 합계 / 건수)"""
+
+    def __init__(self, name: str, help_text: str, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+    def render(self, series=None):
+        """series를 주면(여러 워커의 합계) 그 값을, 없으면 현재 프로세스의 값을 출력"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        if series is None:
+            series = self.snapshot()
+        for labels, (counts, total, count) in sorted(series.items()):
+            base = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_labels(base + [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(base + [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_labels(base)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(base)} {count}")
+        return lines
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+request_duration = Histogram("http_request_duration_seconds", "HTTP request latency by route",
+                             ("method", "route", "status"), LATENCY_BUCKETS)
+request_queries = Histogram("http_request_db_queries", "SQL statements executed per request",
+                            ("route",), QUERY_COUNT_BUCKETS)
+request_db_time = Histogram("http_request_db_seconds", "Total SQL time per request", ("route",), LATENCY_BUCKETS)
+db_query_duration = Histogram("db_query_duration_seconds", "SQL statement latency", (), LATENCY_BUCKETS)
+security_duration = Histogram("security_operation_duration_seconds",
+                              "Password hashing and JWT latency by operation", ("operation",), LATENCY_BUCKETS)
+HISTOGRAMS = [request_duration, request_queries, request_db_time, db_query_duration, security_duration]
+
+
+class RequestMetrics:
+    """요청 하나에서 사용한 시간 (DB 쿼리, 해시, JWT)"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.security_seconds = {}
+
+    def server_timing(self, total_seconds: float):
+        parts = [f"db;desc=\"{self.query_count} queries\";dur={self.query_seconds * 1000:.2f}"]
+        parts += [f"{operation};dur={seconds * 1000:.2f}" for operation, seconds in self.security_seconds.items()]
+        parts.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+# 현재 요청의 측정값 (스레드풀에서 실행되는 동기 핸들러에도 컨텍스트가 복사되어 같은 객체를 가리킨다)
+_current_request = ContextVar("current_request_metrics", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append((context, time.perf_counter()))
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _, started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    db_query_duration.observe(elapsed)
+    current = _current_request.get()
+    if current is not None:
+        current.query_count += 1
+        current.query_seconds += elapsed
+
+
+# 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 시작 시각을 여기서 제거
+# (남겨두면 커넥션이 풀로 돌아가도 계속 쌓인다)
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started and context.execution_context is not None and started[-1][0] is context.execution_context:
+        started.pop()
+
+
+# 해시 / JWT 작업 시간 측정 (operation: hash, hash_bulk, verify, jwt_encode, jwt_decode)
+@contextmanager
+def timed_security(operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        security_duration.observe(elapsed, operation)
+        current = _current_request.get()
+        if current is not None:
+            current.security_seconds[operation] = current.security_seconds.get(operation, 0.0) + elapsed
+
+
+class MetricsMiddleware:
+    """요청별 지연 시간, SQL 실행 횟수 / 시간을 라우트 단위로 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app, debug_headers: bool = METRICS_DEBUG_HEADERS):
+        self.app = app
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        _ensure_snapshot_writer()
+        current = RequestMetrics()
+        token = _current_request.set(current)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.debug_headers:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-count", str(current.query_count).encode()))
+                    headers.append((b"server-timing", current.server_timing(time.perf_counter() - started).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current_request.reset(token)
+            # 경로 파라미터가 들어간 실제 경로 대신 라우트 템플릿으로 집계 (매칭되지 않은 요청은 하나로 묶음)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            request_duration.observe(time.perf_counter() - started, scope["method"], route_path, str(status))
+            request_queries.observe(current.query_count, route_path)
+            request_db_time.observe(current.query_seconds, route_path)
+
+
+def _stat_values(name, value):
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, dict):
+        return [pair for key, item in value.items() for pair in _stat_values(f"{name}_{key}", item)]
+    if isinstance(value, (int, float)):
+        return [(name, value)]
+    return []
+
+
+# 상태 값을 gauge로 출력 (worker_stats: [(워커 pid 또는 None, 상태 값)], 같은 지표의 줄은 모아서 출력)
+def _stat_lines(worker_stats):
+    families = {}
+    for worker, stats in worker_stats:
+        for provider, values in stats.items():
+            for name, value in _stat_values(provider, values):
+                families.setdefault(name, []).append((worker, value))
+    lines = []
+    for name, samples in families.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines += [f"{name}{_labels([('worker', worker)] if worker else [])} {_number(value)}" for worker, value in samples]
+    return lines
+
+
+# 여러 워커 프로세스의 지표 합산
+# 워커마다 METRICS_MULTIPROC_DIR/<pid>.json에 히스토그램과 /stats 값을 주기적으로 기록하고,
+# /metrics, /stats 요청을 받은 워커가 모든 파일을 읽어 합산한다 (히스토그램은 합계, 상태 값은 worker 라벨로 구분).
+_stats_provider = None
+_snapshot_pid = None
+_snapshot_lock = threading.Lock()
+
+
+def enable_multiprocess(directory: str):
+    """워커 fork / 실행 전에 호출 (이전 실행에서 남은 파일은 삭제)"""
+    global METRICS_MULTIPROC_DIR
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        os.remove(path)
+    METRICS_MULTIPROC_DIR = directory
+    # uvicorn 다중 워커처럼 fork 대신 새로 실행되는 워커도 같은 디렉터리를 사용
+    os.environ["METRICS_MULTIPROC_DIR"] = directory
+
+
+def multiprocess_enabled():
+    return bool(METRICS_MULTIPROC_DIR)
+
+
+# /stats 값을 구하는 함수 (common.monitoring에서 등록)
+def set_stats_provider(provider):
+    global _stats_provider
+    _stats_provider = provider
+
+
+def write_snapshot():
+    if not multiprocess_enabled():
+        return
+    data = {
+        "pid": os.getpid(),
+        "histograms": {histogram.name: [[list(labels), *values] for labels, values in histogram.snapshot().items()]
+                       for histogram in HISTOGRAMS},
+        "stats": _stats_provider() if _stats_provider is not None else {},
+    }
+    path = os.path.join(METRICS_MULTIPROC_DIR, f"{os.getpid()}.json")
+    with open(f"{path}.tmp", "w") as snapshot_file:
+        json.dump(data, snapshot_file, default=str)
+    os.replace(f"{path}.tmp", path)
+
+
+def _run_snapshot_writer():
+    while True:
+        time.sleep(METRICS_SNAPSHOT_INTERVAL)
+        try:
+            write_snapshot()
+        except Exception:  # noqa: BLE001 - 기록 실패로 스레드가 종료되지 않도록 (다음 주기에 다시 기록)
+            pass
+
+
+# 워커 프로세스에서 처음 요청을 받을 때 기록 스레드 시작 (preload 시 fork 이전에 만들지 않음)
+def _ensure_snapshot_writer():
+    global _snapshot_pid
+    if not multiprocess_enabled() or _snapshot_pid == os.getpid():
+        return
+    with _snapshot_lock:
+        if _snapshot_pid == os.getpid():
+            return
+        _snapshot_pid = os.getpid()
+        threading.Thread(target=_run_snapshot_writer, name="metrics-snapshot", daemon=True).start()
+
+
+def _alive(pid: int):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_snapshots():
+    """(워커 pid, 기록한 값, 실행 중 여부) 목록, 현재 워커는 최신 값으로 먼저 기록한 뒤 읽는다"""
+    write_snapshot()
+    snapshots = []
+    for path in sorted(glob.glob(os.path.join(METRICS_MULTIPROC_DIR, "*.json"))):
+        try:
+            with open(path) as snapshot_file:
+                data = json.load(snapshot_file)
+        except (OSError, ValueError):
+            continue
+        snapshots.append((data["pid"], data, _alive(data["pid"])))
+    return snapshots
+
+
+def _merge_histograms(snapshots):
+    merged = {histogram.name: {} for histogram in HISTOGRAMS}
+    # 종료된 워커의 히스토그램도 합산 (누적 값이 줄어들지 않도록)
+    for _, data, _ in snapshots:
+        for name, series in data["histograms"].items():
+            target = merged.setdefault(name, {})
+            for labels, counts, total, count in series:
+                key = tuple(labels)
+                if key not in target:
+                    target[key] = ([0] * len(counts), 0.0, 0)
+                merged_counts, merged_total, merged_count = target[key]
+                target[key] = ([a + b for a, b in zip(merged_counts, counts)], merged_total + total, merged_count + count)
+    return merged
+
+
+def worker_stats():
+    """실행 중인 워커별 /stats 값 (여러 워커로 실행하지 않으면 None)"""
+    if not multiprocess_enabled():
+        return None
+    return {str(pid): data["stats"] for pid, data, alive in read_snapshots() if alive}
+
+
+# Prometheus text 형식으로 히스토그램과 register_stats로 등록된 상태 값(숫자만)을 출력
+def render_metrics(stats: dict):
+    lines = []
+    if not multiprocess_enabled():
+        for histogram in HISTOGRAMS:
+            lines += histogram.render()
+        lines += _stat_lines([(None, stats)])
+        return "\n".join(lines) + "\n"
+
+    snapshots = read_snapshots()
+    merged = _merge_histograms(snapshots)
+    for histogram in HISTOGRAMS:
+        lines += histogram.render(merged[histogram.name])
+    # 상태 값은 실행 중인 워커만 worker 라벨을 붙여 출력
+    lines += _stat_lines([(pid, data["stats"]) for pid, data, alive in snapshots if alive])
+    return "\n".join(lines) + "\n"
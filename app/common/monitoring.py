@@ -0,0 +1,48 @@
+import os
+
+from fastapi import APIRouter, Response
+
+from common.db_setup import pool_stats, read_replicas
+from common.dto.base_response_dto import ResponseDto
+from common.metrics import render_metrics, set_stats_provider, worker_stats
+from common.security import token_cache
+
+router = APIRouter(tags=["monitoring"])
+
+# 이름별 상태 조회 함수 (register_stats로 등록)
+_stats_providers = {}
+
+
+def register_stats(name, provider):
+    _stats_providers[name] = provider
+
+
+def collect_stats():
+    return {name: provider() for name, provider in _stats_providers.items()}
+
+
+set_stats_provider(collect_stats)
+register_stats("db_pool", pool_stats)
+register_stats("token_cache", token_cache.stats)
+if read_replicas is not None:
+    register_stats("read_replicas", read_replicas.stats)
+
+
+@router.get("/pool-stats", description="DB 커넥션 풀 상태 조회 API")
+def get_pool_stats():
+    return ResponseDto.success_response(data=pool_stats())
+
+
+# 여러 워커로 실행하면 요청을 받은 워커의 값과 함께 workers에 워커별 값(METRICS_SNAPSHOT_INTERVAL 주기로 갱신)을 포함
+@router.get("/stats", description="서비스 내부 상태 조회 API")
+def get_stats():
+    data = collect_stats()
+    workers = worker_stats()
+    if workers is not None:
+        data = {**data, "worker": os.getpid(), "workers": workers}
+    return ResponseDto.success_response(data=data)
+
+
+@router.get("/metrics", description="Prometheus 형식 지표 API (라우트별 지연 시간, SQL, 해시 / JWT, 서비스 상태)")
+def get_metrics():
+    return Response(render_metrics(collect_stats()), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,25 @@
+import base64
+import binascii
+import json
+
+
+class InvalidCursor(Exception):
+    """잘못되었거나 변조된 커서 토큰"""
+
+
+# 마지막 행의 정렬 키를 불투명한(opaque) 커서 토큰으로 변환
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+# 커서 토큰을 정렬 키로 복원 (required_keys가 모두 있어야 함)
+def decode_cursor(token: str, required_keys) -> dict:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursor(token)
+    if not isinstance(values, dict) or any(key not in values for key in required_keys):
+        raise InvalidCursor(token)
+    return values
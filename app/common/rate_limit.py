@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from fastapi import HTTPException, Request
+
+from common.cache import REDIS_URL
+
+# 로그인 시도 제한 설정 (window 초 동안 IP별 전체 시도 수, 이메일별 실패 수)
+LOGIN_RATE_LIMIT_ENABLED = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "true").lower() == "true"
+LOGIN_RATE_LIMIT_BACKEND = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "memory").lower()
+LOGIN_RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("LOGIN_RATE_LIMIT_WINDOW_SECONDS", "60"))
+LOGIN_RATE_LIMIT_PER_IP = int(os.getenv("LOGIN_RATE_LIMIT_PER_IP", "30"))
+LOGIN_RATE_LIMIT_PER_EMAIL = int(os.getenv("LOGIN_RATE_LIMIT_PER_EMAIL", "5"))
+# 메모리 백엔드가 기억하는 최대 키 수 (이메일을 바꿔가며 시도해도 메모리가 계속 늘지 않도록 오래된 키부터 제거)
+LOGIN_RATE_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_RATE_LIMIT_MAX_KEYS", "100000"))
+# 프록시 뒤에서 실행하는 경우 X-Forwarded-For에서 신뢰하는 프록시가 추가한 주소를 클라이언트 IP로 사용
+# (앞쪽 항목은 클라이언트가 임의로 보낼 수 있으므로, 오른쪽에서 프록시 단계 수만큼 거슬러 올라간 항목을 사용)
+LOGIN_RATE_LIMIT_TRUST_PROXY = os.getenv("LOGIN_RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+LOGIN_RATE_LIMIT_PROXY_HOPS = max(1, int(os.getenv("LOGIN_RATE_LIMIT_PROXY_HOPS", "1")))
+
+
+class InMemoryRateLimitBackend:
+    """프로세스 내 sliding window log (키별 시도 시각 목록)"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _window(self, key, now: float, window_seconds: float):
+        timestamps = self._windows.get(key)
+        if timestamps is None:
+            return None
+        while timestamps and timestamps[0] <= now - window_seconds:
+            timestamps.popleft()
+        if not timestamps:
+            del self._windows[key]
+            return None
+        return timestamps
+
+    def _retry_after(self, timestamps, now: float, window_seconds: float):
+        return max(timestamps[0] + window_seconds - now, 0.0)
+
+    def hit(self, key, limit: int, window_seconds: float):
+        """한도 안이면 시도를 기록하고 None, 한도를 넘었으면 기록하지 않고 재시도까지 남은 초를 반환"""
+        now = time.time()
+        with self._lock:
+            timestamps = self._window(key, now, window_seconds)
+            if timestamps is not None and len(timestamps) >= limit:
+                return self._retry_after(timestamps, now, window_seconds)
+            if timestamps is None:
+                timestamps = self._windows[key] = deque()
+            timestamps.append(now)
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        return None
+
+    def peek(self, key, limit: int, window_seconds: float):
+        """기록하지 않고 한도 초과 여부만 확인 (초과 시 재시도까지 남은 초)"""
+        now = time.time()
+        with self._lock:
+            timestamps = self._window(key, now, window_seconds)
+            if timestamps is not None and len(timestamps) >= limit:
+                return self._retry_after(timestamps, now, window_seconds)
+        return None
+
+    def tracked_keys(self):
+        return len(self._windows)
+
+
+class RedisRateLimitBackend:
+    """Redis sorted set 기반 sliding window log (여러 프로세스 / 서버가 같은 한도를 공유)
+
+    확인과 기록이 원자적이지 않아 동시에 들어온 요청이 한도를 조금 넘을 수 있다.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def _count(self, key, now: float, window_seconds: float):
+        self.client.zremrangebyscore(key, 0, now - window_seconds)
+        return self.client.zcard(key)
+
+    def _retry_after(self, key, now: float, window_seconds: float):
+        oldest = self.client.zrange(key, 0, 0, withscores=True)
+        return max(oldest[0][1] + window_seconds - now, 0.0) if oldest else window_seconds
+
+    def hit(self, key, limit: int, window_seconds: float):
+        now = time.time()
+        if self._count(key, now, window_seconds) >= limit:
+            return self._retry_after(key, now, window_seconds)
+        self.client.zadd(key, {f"{now}:{uuid.uuid4().hex[:8]}": now})
+        self.client.expire(key, max(1, int(window_seconds) + 1))
+        return None
+
+    def peek(self, key, limit: int, window_seconds: float):
+        now = time.time()
+        if self._count(key, now, window_seconds) >= limit:
+            return self._retry_after(key, now, window_seconds)
+        return None
+
+    def tracked_keys(self):
+        return None
+
+
+# 설정에 따라 시도 제한 백엔드 생성 (redis 패키지는 redis 백엔드를 사용할 때만 필요)
+def create_rate_limit_backend():
+    if LOGIN_RATE_LIMIT_BACKEND == "redis":
+        import redis
+
+        return RedisRateLimitBackend(redis.Redis.from_url(REDIS_URL))
+    if LOGIN_RATE_LIMIT_BACKEND == "memory":
+        return InMemoryRateLimitBackend(LOGIN_RATE_LIMIT_MAX_KEYS)
+    raise ValueError(f"Unknown LOGIN_RATE_LIMIT_BACKEND: {LOGIN_RATE_LIMIT_BACKEND}")
+
+
+class LoginRateLimiter:
+    """로그인 시도 제한 (DB 조회 / bcrypt 검증 전에 확인)
+
+    IP별로는 모든 시도를, 이메일별로는 실패한 시도만 센다.
+    한 IP의 대량 시도와 여러 IP에서 한 계정을 노리는 시도를 모두 막으면서, 정상 로그인은 이메일 한도에 포함되지 않는다.
+    """
+
+    def __init__(self, backend, per_ip: int, per_email: int, window_seconds: float, enabled: bool = True):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.window_seconds = window_seconds
+        self.enabled = enabled
+        self.checks = 0
+        self.rejected_ip = 0
+        self.rejected_email = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    @staticmethod
+    def _email_key(login_email: str):
+        return f"login:email:{login_email.strip().lower()}"
+
+    def check(self, ip: str, login_email: str):
+        """한도를 넘었으면 429 예외 발생"""
+        if not self.enabled:
+            return
+        self._count("checks")
+        retry_after = self.backend.peek(self._email_key(login_email), self.per_email, self.window_seconds)
+        if retry_after is not None:
+            self._count("rejected_email")
+            self._reject(retry_after)
+        retry_after = self.backend.hit(f"login:ip:{ip}", self.per_ip, self.window_seconds)
+        if retry_after is not None:
+            self._count("rejected_ip")
+            self._reject(retry_after)
+
+    def record_failure(self, login_email: str):
+        if not self.enabled:
+            return
+        self._count("failures")
+        self.backend.hit(self._email_key(login_email), self.per_email, self.window_seconds)
+
+    @staticmethod
+    def _reject(retry_after: float):
+        raise HTTPException(status_code=429, detail="Too many login attempts",
+                            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))})
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "checks": self.checks,
+            "rejected_ip": self.rejected_ip,
+            "rejected_email": self.rejected_email,
+            "failures": self.failures,
+            "tracked_keys": self.backend.tracked_keys(),
+        }
+
+
+def client_ip(request: Request, trust_proxy: bool = LOGIN_RATE_LIMIT_TRUST_PROXY,
+              proxy_hops: int = LOGIN_RATE_LIMIT_PROXY_HOPS):
+    if trust_proxy:
+        forwarded_for = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if forwarded_for:
+            # 항목이 프록시 단계 수보다 적으면 가장 앞의 항목도 신뢰하는 프록시가 추가한 값
+            return forwarded_for[-min(proxy_hops, len(forwarded_for))]
+    return request.client.host if request.client else "unknown"
+
+
+login_rate_limiter = LoginRateLimiter(create_rate_limit_backend(), LOGIN_RATE_LIMIT_PER_IP, LOGIN_RATE_LIMIT_PER_EMAIL,
+                                      LOGIN_RATE_LIMIT_WINDOW_SECONDS, LOGIN_RATE_LIMIT_ENABLED)
@@ -0,0 +1,160 @@
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 읽기 전용 복제본 URL (쉼표로 구분, 비어 있으면 모든 조회를 primary에서 처리)
+READ_DATABASE_URLS = [url.strip() for url in os.getenv("READ_DATABASE_URLS", "").split(",") if url.strip()]
+# 쓰기 요청을 보낸 클라이언트는 이 시간 동안 조회도 primary에서 처리 (복제 지연으로 방금 쓴 데이터가 안 보이는 문제 방지)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+# 복제본 상태 확인 주기와 허용하는 최대 복제 지연
+READ_REPLICA_HEALTH_INTERVAL = float(os.getenv("READ_REPLICA_HEALTH_INTERVAL", "5"))
+READ_REPLICA_MAX_LAG_SECONDS = float(os.getenv("READ_REPLICA_MAX_LAG_SECONDS", "10"))
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 복제 지연 (받은 WAL을 모두 적용했으면 0, 복제본이 아니면 0)
+POSTGRES_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, name: str, engine, session_factory, health_engine):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.health_engine = health_engine
+        self.healthy = True
+        self.lag_seconds = None
+        self.failures = 0
+        self.last_error = None
+
+
+class ReplicaSet:
+    """복제본 선택 (정상 복제본 중 라운드 로빈) 및 상태 확인
+
+    상태 확인 스레드는 워커 프로세스에서 처음 선택할 때 시작한다 (gunicorn preload 시 fork 이전에 만들지 않음).
+    확인 사이에 연결이 실패하면 get_read_db가 mark_unhealthy로 바로 제외하고, 다음 확인에서 복구되면 다시 사용한다.
+    """
+
+    def __init__(self, replicas, health_interval: float = READ_REPLICA_HEALTH_INTERVAL,
+                 max_lag_seconds: float = READ_REPLICA_MAX_LAG_SECONDS):
+        self.replicas = replicas
+        self.health_interval = health_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._health_pid = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.pinned_reads = 0
+
+    def choose(self):
+        """정상 복제본 하나를 반환 (없으면 None, primary에서 조회)"""
+        self._ensure_health_thread()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_unhealthy(self, replica: Replica, error):
+        replica.healthy = False
+        replica.failures += 1
+        replica.last_error = str(error).splitlines()[0][:200]
+        logger.warning("read replica %s is unavailable: %s", replica.name, replica.last_error)
+
+    def check(self, replica: Replica):
+        try:
+            with replica.health_engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    replica.lag_seconds = float(conn.execute(POSTGRES_LAG_SQL).scalar() or 0)
+                else:
+                    conn.execute(text("SELECT 1"))
+                    replica.lag_seconds = 0.0
+        except Exception as error:  # noqa: BLE001 - 어떤 오류든 복제본을 제외하고 primary로 조회
+            self.mark_unhealthy(replica, error)
+            return
+        replica.healthy = replica.lag_seconds <= self.max_lag_seconds
+        if not replica.healthy:
+            replica.last_error = f"replication lag {replica.lag_seconds:.1f}s"
+
+    def check_all(self):
+        for replica in self.replicas:
+            self.check(replica)
+
+    def _run_health_checks(self):
+        while True:
+            time.sleep(self.health_interval)
+            self.check_all()
+
+    def _ensure_health_thread(self):
+        pid = os.getpid()
+        if self._health_pid == pid:
+            return
+        with self._lock:
+            if self._health_pid == pid:
+                return
+            self._health_pid = pid
+            threading.Thread(target=self._run_health_checks, name="read-replica-health", daemon=True).start()
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        return {
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "healthy": sum(replica.healthy for replica in self.replicas),
+            "replicas": {
+                replica.name: {"url": replica.engine.url.render_as_string(hide_password=True),
+                               "healthy": replica.healthy, "lag_seconds": replica.lag_seconds,
+                               "failures": replica.failures, "last_error": replica.last_error}
+                for replica in self.replicas
+            },
+        }
+
+
+# 최근에 쓰기 요청을 보낸 클라이언트인지 확인 (쿠키에 primary 고정 만료 시각 저장)
+def pinned_to_primary(request):
+    value = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """쓰기 요청(GET / HEAD / OPTIONS 이외)의 응답에 primary 고정 쿠키를 붙이는 ASGI 미들웨어"""
+
+    def __init__(self, app, window_seconds: float = READ_YOUR_WRITES_SECONDS, enabled: bool = bool(READ_DATABASE_URLS)):
+        self.app = app
+        self.window_seconds = window_seconds
+        # 복제본이 없으면 쿠키를 붙이지 않음
+        self.enabled = enabled and window_seconds > 0
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                cookie = (f"{READ_YOUR_WRITES_COOKIE}={time.time() + self.window_seconds:.3f}; "
+                          f"Max-Age={math.ceil(self.window_seconds)}; Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,68 @@
+from sqlalchemy import Float, column, func, literal_column, table
+
+# 게시글 전문 검색 스키마 (migrations/versions/0003과 동일, create_all 시에는 entity.py에서 실행)
+# PostgreSQL: title(가중치 A) + content(가중치 B)로 만든 generated tsvector 컬럼과 GIN 인덱스
+#   한국어 형태소 분석 설정이 없으므로 'simple' 설정(공백 단위 토큰, 소문자 변환)을 사용한다
+# SQLite: posts를 외부 콘텐츠로 사용하는 FTS5 테이블과 동기화 트리거
+SEARCH_DDL = {
+    "postgresql": [
+        """
+        ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE posts_fts USING fts5(title, content, content='posts', content_rowid='id')",
+        """
+        CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+        """,
+        """
+        CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END
+        """,
+        """
+        CREATE TRIGGER posts_fts_update AFTER UPDATE ON posts BEGIN
+            INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+        """,
+    ],
+}
+
+# 마이그레이션 비교(alembic check)에서 제외할 검색용 객체
+SEARCH_SCHEMA_OBJECTS = {"search_vector", "ix_posts_search_vector", "posts_fts"}
+
+posts_fts = table("posts_fts", column("rowid"))
+
+
+# 검색어를 FTS5 문법으로 변환 (단어마다 따옴표로 감싸 특수 문자를 그대로 검색, 모든 단어를 포함하는 글만 검색)
+# 공백뿐인 검색어는 빈 MATCH가 되어 FTS5 문법 오류가 나므로 호출 전에 걸러야 한다 (posts_search_stmt)
+def fts5_query(q: str) -> str:
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+# 전문 검색을 지원하지 않는 DB면 서비스 시작 시 바로 실패 (검색 요청마다 500이 발생하지 않도록)
+def check_search_support(dialect_name: str):
+    if dialect_name not in SEARCH_DDL:
+        raise RuntimeError(f"Full-text search is not supported on {dialect_name} (supported: {', '.join(SEARCH_DDL)})")
+
+
+def search_clauses(dialect_name: str, q: str):
+    """(검색 조건, 점수 식, 조인할 FTS 테이블 또는 None) 반환, 점수는 높을수록 관련도가 높다"""
+    if dialect_name == "postgresql":
+        search_vector = literal_column("posts.search_vector")
+        # 드라이버와 관계없이 regconfig로 해석되도록 설정 이름은 바인드 파라미터가 아닌 리터럴로 넣는다
+        query = func.websearch_to_tsquery(literal_column("'simple'"), q)
+        return search_vector.op("@@")(query), func.ts_rank_cd(search_vector, query, type_=Float), None
+    if dialect_name == "sqlite":
+        match = literal_column("posts_fts").op("MATCH")(fts5_query(q))
+        # bm25는 낮을수록 관련도가 높으므로 부호를 바꾼다 (제목 가중치 2, 내용 1)
+        rank = -func.bm25(literal_column("posts_fts"), 2.0, 1.0, type_=Float)
+        return match, rank, posts_fts
+    check_search_support(dialect_name)
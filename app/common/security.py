@@ -1,22 +1,75 @@
+import hashlib
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
-from fastapi import HTTPException
+from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 
+from common.hashing_pool import hashing_pool, HashingPoolBusy
+from common.metrics import timed_security
+
 SECRET_KEY = "supersecretkey"
 security = HTTPBearer()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto") # 비밀번호 암호화를 위한 설정
 
+# refresh token 유효 기간
+REFRESH_TOKEN_TTL_DAYS = float(os.getenv("REFRESH_TOKEN_TTL_DAYS", "14"))
+
+# 검증된 토큰 캐시 설정
+TOKEN_CACHE_ENABLED = os.getenv("TOKEN_CACHE_ENABLED", "true").lower() == "true"
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+def _hash_password(password):
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
 
 # 비밀번호 해시 생성 함수
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    with timed_security("hash"):
+        return _hash_password(password)
 
 
 # 비밀번호 검증 함수
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    with timed_security("verify"):
+        return _verify_password(plain_password, hashed_password)
+
+
+# 해시 작업 대기열이 가득 찬 경우 바로 503을 반환
+async def _run_in_hashing_pool(fn, *args):
+    try:
+        return await hashing_pool.run(fn, *args)
+    except HashingPoolBusy:
+        raise HTTPException(status_code=503, detail="Password hashing is busy", headers={"Retry-After": "1"})
+
+
+# 비밀번호 해시 생성 함수 (비동기, 별도 실행기에서 처리, 측정 시간에는 대기열 대기 시간도 포함)
+async def get_password_hash_async(password):
+    with timed_security("hash"):
+        return await _run_in_hashing_pool(_hash_password, password)
+
+
+# 여러 비밀번호를 hashing_pool에서 병렬로 해시 (작업자 프로세스에서 측정한 값은 이 프로세스의 지표에 남지 않으므로 전체 시간을 여기서 측정)
+async def get_password_hashes_async(passwords):
+    with timed_security("hash_bulk"):
+        return await hashing_pool.map(_hash_password, passwords)
+
+
+# 비밀번호 검증 함수 (비동기, 별도 실행기에서 처리)
+async def verify_password_async(plain_password, hashed_password):
+    with timed_security("verify"):
+        return await _run_in_hashing_pool(_verify_password, plain_password, hashed_password)
 
 
 # JWT 토큰 생성 함수
@@ -24,17 +77,101 @@ def create_access_token(user_id: int):
     # 1시간 동안 유지되도록 설정
     expiration = datetime.utcnow() + timedelta(hours=1)
     payload = {"sub": user_id, "exp": expiration}
-    token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+    with timed_security("jwt_encode"):
+        token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
     return token
 
 
-# JWT 토큰 검증 함수
+# refresh token 저장용 digest (무작위 256비트 토큰이므로 bcrypt 없이 SHA-256으로 충분)
+def refresh_token_digest(token: str):
+    return hashlib.sha256(token.encode()).digest()
+
+
+# refresh token 생성 함수 (클라이언트에 줄 토큰, 저장할 digest, 만료 시각)
+def create_refresh_token():
+    token = secrets.token_urlsafe(32)
+    return token, refresh_token_digest(token), datetime.utcnow() + timedelta(days=REFRESH_TOKEN_TTL_DAYS)
+
+
+class VerifiedTokenCache:
+    """서명 검증을 마친 토큰을 토큰의 exp 까지만 보관하는 LRU 캐시 (키는 토큰의 SHA-256 digest)"""
+
+    def __init__(self, max_size: int, enabled: bool = True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        if not self.enabled:
+            return None
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def put(self, token: str, subject, expires_at: float):
+        if not self.enabled:
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (subject, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_ENABLED)
+
+
+# JWT 토큰 검증 함수 (캐시 조회 포함 전체 시간을 jwt_verify로 기록)
 def verify_token(credentials: HTTPAuthorizationCredentials):
+    with timed_security("jwt_verify"):
+        return _verify_token(credentials.credentials)
+
+
+def _verify_token(token: str):
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=["HS256"])
-        return payload["sub"]
+        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    token_cache.put(token, payload["sub"], payload["exp"])
+    return payload["sub"]
+
 
+# 인증된 사용자 ID를 주입하는 FastAPI 의존성
+async def current_user_id(credentials: HTTPAuthorizationCredentials = Security(security)):
+    return verify_token(credentials)
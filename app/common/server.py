@@ -0,0 +1,136 @@
+"""
+서비스 운영 실행기
+
+gunicorn이 설치되어 있으면 앱을 먼저 로드(preload)한 뒤 CPU 수만큼 uvicorn 워커를 fork하고,
+없으면 uvicorn만으로 실행한다. 각 서비스의 Dockerfile과 __main__ 블록에서 사용한다.
+
+    python -m common.server auth_service.main:app --port 8001
+    SERVER_WORKERS=4 python -m common.server main:app --port 8003
+"""
+import argparse
+import importlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# 0이면 컨테이너에 할당된 CPU 수로 결정
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+# auto: uvloop / httptools가 설치되어 있으면 사용 (asyncio / h11로 고정하려면 지정)
+SERVER_LOOP = os.getenv("SERVER_LOOP", "auto")
+SERVER_HTTP = os.getenv("SERVER_HTTP", "auto")
+# 종료 신호를 받은 뒤 처리 중인 요청을 기다리는 최대 시간
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "5"))
+# 응답이 없는 워커를 재시작하기까지의 시간
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "60"))
+# 워커가 이 수만큼 요청을 처리하면 재시작 (0이면 사용 안 함, 메모리 누수 대비)
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+
+
+# 사용할 수 있는 CPU 수 (cgroup v2 CPU 할당량, CPU affinity, 전체 코어 수 순으로 확인)
+def available_cpus():
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def load_app(app_path: str):
+    module_name, _, attribute = app_path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+# fork 이전에 부모 프로세스에서 만들어진 커넥션을 자식 워커가 공유하지 않도록 풀을 새로 만든다
+# (close=False: 부모의 커넥션을 자식에서 닫지 않음)
+def dispose_engines_after_fork():
+    from common import db_setup
+
+    db_setup.engine.dispose(close=False)
+    if db_setup.async_engine is not None:
+        db_setup.async_engine.sync_engine.dispose(close=False)
+    for replica in db_setup.read_replicas.replicas if db_setup.read_replicas is not None else []:
+        getattr(replica.engine, "sync_engine", replica.engine).dispose(close=False)
+
+
+def _post_fork(server, worker):
+    dispose_engines_after_fork()
+
+
+def run_gunicorn(app, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+    from uvicorn_worker import UvicornWorker
+
+    class ServiceWorker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": SERVER_LOOP, "http": SERVER_HTTP}
+
+    class ServiceApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{SERVER_HOST}:{port}",
+                "workers": workers,
+                "worker_class": ServiceWorker,
+                # import와 엔진 생성은 부모에서 한 번만 하고 워커는 fork로 공유
+                "preload_app": True,
+                "post_fork": _post_fork,
+                "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+                "timeout": SERVER_TIMEOUT,
+                "keepalive": SERVER_KEEPALIVE,
+                "max_requests": SERVER_MAX_REQUESTS,
+                "max_requests_jitter": SERVER_MAX_REQUESTS // 10,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app(app) if isinstance(app, str) else app
+
+    ServiceApplication().run()
+
+
+def run_uvicorn(app, port: int, workers: int):
+    import uvicorn
+
+    # uvicorn의 다중 워커는 앱을 import 경로로만 받는다
+    if workers > 1 and not isinstance(app, str):
+        logger.warning("gunicorn is not installed; running a single worker")
+        workers = 1
+    uvicorn.run(app, host=SERVER_HOST, port=port, workers=workers, loop=SERVER_LOOP, http=SERVER_HTTP,
+                timeout_keep_alive=SERVER_KEEPALIVE, timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT)
+
+
+# 워커가 여러 개이면 /metrics, /stats가 모든 워커의 값을 합산하도록 지표 파일 디렉터리 설정
+def enable_multiprocess_metrics(workers: int):
+    if workers <= 1:
+        return
+    from common.metrics import enable_multiprocess
+
+    enable_multiprocess(os.getenv("METRICS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="service-metrics-"))
+
+
+def run(app, port: int, workers: int = None):
+    """app은 ASGI 앱 객체 또는 "모듈:속성" 경로"""
+    workers = workers or SERVER_WORKERS or available_cpus()
+    enable_multiprocess_metrics(workers)
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        run_uvicorn(app, port, workers)
+        return
+    run_gunicorn(app, port, workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서비스 운영 실행기 (gunicorn + uvicorn 워커)")
+    parser.add_argument("app", help="ASGI 앱 경로 (예: auth_service.main:app, Docker 이미지에서는 main:app)")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--workers", type=int, help="워커 수 (기본: SERVER_WORKERS 또는 CPU 수)")
+    args = parser.parse_args()
+    run(args.app, args.port, args.workers)
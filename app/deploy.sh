@@ -9,59 +9,47 @@ export TESTING=true
 # Docker Compose로 테스트 DB 및 운영 DB 실행
 docker-compose up -d db test_db
 
-# 테이블 생성 SQL 명령어
-SQL_COMMAND="
-DROP TABLE IF EXISTS user_delete_logs;
-DROP TABLE IF EXISTS user_update_logs;
-DROP TABLE IF EXISTS posts;
-DROP TABLE IF EXISTS users;
-
-CREATE TABLE IF NOT EXISTS users (
-    id SERIAL PRIMARY KEY,
-    login_email VARCHAR(255) UNIQUE NOT NULL,
-    password VARCHAR(255) NOT NULL,
-    name VARCHAR(255) NOT NULL,
-    gender VARCHAR(50),
-    age INTEGER,
-    phone VARCHAR(50)
-);
-CREATE TABLE IF NOT EXISTS user_update_logs (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER NOT NULL,
-    updated_by VARCHAR(255) NOT NULL,
-    updated_at TIMESTAMP DEFAULT NOW(),
-    changes TEXT NOT NULL,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-);
-CREATE TABLE IF NOT EXISTS user_delete_logs (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER NOT NULL,
-    login_email VARCHAR(255) NOT NULL,
-    deleted_at TIMESTAMP DEFAULT NOW(),
-    reason TEXT
-);
-CREATE TABLE IF NOT EXISTS posts (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER NOT NULL,
-    title VARCHAR(255) NOT NULL,
-    content TEXT,
-    updated_at TIMESTAMP DEFAULT NOW(),
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-);
-"
-
-# 운영 DB 컨테이너에 테이블 생성
-docker exec -i db psql -U user -d appdb -c "$SQL_COMMAND"
+# DB가 접속 가능해질 때까지 대기
+wait_for_db() {
+  until docker exec "$1" pg_isready -U "$2" -d "$3" > /dev/null 2>&1; do
+    sleep 1
+  done
+}
+wait_for_db db user appdb
+wait_for_db test_db testuser testdb
+
+# 스키마는 Alembic 마이그레이션(migrations/versions)으로 관리
+# 운영 DB: 기존 deploy.sh(DROP/CREATE)로 만든 스키마(alembic_version 없음)는 0001로 표시한 뒤 이후 마이그레이션만 적용
+LEGACY_SCHEMA=$(docker exec -i db psql -U user -d appdb -tAc \
+  "SELECT to_regclass('public.users') IS NOT NULL AND to_regclass('public.alembic_version') IS NULL")
+if [ "$LEGACY_SCHEMA" = "t" ]; then
+  TESTING=false alembic stamp 0001
+fi
+TESTING=false alembic upgrade head || exit 1
 
-# 테스트 DB 컨테이너에 테이블 생성
-docker exec -i test_db psql -U testuser -d testdb -c "$SQL_COMMAND"
+# 테스트 DB: 매 실행마다 비운 뒤 최신 스키마로 생성
+reset_test_db() {
+  docker exec -i test_db psql -U testuser -d testdb -c "DROP SCHEMA public CASCADE; CREATE SCHEMA public;" > /dev/null
+  TESTING=true alembic upgrade head
+}
+reset_test_db || exit 1
 
-# 테스트 실행
+# 테스트 실행 (동기 DB 경로)
 echo "Running tests..."
 pytest --disable-warnings
+TEST_RESULT=$?
+
+# 테스트 실행 (비동기 DB 경로)
+# TestClient는 요청마다 이벤트 루프를 새로 만들기 때문에 asyncpg 커넥션을 재사용하지 않도록 NullPool(pgbouncer 프로파일)로 실행
+if [ $TEST_RESULT -eq 0 ]; then
+  echo "Running tests with USE_ASYNC_DB=true..."
+  reset_test_db
+  USE_ASYNC_DB=true DB_POOL_PROFILE=pgbouncer pytest --disable-warnings
+  TEST_RESULT=$?
+fi
 
 # 테스트 결과 확인
-if [ $? -eq 0 ]; then
+if [ $TEST_RESULT -eq 0 ]; then
   echo "All tests passed successfully. Starting Docker Compose for application..."
   # 테스트 성공 시 테스트 환경 변수 변경
   export TESTING=false
@@ -0,0 +1,42 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from common.db_setup import selected_database_url
+from common.entity import Base
+from common.search import SEARCH_SCHEMA_OBJECTS
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+# 엔티티에 선언하지 않는 전문 검색용 컬럼 / 인덱스 / FTS 테이블은 autogenerate 비교에서 제외
+def include_object(obj, name, type_, reflected, compare_to):
+    return not (name in SEARCH_SCHEMA_OBJECTS or (type_ == "table" and name.startswith("posts_fts")))
+
+
+# DB 연결 없이 SQL 스크립트만 출력 (alembic upgrade head --sql)
+def run_migrations_offline():
+    context.configure(url=selected_database_url, target_metadata=target_metadata, literal_binds=True,
+                      dialect_opts={"paramstyle": "named"}, include_object=include_object)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # 마이그레이션은 짧게 한 번 실행되므로 서비스용 커넥션 풀 설정을 사용하지 않는다
+    connectable = create_engine(selected_database_url, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,57 @@
+"""initial schema (deploy.sh에서 생성하던 테이블)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("login_email", sa.String(255), nullable=False, unique=True),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("gender", sa.String(50)),
+        sa.Column("age", sa.Integer()),
+        sa.Column("phone", sa.String(50)),
+    )
+    op.create_table(
+        "user_update_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("updated_by", sa.String(255), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("changes", sa.Text(), nullable=False),
+    )
+    op.create_table(
+        "user_delete_logs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("login_email", sa.String(255), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("reason", sa.Text()),
+    )
+    op.create_table(
+        "posts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("content", sa.Text()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("posts")
+    op.drop_table("user_delete_logs")
+    op.drop_table("user_update_logs")
+    op.drop_table("users")
@@ -0,0 +1,26 @@
+"""indexes for posts(user_id), posts(updated_at, id), user_update_logs(user_id)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # update_post의 작성자 조건 및 FK(ON DELETE CASCADE) 확인
+    op.create_index("ix_posts_user_id", "posts", ["user_id"])
+    # 게시글 목록 정렬 / 커서 페이지네이션 (updated_at DESC, id DESC는 역방향 스캔으로 사용)
+    op.create_index("ix_posts_updated_at_id", "posts", ["updated_at", "id"])
+    op.create_index("ix_user_update_logs_user_id", "user_update_logs", ["user_id"])
+
+
+def downgrade():
+    op.drop_index("ix_user_update_logs_user_id", table_name="user_update_logs")
+    op.drop_index("ix_posts_updated_at_id", table_name="posts")
+    op.drop_index("ix_posts_user_id", table_name="posts")
@@ -0,0 +1,56 @@
+"""full-text search for posts (PostgreSQL tsvector + GIN, SQLite FTS5)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        # 'simple' 설정: 공백 단위 토큰 + 소문자 변환 (한국어 형태소 분석 설정이 없으므로 언어별 stemming을 하지 않음)
+        op.execute("""
+            ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)")
+    elif dialect_name == "sqlite":
+        op.execute("CREATE VIRTUAL TABLE posts_fts USING fts5(title, content, content='posts', content_rowid='id')")
+        op.execute("""
+            CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN
+                INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER posts_fts_update AFTER UPDATE ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+            END
+        """)
+        # 기존 게시글 색인
+        op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        op.execute("DROP INDEX ix_posts_search_vector")
+        op.execute("ALTER TABLE posts DROP COLUMN search_vector")
+    elif dialect_name == "sqlite":
+        for trigger in ("posts_fts_insert", "posts_fts_delete", "posts_fts_update"):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE posts_fts")
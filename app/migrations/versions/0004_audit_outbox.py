@@ -0,0 +1,42 @@
+"""structured audit changes (JSONB) and audit_outbox
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+JSONType = sa.JSON().with_variant(JSONB(), "postgresql")
+
+
+def upgrade():
+    # 기존 문자열 이력은 JSON 문자열 값으로 보존
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE user_update_logs ALTER COLUMN changes TYPE jsonb USING to_jsonb(changes)")
+    else:
+        op.execute("UPDATE user_update_logs SET changes = json_quote(changes)")
+        with op.batch_alter_table("user_update_logs") as batch_op:
+            batch_op.alter_column("changes", type_=sa.JSON(), existing_nullable=False)
+    op.create_table(
+        "audit_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("payload", JSONType, nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("audit_outbox")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE user_update_logs ALTER COLUMN changes TYPE text USING changes::text")
+    else:
+        with op.batch_alter_table("user_update_logs") as batch_op:
+            batch_op.alter_column("changes", type_=sa.Text(), existing_nullable=False)
@@ -0,0 +1,21 @@
+"""refresh_tokens.expires_at index (purge of expired refresh tokens)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 만료된 refresh token을 전체 스캔 없이 삭제
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
@@ -0,0 +1,40 @@
+"""posts.updated_at NOT NULL with a server default (keyset pagination cursor)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from common.search import SEARCH_DDL
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 목록 커서가 (updated_at, id)이므로 NULL인 기존 게시글은 현재 시각으로 채운다
+    op.execute("UPDATE posts SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL")
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("posts") as batch_op:
+            batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False,
+                                  server_default=sa.func.now())
+        # 테이블을 다시 만들면 전문 검색 동기화 트리거가 사라지므로 다시 생성 (0003)
+        for statement in SEARCH_DDL["sqlite"][1:]:
+            op.execute(statement)
+    else:
+        op.alter_column("posts", "updated_at", existing_type=sa.DateTime(), nullable=False,
+                        server_default=sa.func.now())
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("posts") as batch_op:
+            batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=True, server_default=None)
+        for statement in SEARCH_DDL["sqlite"][1:]:
+            op.execute(statement)
+    else:
+        op.alter_column("posts", "updated_at", existing_type=sa.DateTime(), nullable=True, server_default=None)
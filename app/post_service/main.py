@@ -1,10 +1,26 @@
-from fastapi import FastAPI, APIRouter, Depends, Security, Query
-from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from common.db_setup import get_db
+import os
+from enum import Enum
+from typing import Optional
+
+from fastapi import FastAPI, APIRouter, Depends, Query, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, tuple_, insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from common.db_setup import engine, get_db, get_async_db, get_read_db, get_async_read_db, USE_ASYNC_DB
 from common.entity import Post
-from common.security import verify_token, security
+from common.pagination import encode_cursor, decode_cursor, InvalidCursor
+from common.cache import ReadThroughCache, create_cache_backend
+from common.bulk import read_bulk_rows, run_bulk, InvalidBulkRequest
+from common.export import ExportFormat, export_response
+from common.search import search_clauses, check_search_support
+from common.conditional import post_etag, page_etag, etag_matches, not_modified
+from common.security import current_user_id
 from common.dto.base_response_dto import ResponseDto
+from common.monitoring import router as monitoring_router, register_stats
+from common.metrics import MetricsMiddleware
+from common.read_replicas import ReadYourWritesMiddleware
 from common.error_types import ErrorType
 from datetime import datetime
 
@@ -15,53 +31,354 @@ app = FastAPI(
     description="게시판 백엔드 서비스",
     version="1.0.0"
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 router = APIRouter(prefix="/posts")
 
+# 전문 검색을 지원하지 않는 DB(PostgreSQL / SQLite 이외)면 시작 시 실패
+check_search_support(engine.dialect.name)
+
+# 게시글 상세 캐시 (조회 시 read-through, 작성/수정 시 write-through)
+POST_CACHE_TTL_SECONDS = float(os.getenv("POST_CACHE_TTL_SECONDS", "60"))
+post_cache = ReadThroughCache(create_cache_backend(), namespace="post", ttl_seconds=POST_CACHE_TTL_SECONDS)
+register_stats("post_cache", post_cache.stats)
+
+
+# 게시글 응답에 함께 포함할 수 있는 연관 데이터
+class PostInclude(str, Enum):
+    author = "author"  # 작성자 이름 / 이메일 (users 조인)
+
+
+# 작성자를 같은 쿼리에서 조인하여 로드 (게시글 수와 관계없이 쿼리 1회)
+def with_author(stmt, include: Optional[PostInclude]):
+    if include == PostInclude.author:
+        return stmt.options(joinedload(Post.user, innerjoin=True))
+    return stmt
+
+
+# 작성자 정보가 포함된 상세 응답은 별도 키로 캐시 (게시글 수정 시 함께 갱신)
+def post_cache_key(post_id: int, include: Optional[PostInclude]):
+    return f"{post_id}:{include.value}" if include else post_id
+
+# 게시글 목록 조회 쿼리 (잘못된 커서인 경우 None)
+def posts_page_stmt(limit: int, offset: int, cursor: Optional[str]):
+    # 최신 수정순 정렬, 같은 시각은 id로 구분하여 페이지 간 순서를 고정
+    stmt = select(Post).order_by(Post.updated_at.desc(), Post.id.desc())
+    if cursor:
+        if offset:
+            return None
+        try:
+            last = decode_cursor(cursor, ("updated_at", "id"))
+            last_updated_at, last_id = datetime.fromisoformat(last["updated_at"]), int(last["id"])
+        except (InvalidCursor, TypeError, ValueError):
+            return None
+        stmt = stmt.where(tuple_(Post.updated_at, Post.id) < (last_updated_at, last_id))
+    else:
+        stmt = stmt.offset(offset)
+    return stmt.limit(limit)
+
+
+def posts_page_response(items, limit: int, if_none_match: Optional[str], include: Optional[PostInclude] = None):
+    # 페이지가 가득 찬 경우에만 다음 페이지 커서를 내려준다
+    next_cursor = None
+    if len(items) == limit:
+        next_cursor = encode_cursor({"updated_at": items[-1].updated_at.isoformat(), "id": items[-1].id})
+    posts = [item.to_dict(include_author=include == PostInclude.author) for item in items]
+    # 페이지 내용이 바뀌지 않았으면 본문 없이 304 응답
+    etag = page_etag(posts, next_cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ResponseDto.fast_success_response(data=posts, next_cursor=next_cursor, headers={"ETag": etag})
+
+
+def post_detail_response(data, if_none_match: Optional[str]):
+    if not data:
+        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
+    etag = post_etag(data)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ResponseDto.fast_success_response(data=data, headers={"ETag": etag})
+
+
+# If-Match 헤더가 있으면 현재 게시글의 ETag와 일치해야 수정 가능 (낙관적 동시성 제어, strong 비교)
+def if_match_failed(existing_post: Post, if_match: Optional[str]):
+    return if_match is not None and not etag_matches(if_match, post_etag(existing_post.to_dict()), strong=True)
+
+
+# 게시글 수정 쿼리 (If-Match로 확인한 경우 확인한 시점의 updated_at이 그대로일 때만 수정)
+# 확인과 수정 사이에 다른 요청이 먼저 수정하면 수정된 행이 없으므로(None) 412로 응답
+def update_post_stmt(existing_post: Post, post: PostDTO, if_match: Optional[str]):
+    stmt = update(Post).where(Post.id == existing_post.id, Post.user_id == existing_post.user_id)
+    if if_match is not None and if_match.strip() != "*":
+        stmt = stmt.where(Post.updated_at == existing_post.updated_at)
+    return stmt.values(**post.dict(), updated_at=datetime.utcnow()).returning(Post)
+
+
+def precondition_failed(response: Response):
+    response.status_code = 412
+    return ResponseDto.error_response(ErrorType.PRECONDITION_FAILED)
+
+
+# 게시글 검색 쿼리 (관련도 점수 높은 순, 같은 점수는 id 역순, 검색어가 공백뿐이거나 잘못된 커서인 경우 None)
+def posts_search_stmt(q: str, limit: int, cursor: Optional[str]):
+    q = q.strip()
+    if not q:
+        return None
+    match, rank, fts_table = search_clauses(engine.dialect.name, q)
+    stmt = select(Post, rank.label("search_rank"))
+    if fts_table is not None:
+        stmt = stmt.join(fts_table, fts_table.c.rowid == Post.id)
+    stmt = stmt.where(match)
+    if cursor:
+        try:
+            last = decode_cursor(cursor, ("rank", "id"))
+            last_rank, last_id = float(last["rank"]), int(last["id"])
+        except (InvalidCursor, TypeError, ValueError):
+            return None
+        stmt = stmt.where(tuple_(rank, Post.id) < (last_rank, last_id))
+    return stmt.order_by(rank.desc(), Post.id.desc()).limit(limit)
+
+
+def posts_search_response(rows, limit: int):
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor({"rank": rows[-1].search_rank, "id": rows[-1].Post.id})
+    posts = [{**row.Post.to_dict(), "rank": row.search_rank} for row in rows]
+    return ResponseDto.fast_success_response(data=posts, next_cursor=next_cursor)
+
+
+# 게시글 내보내기 쿼리 (updated_from <= updated_at < updated_to, 증분 내보내기용)
+def posts_export_stmt(updated_from: Optional[datetime], updated_to: Optional[datetime]):
+    stmt = select(Post.id, Post.user_id, Post.title, Post.content, Post.updated_at).order_by(Post.updated_at, Post.id)
+    if updated_from:
+        stmt = stmt.where(Post.updated_at >= updated_from)
+    if updated_to:
+        stmt = stmt.where(Post.updated_at < updated_to)
+    return stmt
+
+
+# 여러 게시글을 multi-row INSERT ... RETURNING으로 한 번에 저장 (id는 입력 순서대로 반환)
+def bulk_insert_posts_stmt():
+    return insert(Post).returning(Post.id, sort_by_parameter_order=True)
+
+
+def bulk_post_rows(user_id: int, values):
+    now = datetime.utcnow()
+    return [{**value, "user_id": user_id, "updated_at": now} for value in values]
+
+
+def insert_posts(db: Session, user_id: int, values):
+    try:
+        ids = db.execute(bulk_insert_posts_stmt(), bulk_post_rows(user_id, values)).scalars().all()
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return ids
+
+
+async def insert_posts_async(db: AsyncSession, user_id: int, values):
+    try:
+        ids = (await db.execute(bulk_insert_posts_stmt(), bulk_post_rows(user_id, values))).scalars().all()
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+    return ids
+
+
 @router.get("/", description="게시판 목록 불러오기 API")
 def get_posts(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db),
+    user_id: int = Depends(current_user_id),
+    db: Session = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor for keyset pagination (next_cursor of the previous page)"),
+    include: Optional[PostInclude] = Query(None, description="Embed related data (author)"),
+    if_none_match: Optional[str] = Header(None)
+):
+    stmt = posts_page_stmt(limit, offset, cursor)
+    if stmt is None:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    items = db.execute(with_author(stmt, include)).scalars().all()
+    return posts_page_response(items, limit, if_none_match, include)
+
+# /{post_id} 보다 먼저 등록해야 search / export가 post_id로 해석되지 않는다
+@router.get("/search", description="게시글 검색 API (제목 / 내용 전문 검색, 관련도 순)")
+def search_posts(
+    db: Session = Depends(get_read_db),
+    user_id: int = Depends(current_user_id),
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (all terms must match)"),
     limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
-    offset: int = Query(0, ge=0, description="Offset for pagination")
+    cursor: Optional[str] = Query(None, description="Cursor for keyset pagination (next_cursor of the previous page)")
 ):
-    verify_token(credentials)
-    posts = [item.to_dict() for item in db.query(Post).offset(offset).limit(limit).all()]
-    return ResponseDto.success_response(data=posts)
+    stmt = posts_search_stmt(q, limit, cursor)
+    if stmt is None:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    return posts_search_response(db.execute(stmt).all(), limit)
+
+@router.get("/export", description="게시글 전체 내보내기 API (NDJSON / CSV 스트리밍)")
+def export_posts(
+    user_id: int = Depends(current_user_id),
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    updated_from: Optional[datetime] = Query(None, description="Only posts with updated_at >= this value"),
+    updated_to: Optional[datetime] = Query(None, description="Only posts with updated_at < this value")
+):
+    return export_response(posts_export_stmt(updated_from, updated_to), fmt, "posts")
 
 @router.get("/{post_id}", description="선택된 게시판 글 확인 API")
-def get_post(post_id: int, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    verify_token(credentials)
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
-    return ResponseDto.success_response(data=post.to_dict())
+def get_post(post_id: int, user_id: int = Depends(current_user_id), db: Session = Depends(get_read_db),
+             include: Optional[PostInclude] = Query(None, description="Embed related data (author)"),
+             if_none_match: Optional[str] = Header(None)):
+    def load_post():
+        post = db.execute(with_author(select(Post).where(Post.id == post_id), include)).scalars().first()
+        return post.to_dict(include_author=include == PostInclude.author) if post else None
+
+    data = post_cache.get_or_load(post_cache_key(post_id, include), load_post)
+    return post_detail_response(data, if_none_match)
 
 @router.post("/", description="게시판 글 작성 API")
-def create_post(post: PostDTO, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    user_id = verify_token(credentials)
+def create_post(post: PostDTO, user_id: int = Depends(current_user_id), db: Session = Depends(get_db)):
     new_post = Post(**post.dict(), user_id=user_id, updated_at=datetime.utcnow())
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
-    return ResponseDto.success_response(data=new_post.to_dict())
+    data = new_post.to_dict()
+    post_cache.set(new_post.id, data)
+    return ResponseDto.success_response(data=data)
+
+@router.post("/bulk", description="게시판 글 일괄 작성 API (JSON 배열 또는 NDJSON)")
+async def create_posts_bulk(request: Request, user_id: int = Depends(current_user_id), db: Session = Depends(get_db)):
+    try:
+        rows = await read_bulk_rows(request)
+    except InvalidBulkRequest:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    result = await run_bulk(rows, PostDTO, lambda values: run_in_threadpool(insert_posts, db, user_id, values))
+    return ResponseDto.fast_success_response(data=result, total_count=len(rows))
 
 @router.put("/{post_id}", description="게시판 글 수정 API")
-def update_post(post_id: int, post: PostDTO, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    user_id = verify_token(credentials)
-    existing_post = db.query(Post).filter(Post.id == post_id, Post.user_id == user_id).first()
+def update_post(post_id: int, post: PostDTO, response: Response, user_id: int = Depends(current_user_id), db: Session = Depends(get_db),
+                if_match: Optional[str] = Header(None)):
+    # 작성자 포함 캐시 항목도 갱신할 수 있도록 작성자를 함께 로드
+    existing_post = db.execute(with_author(select(Post).where(Post.id == post_id, Post.user_id == user_id),
+                                           PostInclude.author)).scalars().first()
     if not existing_post:
         return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
+    if if_match_failed(existing_post, if_match):
+        return precondition_failed(response)
 
-    for key, value in post.dict().items():
-        setattr(existing_post, key, value)
-    existing_post.updated_at = datetime.utcnow()
+    updated_post = db.execute(update_post_stmt(existing_post, post, if_match)).scalars().first()
+    if updated_post is None:
+        db.rollback()
+        return precondition_failed(response)
+    data = updated_post.to_dict()  # RETURNING으로 받은 값 (commit 후 다시 조회하지 않음)
+    data_with_author = updated_post.to_dict(include_author=True)
     db.commit()
-    db.refresh(existing_post)
-    data = existing_post.to_dict()
+    # 두 캐시 항목 모두 primary 값으로 갱신 (무효화하면 다음 miss에서 복제 지연 중인 값을 캐시할 수 있음)
+    post_cache.set(post_id, data)
+    post_cache.set(post_cache_key(post_id, PostInclude.author), data_with_author)
+    response.headers["ETag"] = post_etag(data)
+    return ResponseDto.success_response(data=data)
+
+
+# AsyncSession 기반 핸들러 (USE_ASYNC_DB=true 인 경우 위의 동기 핸들러 대신 사용)
+async_router = APIRouter(prefix="/posts")
+
+@async_router.get("/", description="게시판 목록 불러오기 API")
+async def get_posts_async(
+    user_id: int = Depends(current_user_id),
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor for keyset pagination (next_cursor of the previous page)"),
+    include: Optional[PostInclude] = Query(None, description="Embed related data (author)"),
+    if_none_match: Optional[str] = Header(None)
+):
+    stmt = posts_page_stmt(limit, offset, cursor)
+    if stmt is None:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    items = (await db.execute(with_author(stmt, include))).scalars().all()
+    return posts_page_response(items, limit, if_none_match, include)
+
+@async_router.get("/search", description="게시글 검색 API (제목 / 내용 전문 검색, 관련도 순)")
+async def search_posts_async(
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(current_user_id),
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (all terms must match)"),
+    limit: int = Query(10, ge=1, le=100, description="Number of posts to return"),
+    cursor: Optional[str] = Query(None, description="Cursor for keyset pagination (next_cursor of the previous page)")
+):
+    stmt = posts_search_stmt(q, limit, cursor)
+    if stmt is None:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    return posts_search_response((await db.execute(stmt)).all(), limit)
+
+@async_router.get("/export", description="게시글 전체 내보내기 API (NDJSON / CSV 스트리밍)")
+async def export_posts_async(
+    user_id: int = Depends(current_user_id),
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    updated_from: Optional[datetime] = Query(None, description="Only posts with updated_at >= this value"),
+    updated_to: Optional[datetime] = Query(None, description="Only posts with updated_at < this value")
+):
+    return export_response(posts_export_stmt(updated_from, updated_to), fmt, "posts", async_session=True)
+
+@async_router.get("/{post_id}", description="선택된 게시판 글 확인 API")
+async def get_post_async(post_id: int, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_read_db),
+                         include: Optional[PostInclude] = Query(None, description="Embed related data (author)"),
+                         if_none_match: Optional[str] = Header(None)):
+    async def load_post():
+        post = (await db.execute(with_author(select(Post).where(Post.id == post_id), include))).scalars().first()
+        return post.to_dict(include_author=include == PostInclude.author) if post else None
+
+    data = await post_cache.get_or_load_async(post_cache_key(post_id, include), load_post)
+    return post_detail_response(data, if_none_match)
+
+@async_router.post("/", description="게시판 글 작성 API")
+async def create_post_async(post: PostDTO, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db)):
+    new_post = Post(**post.dict(), user_id=user_id, updated_at=datetime.utcnow())
+    db.add(new_post)
+    await db.commit()
+    await db.refresh(new_post)
+    data = new_post.to_dict()
+    post_cache.set(new_post.id, data)
+    return ResponseDto.success_response(data=data)
+
+@async_router.post("/bulk", description="게시판 글 일괄 작성 API (JSON 배열 또는 NDJSON)")
+async def create_posts_bulk_async(request: Request, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db)):
+    try:
+        rows = await read_bulk_rows(request)
+    except InvalidBulkRequest:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    result = await run_bulk(rows, PostDTO, lambda values: insert_posts_async(db, user_id, values))
+    return ResponseDto.fast_success_response(data=result, total_count=len(rows))
+
+@async_router.put("/{post_id}", description="게시판 글 수정 API")
+async def update_post_async(post_id: int, post: PostDTO, response: Response, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db),
+                            if_match: Optional[str] = Header(None)):
+    # 작성자 포함 캐시 항목도 갱신할 수 있도록 작성자를 함께 로드
+    existing_post = (await db.execute(with_author(select(Post).where(Post.id == post_id, Post.user_id == user_id),
+                                                  PostInclude.author))).scalars().first()
+    if not existing_post:
+        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
+    if if_match_failed(existing_post, if_match):
+        return precondition_failed(response)
+
+    updated_post = (await db.execute(update_post_stmt(existing_post, post, if_match))).scalars().first()
+    if updated_post is None:
+        await db.rollback()
+        return precondition_failed(response)
+    data = updated_post.to_dict()  # RETURNING으로 받은 값 (commit 후 다시 조회하지 않음)
+    data_with_author = updated_post.to_dict(include_author=True)
+    await db.commit()
+    # 두 캐시 항목 모두 primary 값으로 갱신 (무효화하면 다음 miss에서 복제 지연 중인 값을 캐시할 수 있음)
+    post_cache.set(post_id, data)
+    post_cache.set(post_cache_key(post_id, PostInclude.author), data_with_author)
+    response.headers["ETag"] = post_etag(data)
     return ResponseDto.success_response(data=data)
 
-app.include_router(router)
+app.include_router(async_router if USE_ASYNC_DB else router)
+app.include_router(monitoring_router)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    from common.server import run
+    run(app, port=8003)
@@ -0,0 +1,8 @@
+#!/bin/bash
+# 스트리밍 복제용 계정 생성 (빈 볼륨으로 처음 시작할 때만 실행, docker compose --profile replica 의 db_replica가 사용)
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-EOSQL
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD 'replicator';
+EOSQL
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class FakeRedis:
+    """테스트용 Redis 대역 (사용하는 명령만 구현)"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._alive(key)
+            return None if entry is None else entry[0]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            if isinstance(value, str):
+                value = value.encode()
+            self._values[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._values.pop(key, None) is not None)
+
+    # sorted set 명령 (로그인 시도 제한용)
+    def _sorted_set(self, key):
+        entry = self._alive(key)
+        if entry is None:
+            entry = self._values[key] = ({}, None)
+        return entry[0]
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            members = self._sorted_set(key)
+            added = sum(1 for member in mapping if member not in members)
+            members.update(mapping)
+            return added
+
+    def zremrangebyscore(self, key, min_score, max_score):
+        with self._lock:
+            members = self._sorted_set(key)
+            removed = [member for member, score in members.items() if min_score <= score <= max_score]
+            for member in removed:
+                del members[member]
+            return len(removed)
+
+    def zcard(self, key):
+        with self._lock:
+            return len(self._sorted_set(key))
+
+    def zrange(self, key, start, end, withscores=False):
+        with self._lock:
+            ordered = sorted(self._sorted_set(key).items(), key=lambda item: item[1])
+            selected = ordered[start:None if end == -1 else end + 1]
+            return selected if withscores else [member for member, _ in selected]
+
+    def expire(self, key, seconds):
+        with self._lock:
+            entry = self._alive(key)
+            if entry is None:
+                return False
+            self._values[key] = (entry[0], time.monotonic() + seconds)
+            return True
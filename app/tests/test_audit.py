@@ -0,0 +1,92 @@
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+
+from common.audit import AuditWriter
+from common.db_setup import SessionLocal
+from common.entity import AuditOutbox, User, UserUpdateLog
+
+
+def create_user(db, login_email):
+    user = User(login_email=login_email, password="x", name="Audit User")
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def update_logs(user_id):
+    with SessionLocal() as db:
+        return db.execute(select(UserUpdateLog).where(UserUpdateLog.user_id == user_id)).scalars().all()
+
+
+# queue 모드: 커밋된 변경의 감사 로그만 큐에 들어가고 flush 시 구조화된 changes로 저장
+def test_queue_mode_writes_committed_entries_only():
+    writer = AuditWriter("queue", batch_size=10, flush_interval_ms=60000, max_queue=100)
+    changes = {"name": {"old": "Audit User", "new": "Renamed"}}
+    with SessionLocal() as db:
+        user_id = create_user(db, "audit-queue@example.com")
+        writer.record(db, "update", {"user_id": user_id, "updated_by": str(user_id), "changes": changes})
+        db.rollback()
+        writer.record(db, "update", {"user_id": user_id, "updated_by": str(user_id), "changes": changes})
+        db.commit()
+    assert writer.stats()["queue_depth"] == 1
+    writer.flush()
+    logs = update_logs(user_id)
+    assert [log.changes for log in logs] == [changes]
+    assert writer.stats()["written"] == 1
+    writer.stop()
+
+
+# outbox 모드: 같은 트랜잭션으로 outbox에 저장된 뒤 로그 테이블로 옮겨짐
+def test_outbox_mode_relays_entries():
+    writer = AuditWriter("outbox", batch_size=10, flush_interval_ms=60000, max_queue=100)
+    with SessionLocal() as db:
+        user_id = create_user(db, "audit-outbox@example.com")
+        for age in (20, 21):
+            writer.record(db, "update", {"user_id": user_id, "updated_by": str(user_id),
+                                         "changes": {"age": {"old": age - 1, "new": age}}})
+        db.commit()
+    writer.stop()
+    assert len(update_logs(user_id)) == 2
+    assert writer.stats()["outbox_depth"] == 0
+    with SessionLocal() as db:
+        assert db.execute(select(AuditOutbox)).first() is None
+
+
+# 큐가 가득 차면 커밋 이벤트에서 DB에 쓰지 않고 버린 뒤 overflow로 집계
+def test_queue_overflow_drops_without_writing():
+    writer = AuditWriter("queue", batch_size=10, flush_interval_ms=60000, max_queue=1)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with SessionLocal() as db:
+        user_id = create_user(db, "audit-overflow@example.com")
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        for age in (20, 21):
+            writer._enqueue("update", {"user_id": user_id, "updated_by": str(user_id),
+                                       "changes": {"age": {"old": age - 1, "new": age}}})
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert statements == []
+    assert (writer.stats()["queue_depth"], writer.stats()["overflow"]) == (1, 1)
+    writer.flush()
+    assert len(update_logs(user_id)) == 1
+
+
+# outbox_depth는 TTL 동안 COUNT 쿼리 없이 재사용
+def test_outbox_depth_is_cached():
+    writer = AuditWriter("outbox", batch_size=10, flush_interval_ms=60000, max_queue=100, outbox_depth_ttl=60)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        depths = [writer.stats()["outbox_depth"] for _ in range(3)]
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert depths == [0, 0, 0]
+    assert len([statement for statement in statements if "count" in statement.lower()]) == 1
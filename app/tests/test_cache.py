@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+from common.cache import InMemoryCacheBackend, RedisCacheBackend, ReadThroughCache
+from common.count_strategy import CountCache
+from tests.fake_redis import FakeRedis
+
+
+# 메모리 백엔드: TTL 만료 및 LRU 제거
+def test_in_memory_backend_ttl_and_lru():
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set("expired", 1, ttl_seconds=-1)
+    assert backend.get("expired") is None
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    backend.get("a")
+    backend.set("c", 3, 60)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+
+
+# Redis 백엔드: JSON 직렬화 후 저장, 삭제 시 무효화
+def test_redis_backend_round_trip():
+    cache = ReadThroughCache(RedisCacheBackend(FakeRedis()), namespace="post", ttl_seconds=60)
+    value = {"id": 1, "updated_at": datetime(2024, 1, 1, 12, 0)}
+    assert cache.get_or_load(1, lambda: value) == value
+    assert cache.get_or_load(1, lambda: None) == {"id": 1, "updated_at": "2024-01-01T12:00:00"}
+    cache.invalidate(1)
+    assert cache.get_or_load(1, lambda: None) is None
+    assert cache.stats()["hits"] == 1
+
+
+# 동시에 발생한 miss는 DB 조회 한 번으로 합쳐진다
+def test_concurrent_misses_load_once():
+    cache = ReadThroughCache(InMemoryCacheBackend(100), namespace="post", ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"id": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(1, loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"id": 1}] * 8
+
+
+def test_concurrent_async_misses_load_once():
+    cache = ReadThroughCache(InMemoryCacheBackend(100), namespace="post", ttl_seconds=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load_async(1, loader) for _ in range(8)))
+
+    assert asyncio.run(scenario()) == [{"id": 1}] * 8
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 7
+
+
+# 행 수 캐시를 redis로 공유하면 다른 서비스(auth_service)의 무효화가 바로 반영되고,
+# 무효화 전에 시작한 COUNT(*) 결과는 저장되어도 사용하지 않는다
+def test_count_cache_shared_invalidation_and_stale_load():
+    redis = FakeRedis()
+    user_service_cache = CountCache(RedisCacheBackend(redis), ttl_seconds=60)
+    auth_service_cache = CountCache(RedisCacheBackend(redis), ttl_seconds=60)
+    assert user_service_cache.get("users", lambda: 10) == 10
+    assert user_service_cache.get("users", lambda: 99) == 10
+    auth_service_cache.invalidate("users")
+    assert user_service_cache.get("users", lambda: 11) == 11
+
+    def stale_loader():
+        auth_service_cache.invalidate("users")  # COUNT(*) 실행 중에 회원가입 발생
+        return 11
+
+    user_service_cache.invalidate("users")
+    assert user_service_cache.get("users", stale_loader) == 11
+    assert user_service_cache.get("users", lambda: 12) == 12
+
+
+# 먼저 조회를 시작한 요청이 취소되어도 기다리던 요청은 멈추지 않고 직접 조회
+def test_cancelled_async_leader_does_not_block_waiters():
+    cache = ReadThroughCache(InMemoryCacheBackend(100), namespace="post", ttl_seconds=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    async def scenario():
+        leader = asyncio.ensure_future(cache.get_or_load_async(1, loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_load_async(1, loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(scenario()) == {"id": 1}
+    assert len(calls) == 2
+    assert cache.get_or_load(1, lambda: None) == {"id": 1}
+
+
+# 조회 도중 쓰기(write-through)가 있으면 조회 결과(이전 값)로 캐시를 덮어쓰지 않는다
+def test_load_started_before_write_is_not_cached():
+    cache = ReadThroughCache(InMemoryCacheBackend(100), namespace="post", ttl_seconds=60)
+
+    def slow_loader():
+        cache.set(1, {"id": 1, "title": "new"})
+        return {"id": 1, "title": "old"}
+
+    assert cache.get_or_load(1, slow_loader) == {"id": 1, "title": "old"}
+    assert cache.get_or_load(1, lambda: None) == {"id": 1, "title": "new"}
+
+    async def slow_async_loader():
+        cache.invalidate(2)
+        return {"id": 2, "title": "old"}
+
+    asyncio.run(cache.get_or_load_async(2, slow_async_loader))
+    assert cache.get_or_load(2, lambda: None) is None
+    assert cache.stats()["stale_loads"] == 2
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import pytest
+
+from common.hashing_pool import HashingPool, HashingPoolBusy
+
+
+# 실행 중 + 대기 작업 수가 한도를 넘으면 대기열에 쌓지 않고 바로 거절
+def test_hashing_pool_rejects_when_full():
+    pool = HashingPool("thread", max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HashingPoolBusy):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+
+    asyncio.run(scenario())
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+
+# 기다리던 요청이 취소되어도 실행 중인 작업이 끝날 때까지 자리를 반납하지 않음
+def test_hashing_pool_keeps_slot_until_cancelled_job_finishes():
+    pool = HashingPool("thread", max_workers=1, max_pending=0)
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait()
+
+    async def scenario():
+        task = asyncio.ensure_future(pool.run(job))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert pool.in_flight == 1
+        with pytest.raises(HashingPoolBusy):
+            await pool.run(job)
+
+    asyncio.run(scenario())
+    release.set()
+    pool.shutdown()
+    assert pool.in_flight == 0
+
+
+# 대량 작업은 작업자 수만큼 묶어 처리하고 입력 순서대로 결과를 반환
+def test_hashing_pool_map_keeps_order():
+    pool = HashingPool("thread", max_workers=3, max_pending=0)
+    assert asyncio.run(pool.map(str.upper, list("abcdefg"))) == list("ABCDEFG")
+    assert pool.in_flight == 0
+    pool.shutdown()
@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from common import metrics
+from common.db_setup import engine, get_db
+from common.metrics import MetricsMiddleware, request_queries
+from common.monitoring import router as monitoring_router
+from common.security import create_access_token
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware, debug_headers=True)
+app.include_router(monitoring_router)
+
+
+@app.get("/items/{item_id}")
+def read_item(item_id: int, db: Session = Depends(get_db)):
+    for _ in range(3):
+        db.execute(text("SELECT 1"))
+    return {"token": create_access_token(item_id)}
+
+
+client = TestClient(app)
+
+
+# 디버그 헤더로 요청 하나에서 실행한 쿼리 수와 시간 구성이 보여야 함
+def test_debug_headers_report_query_count():
+    response = client.get("/items/1")
+    assert response.headers["X-Query-Count"] == "3"
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith('db;desc="3 queries"')
+    assert "jwt_encode;dur=" in timing
+    assert "total;dur=" in timing
+
+
+# /metrics는 라우트 템플릿 단위로 집계하고 등록된 상태 값도 함께 출력
+def test_metrics_endpoint_renders_prometheus_text():
+    client.get("/items/7")
+    client.get("/missing")
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}' in body
+    assert 'http_request_db_queries_bucket{route="/items/{item_id}",le="3"}' in body
+    assert 'security_operation_duration_seconds_count{operation="jwt_encode"}' in body
+    assert "\ntoken_cache_hits " in body
+
+
+# 여러 워커로 실행하면 /metrics는 모든 워커의 히스토그램을 합산하고, 상태 값은 worker 라벨로 구분
+def test_multiprocess_metrics_merge_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_MULTIPROC_DIR", "")
+    monkeypatch.setenv("METRICS_MULTIPROC_DIR", "")
+    client.get("/items/3")
+    own = request_queries.snapshot()[("/items/{item_id}",)]
+    metrics.enable_multiprocess(str(tmp_path))
+    # 다른 워커(실행 중인 부모 프로세스 pid로 대신)가 기록한 파일
+    other = os.getppid()
+    (tmp_path / f"{other}.json").write_text(json.dumps({
+        "pid": other,
+        "histograms": {"http_request_db_queries": [[["/items/{item_id}"], own[0], own[1], 5]]},
+        "stats": {"token_cache": {"hits": 7}},
+    }))
+
+    body = client.get("/metrics").text
+    assert f'http_request_db_queries_count{{route="/items/{{item_id}}"}} {own[2] + 5}' in body
+    assert body.count("# TYPE token_cache_hits gauge") == 1
+    assert f'token_cache_hits{{worker="{other}"}} 7' in body
+    assert f'token_cache_hits{{worker="{os.getpid()}"}}' in body
+    stats = client.get("/stats").json()["data"]
+    assert stats["worker"] == os.getpid()
+    assert stats["workers"][str(other)] == {"token_cache": {"hits": 7}}
+
+
+# 실패한 쿼리의 시작 시각이 커넥션에 남지 않아야 함
+def test_failed_query_does_not_leak_start_time():
+    with engine.connect() as conn:
+        with pytest.raises(DBAPIError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info.get("query_started") == []
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+
+from common.db_setup import SessionLocal
+from common.entity import Post, User
+from common.security import create_access_token
+from post_service.main import app as post_app
+
+post_client = TestClient(post_app)
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def create_authors_with_posts(prefix, authors, posts_per_author):
+    with SessionLocal() as db:
+        user_ids = db.execute(insert(User).returning(User.id), [
+            {"login_email": f"{prefix}-{index}@example.com", "password": "x", "name": f"Author {index}"}
+            for index in range(authors)
+        ]).scalars().all()
+        db.execute(insert(Post), [
+            {"user_id": user_id, "title": f"Post by {user_id}", "content": "content"}
+            for user_id in user_ids for _ in range(posts_per_author)
+        ])
+        db.commit()
+    return user_ids
+
+
+# 작성자 정보를 포함해도 쿼리 수는 페이지 크기와 관계없이 같아야 함 (N+1 방지)
+def test_include_author_uses_constant_query_count():
+    user_ids = create_authors_with_posts("feed-author", authors=10, posts_per_author=3)
+    headers = {"Authorization": f"Bearer {create_access_token(user_ids[0])}"}
+
+    query_counts = []
+    for limit in (2, 25):
+        with count_queries() as statements:
+            response = post_client.get("/posts/", params={"limit": limit, "include": "author"}, headers=headers)
+        posts = response.json()["data"]
+        assert len(posts) == limit
+        assert all(post["author"]["name"] and post["author"]["login_email"] for post in posts)
+        query_counts.append(len(statements))
+    assert query_counts[0] == query_counts[1] == 1
+
+
+def test_get_post_with_author():
+    user_ids = create_authors_with_posts("detail-author", authors=1, posts_per_author=1)
+    headers = {"Authorization": f"Bearer {create_access_token(user_ids[0])}"}
+    post_id = post_client.get("/posts/", params={"limit": 1}, headers=headers).json()["data"][0]["id"]
+
+    plain = post_client.get(f"/posts/{post_id}", headers=headers)
+    assert "author" not in plain.json()["data"]
+    detailed = post_client.get(f"/posts/{post_id}", params={"include": "author"}, headers=headers)
+    assert detailed.json()["data"]["author"] == {"name": "Author 0", "login_email": "detail-author-0@example.com"}
+    assert detailed.headers["ETag"] != plain.headers["ETag"]
+    assert post_client.get(f"/posts/{post_id}", params={"include": "comments"}, headers=headers).status_code == 422
+
+
+# 게시글 수정 시 작성자 포함 캐시 항목도 수정된 값으로 갱신 (다음 조회는 DB / 복제본을 읽지 않음)
+def test_update_post_writes_through_author_cache():
+    user_ids = create_authors_with_posts("cached-author", authors=1, posts_per_author=1)
+    headers = {"Authorization": f"Bearer {create_access_token(user_ids[0])}"}
+    with SessionLocal() as db:
+        post_id = db.query(Post.id).filter(Post.user_id == user_ids[0]).scalar()
+    assert post_client.get(f"/posts/{post_id}", params={"include": "author"}, headers=headers).status_code == 200
+
+    response = post_client.put(f"/posts/{post_id}", json={"title": "edited", "content": "edited"}, headers=headers)
+    assert response.json()["status_code"] == 200
+    with count_queries() as statements:
+        detailed = post_client.get(f"/posts/{post_id}", params={"include": "author"}, headers=headers)
+    assert statements == []
+    assert detailed.json()["data"]["title"] == "edited"
+    assert detailed.json()["data"]["author"] == {"name": "Author 0", "login_email": "cached-author-0@example.com"}
@@ -0,0 +1,69 @@
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from common.db_setup import engine
+from common.entity import Post, RefreshToken, User, UserUpdateLog
+from common.pagination import encode_cursor
+from common.search import check_search_support
+from post_service.main import PostInclude, posts_page_stmt, posts_search_stmt, with_author
+from user_service.main import users_page_stmt
+
+# 서비스에서 자주 실행되는 쿼리 (인덱스 없이 전체 스캔하거나 정렬하면 실패)
+HOT_QUERIES = {
+    "posts_by_author": select(Post).where(Post.user_id == 1),
+    "posts_first_page": posts_page_stmt(10, 0, None),
+    "posts_cursor_page": posts_page_stmt(10, 0, encode_cursor({"updated_at": "2024-01-01T00:00:00", "id": 1})),
+    "posts_page_with_author": with_author(posts_page_stmt(10, 0, None), PostInclude.author),
+    "users_by_email": select(User).where(User.login_email == "testuser@example.com"),
+    "users_cursor_page": users_page_stmt(10, 0, encode_cursor({"id": 1})),
+    "update_logs_by_user": select(UserUpdateLog).where(UserUpdateLog.user_id == 1),
+    "expired_refresh_tokens": select(RefreshToken.id).where(RefreshToken.expires_at < datetime(2024, 1, 1)).limit(1000),
+}
+# 관련도 점수로 정렬하는 쿼리 (정렬은 피할 수 없으므로 검색 인덱스 사용 여부만 확인)
+RANKED_QUERIES = {
+    "posts_search": posts_search_stmt("apple pie", 10, None),
+}
+
+
+def explain(stmt):
+    compiled = stmt.compile(dialect=engine.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            # 테이블이 작아도 인덱스를 사용할 수 있으면 반드시 사용하도록 강제
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params).fetchall()
+            return [row[0] for row in rows]
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+        return [row[-1] for row in rows]
+
+
+def full_scans(plan, allow_sort=False):
+    if engine.dialect.name == "postgresql":
+        return [line for line in plan if "Seq Scan" in line or (not allow_sort and re.search(r"\bSort\b", line))]
+    return [line for line in plan
+            if re.fullmatch(r"SCAN \w+", line.strip()) or (not allow_sort and "TEMP B-TREE" in line)]
+
+
+# 자주 실행되는 쿼리가 인덱스를 사용하는지 실행 계획으로 확인
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_indexes(name):
+    plan = explain(HOT_QUERIES[name])
+    assert not full_scans(plan), "\n".join(plan)
+
+
+@pytest.mark.parametrize("name", RANKED_QUERIES)
+def test_search_queries_use_search_index(name):
+    plan = explain(RANKED_QUERIES[name])
+    assert not full_scans(plan, allow_sort=True), "\n".join(plan)
+
+
+# 전문 검색을 지원하지 않는 DB는 요청 시점이 아니라 시작 시 실패
+def test_unsupported_search_dialect_fails_at_startup():
+    with pytest.raises(RuntimeError, match="mysql"):
+        check_search_support("mysql")
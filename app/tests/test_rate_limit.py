@@ -0,0 +1,102 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+
+from auth_service.main import app as auth_app
+from common import db_setup
+from common.rate_limit import (InMemoryRateLimitBackend, LoginRateLimiter, RedisRateLimitBackend, client_ip,
+                               login_rate_limiter)
+from common.read_replicas import Replica, ReplicaSet
+from tests.fake_redis import FakeRedis
+
+auth_client = TestClient(auth_app)
+
+
+def rejected(limiter, ip, login_email):
+    with pytest.raises(HTTPException) as error:
+        limiter.check(ip, login_email)
+    assert error.value.status_code == 429
+    return int(error.value.headers["Retry-After"])
+
+
+# 이메일별로는 실패한 시도만 세고, 다른 이메일에는 영향이 없어야 함
+def test_email_limit_counts_failures_only():
+    limiter = LoginRateLimiter(InMemoryRateLimitBackend(100), per_ip=100, per_email=2, window_seconds=60)
+    for _ in range(5):
+        limiter.check("10.0.0.1", "user@example.com")
+    limiter.record_failure("user@example.com")
+    limiter.record_failure("User@Example.com")
+    assert 0 < rejected(limiter, "10.0.0.2", "user@example.com") <= 60
+    limiter.check("10.0.0.2", "other@example.com")
+    assert limiter.stats()["rejected_email"] == 1
+
+
+# Redis 백엔드: IP별 sliding window, 오래된 시도가 창 밖으로 나가면 다시 허용
+@pytest.mark.parametrize("backend", [RedisRateLimitBackend(FakeRedis()), InMemoryRateLimitBackend(100)])
+def test_ip_limit_sliding_window(backend):
+    limiter = LoginRateLimiter(backend, per_ip=3, per_email=100, window_seconds=0.2)
+    for index in range(3):
+        limiter.check("10.0.0.1", f"user{index}@example.com")
+    rejected(limiter, "10.0.0.1", "user9@example.com")
+    limiter.check("10.0.0.2", "user9@example.com")
+    time.sleep(0.25)
+    limiter.check("10.0.0.1", "user9@example.com")
+    assert limiter.stats()["rejected_ip"] == 1
+
+
+def forwarded_request(forwarded_for):
+    return Request({"type": "http", "headers": [(b"x-forwarded-for", forwarded_for.encode())],
+                    "client": ("10.0.0.254", 1234)})
+
+
+# X-Forwarded-For의 앞쪽 주소를 바꿔 보내도 프록시가 추가한 주소 기준으로 IP 한도가 유지
+def test_spoofed_forwarded_for_does_not_reset_ip_limit():
+    limiter = LoginRateLimiter(InMemoryRateLimitBackend(100), per_ip=2, per_email=100, window_seconds=60)
+    for index in range(2):
+        limiter.check(client_ip(forwarded_request(f"1.2.3.{index}, 203.0.113.7"), trust_proxy=True), "a@example.com")
+    rejected(limiter, client_ip(forwarded_request("9.9.9.9, 203.0.113.7"), trust_proxy=True), "b@example.com")
+
+    assert client_ip(forwarded_request("1.2.3.4, 203.0.113.7, 10.0.0.2"), True, proxy_hops=2) == "203.0.113.7"
+    assert client_ip(forwarded_request("203.0.113.7"), True, proxy_hops=2) == "203.0.113.7"
+    assert client_ip(forwarded_request("1.2.3.4"), trust_proxy=False) == "10.0.0.254"
+
+
+# 한도를 넘은 로그인 요청은 DB 조회 없이(복제본 세션도 열지 않고) 429로 거절
+@pytest.mark.parametrize("with_replicas", [False, True])
+def test_login_rejected_before_database(monkeypatch, with_replicas):
+    opened = []
+    if with_replicas:
+        # primary를 가리키는 복제본 (세션을 연 횟수만 기록)
+        session_factory = db_setup.AsyncSessionLocal or db_setup.SessionLocal
+
+        def open_session():
+            opened.append(session_factory)
+            return session_factory()
+
+        replica = Replica("replica", db_setup.engine, open_session, db_setup.engine)
+        monkeypatch.setattr(db_setup, "read_replicas", ReplicaSet([replica], health_interval=3600))
+    monkeypatch.setattr(login_rate_limiter, "backend", InMemoryRateLimitBackend(100))
+    monkeypatch.setattr(login_rate_limiter, "per_email", 2)
+    credentials = {"login_email": "nobody@example.com", "password": "wrongpassword"}
+    for _ in range(2):
+        assert auth_client.post("/auth/login", json=credentials).json()["status_code"] == 401
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = auth_client.post("/auth/login", json=credentials)
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    assert statements == []
+    assert len(opened) == (2 if with_replicas else 0)
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from common import db_setup
+from common.db_setup import get_read_db
+from common.read_replicas import READ_YOUR_WRITES_COOKIE, ReadYourWritesMiddleware, Replica, ReplicaSet
+
+app = FastAPI()
+app.add_middleware(ReadYourWritesMiddleware, enabled=True)
+
+
+def database_name(engine):
+    return str(engine.url.database).rsplit("/", 1)[-1]
+
+
+PRIMARY = database_name(db_setup.engine)
+
+
+# 조회에 사용한 DB 이름
+@app.get("/where")
+def where(db: Session = Depends(get_read_db)):
+    return database_name(db.get_bind())
+
+
+@app.post("/write")
+def write():
+    return "ok"
+
+
+def sqlite_replica(name, url):
+    engine = create_engine(url)
+    return Replica(name, engine, sessionmaker(bind=engine), create_engine(url, poolclass=NullPool))
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    replica_set = ReplicaSet([sqlite_replica(name, f"sqlite:///{tmp_path / name}.db") for name in ("a", "b")],
+                             health_interval=3600)
+    monkeypatch.setattr(db_setup, "read_replicas", replica_set)
+    return replica_set
+
+
+# 정상 복제본 사이에서 번갈아 조회하고, 쓰기 요청 직후에는 primary에서 조회
+def test_reads_balance_across_replicas_until_client_writes(replicas):
+    client = TestClient(app)
+    assert sorted(client.get("/where").json() for _ in range(4)) == ["a.db", "a.db", "b.db", "b.db"]
+
+    response = client.post("/write")
+    assert float(response.cookies[READ_YOUR_WRITES_COOKIE]) > time.time()
+    assert client.get("/where").json() == PRIMARY
+    assert replicas.stats()["pinned_reads"] == 1
+
+
+# 연결할 수 없는 복제본은 제외하고 primary 또는 다른 복제본에서 조회
+def test_unreachable_replica_falls_back(replicas, tmp_path):
+    broken = sqlite_replica("broken", f"sqlite:///{tmp_path}/missing/dir.db")
+    replicas.replicas = [broken]
+    client = TestClient(app)
+    assert client.get("/where").json() == PRIMARY
+    assert broken.healthy is False
+    assert client.get("/where").json() == PRIMARY
+    assert replicas.stats()["primary_reads"] == 2
+
+    replicas.check(broken)
+    assert broken.healthy is False and broken.failures == 2
+    replicas.replicas[0] = sqlite_replica("fixed", f"sqlite:///{tmp_path}/fixed.db")
+    replicas.check_all()
+    assert client.get("/where").json() == "fixed.db"
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import auth_service.main as auth_main
+from auth_service.main import app as auth_app, session_stats
+from common.db_setup import SessionLocal
+from common.entity import RefreshToken, User
+
+auth_client = TestClient(auth_app)
+
+
+def login(prefix):
+    credentials = {"login_email": f"{prefix}@example.com", "password": "password123"}
+    auth_client.post("/auth/register", json={**credentials, "name": "Refresh", "gender": "M", "age": 30,
+                                             "phone": "010-0000-0000"})
+    response = auth_client.post("/auth/login", json=credentials).json()
+    assert response["status_code"] == 200
+    return response["data"]
+
+
+def refresh(refresh_token):
+    return auth_client.post("/auth/refresh", json={"refresh_token": refresh_token}).json()
+
+
+# refresh는 비밀번호 검증(bcrypt) 없이 새 토큰을 발급하고, 사용한 refresh token은 다시 쓸 수 없어야 함
+def test_refresh_rotates_without_password_check(monkeypatch):
+    tokens = login("refresh-rotate")
+
+    async def fail_verify(*args):
+        raise AssertionError("refresh must not verify the password")
+
+    monkeypatch.setattr(auth_main, "verify_password_async", fail_verify)
+    refreshes = session_stats.refreshes
+    response = refresh(tokens["refresh_token"])
+    assert response["status_code"] == 200
+    assert response["data"]["access_token"]
+    assert response["data"]["refresh_token"] != tokens["refresh_token"]
+    assert session_stats.refreshes == refreshes + 1
+    assert refresh("not-a-token")["status_code"] == 401
+
+
+# 이미 교체된 refresh token이 다시 사용되면 그 사용자의 refresh token을 모두 폐기
+def test_reused_refresh_token_revokes_all_sessions():
+    tokens = login("refresh-reuse")
+    rotated = refresh(tokens["refresh_token"])["data"]
+    reuse_detected = session_stats.refresh_reuse_detected
+
+    assert refresh(tokens["refresh_token"])["status_code"] == 401
+    assert session_stats.refresh_reuse_detected == reuse_detected + 1
+    assert refresh(rotated["refresh_token"])["status_code"] == 401
+
+
+def test_logout_revokes_refresh_token():
+    tokens = login("refresh-logout")
+    assert auth_client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}).json()["status_code"] == 200
+    assert refresh(tokens["refresh_token"])["status_code"] == 401
+
+
+# 로그인 / refresh 시 정리 주기가 지났으면 만료된 refresh token을 삭제 (만료 전 폐기된 토큰은 재사용 감지용으로 유지)
+def test_expired_refresh_tokens_are_purged(monkeypatch):
+    tokens = login("refresh-purge")
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        user_id = db.execute(select(User.id).where(User.login_email == "refresh-purge@example.com")).scalar()
+        db.add_all([
+            RefreshToken(user_id=user_id, token_hash=bytes([1]) * 32, expires_at=now - timedelta(days=1)),
+            RefreshToken(user_id=user_id, token_hash=bytes([2]) * 32, expires_at=now - timedelta(days=1), revoked_at=now),
+            RefreshToken(user_id=user_id, token_hash=bytes([3]) * 32, expires_at=now + timedelta(days=1), revoked_at=now),
+        ])
+        db.commit()
+
+    monkeypatch.setattr(auth_main, "token_purge_schedule", auth_main.TokenPurgeSchedule(3600, batch_size=1))
+    purged = session_stats.purged_tokens
+    refresh(tokens["refresh_token"])  # 한 번에 1개만 삭제하고 남은 토큰은 다음 요청에서 이어서 삭제
+    login("refresh-purge")
+    login("refresh-purge")
+    assert session_stats.purged_tokens == purged + 2
+    assert auth_main.token_purge_schedule.due() is False
+    with SessionLocal() as db:
+        remaining = db.execute(select(RefreshToken.token_hash).where(RefreshToken.user_id == user_id)).scalars().all()
+    assert bytes([1]) * 32 not in remaining and bytes([2]) * 32 not in remaining
+    assert bytes([3]) * 32 in remaining
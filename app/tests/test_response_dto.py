@@ -0,0 +1,18 @@
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from common.dto.base_response_dto import ResponseDto
+
+
+# orjson 응답은 기존 ResponseDto 응답과 같은 JSON을 만들어야 함 (datetime 포함)
+def test_fast_success_response_matches_response_dto():
+    rows = [{"id": 1, "title": "Post", "updated_at": datetime(2024, 1, 2, 3, 4, 5, 678901)}]
+    expected = jsonable_encoder(ResponseDto.success_response(data=rows, total_count=1, next_cursor="abc",
+                                                             count_strategy="exact"))
+    response = ResponseDto.fast_success_response(data=rows, total_count=1, next_cursor="abc",
+                                                 count_strategy="exact", headers={"ETag": 'W/"x"'})
+    assert json.loads(response.body) == expected
+    assert response.headers["ETag"] == 'W/"x"'
+    assert response.media_type == "application/json"
@@ -1,8 +1,17 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text, update
+from sqlalchemy.exc import IntegrityError
 from auth_service.main import app as auth_app
 from user_service.main import app as user_app
-from post_service.main import app as post_app
+from post_service.main import app as post_app, update_post_stmt
+from common.db_setup import SessionLocal
+from common.dto.post_dto import PostDTO
+from common.entity import Post
+from common.metrics import security_duration
+from common.pagination import encode_cursor
 
 auth_client = TestClient(auth_app)
 user_client = TestClient(user_app)
@@ -98,6 +107,29 @@ def test_create_post():
     assert response.json()["success"] == True
     create_post_id = response.json()["data"]["id"]  # 생성된 post_id 저장
 
+# 게시글 일괄 작성 테스트 (JSON 배열, 잘못된 행은 행 단위로 실패 처리)
+def test_create_posts_bulk():
+    headers = get_auth_headers()
+    response = post_client.post("/posts/bulk", json=[
+        {"title": "Bulk Post 1", "content": "bulk"},
+        {"title": "Bulk Post 2"},  # content 누락
+        {"title": "Bulk Post 3", "content": "bulk"},
+    ], headers=headers)
+    data = response.json()["data"]
+    assert data["inserted"] == 2 and data["failed"] == 1
+    assert [result["success"] for result in data["results"]] == [True, False, True]
+    created = post_client.get(f"/posts/{data['results'][2]['id']}", headers=headers).json()
+    assert created["data"]["title"] == "Bulk Post 3"
+
+# 게시글 일괄 작성 테스트 (NDJSON)
+def test_create_posts_bulk_ndjson():
+    headers = {**get_auth_headers(), "Content-Type": "application/x-ndjson"}
+    body = '{"title": "NDJSON 1", "content": "a"}\nnot json\n{"title": "NDJSON 2", "content": "b"}\n'
+    response = post_client.post("/posts/bulk", content=body, headers=headers)
+    results = response.json()["data"]["results"]
+    assert [result["success"] for result in results] == [True, False, True]
+    assert post_client.post("/posts/bulk", content="{}", headers=get_auth_headers()).json()["status_code"] == 400
+
 # 게시글 목록 조회 성공 테스트
 def test_get_posts():
     headers = get_auth_headers()
@@ -105,6 +137,85 @@ def test_get_posts():
     assert response.status_code == 200
     assert isinstance(response.json()["data"], list)
 
+# 커서 기반 게시글 목록 조회 테스트 (다음 페이지 커서를 따라가며 중복 없이 조회)
+def test_get_posts_with_cursor():
+    headers = get_auth_headers()
+    post_client.post("/posts", json={"title": "Cursor Post", "content": "cursor"}, headers=headers)
+    first_page = post_client.get("/posts?limit=1", headers=headers).json()
+    assert first_page["next_cursor"] is not None
+    second_page = post_client.get(f"/posts?limit=1&cursor={first_page['next_cursor']}", headers=headers).json()
+    assert second_page["success"] == True
+    assert len(second_page["data"]) == 1
+    assert second_page["data"][0]["id"] != first_page["data"][0]["id"]
+
+# updated_at 없이 직접 INSERT한 게시글도 DB 기본값으로 채워져 커서를 따라 조회할 수 있고, NULL로는 바꿀 수 없음
+def test_post_without_updated_at_gets_server_default():
+    headers = get_auth_headers()
+    user_id = post_client.post("/posts", json={"title": "Owner Post", "content": "owner"}, headers=headers).json()["data"]["user_id"]
+    with SessionLocal() as db:
+        post_id = db.execute(text("INSERT INTO posts (user_id, title) VALUES (:user_id, 'Raw Post') RETURNING id"),
+                             {"user_id": user_id}).scalar()
+        db.commit()
+        assert db.get(Post, post_id).updated_at is not None
+        with pytest.raises(IntegrityError):
+            db.execute(update(Post).where(Post.id == post_id).values(updated_at=None))
+        db.rollback()
+
+    seen, cursor = [], None
+    while len(seen) < 1000 and post_id not in seen:
+        page = post_client.get("/posts", params={"limit": 50, **({"cursor": cursor} if cursor else {})}, headers=headers).json()
+        assert page["success"] == True
+        seen += [post["id"] for post in page["data"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert post_id in seen
+
+# 게시글 검색 테스트 (관련도 순, 커서로 다음 페이지 조회)
+def test_search_posts():
+    headers = get_auth_headers()
+    post_client.post("/posts/bulk", json=[
+        {"title": "searchable apple", "content": "apple pie recipe"},
+        {"title": "banana", "content": "searchable apple in the content"},
+        {"title": "searchable cherry", "content": "no fruit match"},
+    ], headers=headers)
+    first = post_client.get("/posts/search?q=searchable apple&limit=1", headers=headers).json()
+    assert first["data"][0]["title"] == "searchable apple"  # 제목과 내용 모두 일치하는 글이 먼저
+    second = post_client.get(f"/posts/search?q=searchable apple&limit=1&cursor={first['next_cursor']}",
+                             headers=headers).json()
+    assert second["data"][0]["title"] == "banana"
+    assert second["data"][0]["rank"] <= first["data"][0]["rank"]
+    none = post_client.get('/posts/search?q="unmatched term', headers=headers).json()
+    assert none["success"] == True and none["data"] == []
+    # 공백뿐인 검색어는 DB에 보내지 않고 400
+    blank = post_client.get("/posts/search?q=%20%20", headers=headers)
+    assert blank.status_code == 200 and blank.json()["status_code"] == 400
+
+# 게시글 내보내기 테스트 (NDJSON / CSV, updated_at 필터)
+def test_export_posts():
+    headers = get_auth_headers()
+    response = post_client.get("/posts/export", headers=headers)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert create_post_id in [row["id"] for row in rows]
+    response = post_client.get("/posts/export?format=csv", headers=headers)
+    lines = response.text.splitlines()
+    assert lines[0] == "id,user_id,title,content,updated_at"
+    assert len(lines) == len(rows) + 1
+    response = post_client.get("/posts/export?updated_from=2999-01-01T00:00:00", headers=headers)
+    assert response.text == ""
+
+# 잘못된 커서로 게시글 목록 조회 테스트
+def test_get_posts_with_invalid_cursor():
+    headers = get_auth_headers()
+    response = post_client.get("/posts?cursor=invalid", headers=headers)
+    assert response.json()["status_code"] == 400
+    assert response.json()["success"] == False
+    # 형식은 맞지만 id가 숫자가 아닌 커서도 DB에 보내지 않고 400
+    cursor = encode_cursor({"updated_at": "2024-01-01T00:00:00", "id": "1 OR 1=1"})
+    response = post_client.get(f"/posts?cursor={cursor}", headers=headers)
+    assert response.json()["status_code"] == 400
+
 # 특정 게시글 조회 성공 테스트
 def test_get_specific_post():
     headers = get_auth_headers()
@@ -112,6 +223,19 @@ def test_get_specific_post():
     assert response.status_code == 200
     assert response.json()["success"] == True
 
+# 같은 ETag로 다시 조회하면 본문 없이 304 응답
+def test_get_specific_post_not_modified():
+    headers = get_auth_headers()
+    response = post_client.get(f"/posts/{create_post_id}", headers=headers)
+    etag = response.headers["ETag"]
+    response = post_client.get(f"/posts/{create_post_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    # 목록 조회도 동일하게 동작
+    etag = post_client.get("/posts?limit=5", headers=headers).headers["ETag"]
+    response = post_client.get("/posts?limit=5", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
 # 잘못된 post_id로 특정 게시물 조회 테스트
 def test_get_invalid_post():
     headers = get_auth_headers()
@@ -128,6 +252,46 @@ def test_update_post():
     }, headers=headers)
     assert response.status_code == 200
     assert response.json()["success"] == True
+    # 캐시된 게시글도 수정된 내용으로 조회되어야 함
+    response = post_client.get(f"/posts/{create_post_id}", headers=headers)
+    assert response.json()["data"]["title"] == "Updated Test Post"
+
+# 오래된 ETag(If-Match)로 게시글 수정 시도 시 412 응답
+def test_update_post_with_stale_etag():
+    headers = get_auth_headers()
+    etag = post_client.get(f"/posts/{create_post_id}", headers=headers).headers["ETag"]
+    response = post_client.put(f"/posts/{create_post_id}", json={
+        "title": "Conditional Update",
+        "content": "Updated with If-Match"
+    }, headers={**headers, "If-Match": etag})
+    assert response.json()["success"] == True
+    response = post_client.put(f"/posts/{create_post_id}", json={
+        "title": "Lost Update",
+        "content": "Should be rejected"
+    }, headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+    assert response.json()["status_code"] == 412
+    # If-Match는 strong 비교이므로 weak ETag는 일치하지 않음
+    etag = post_client.get(f"/posts/{create_post_id}", headers=headers).headers["ETag"]
+    response = post_client.put(f"/posts/{create_post_id}", json={"title": "Weak", "content": "weak"},
+                               headers={**headers, "If-Match": f"W/{etag}"})
+    assert response.status_code == 412
+
+# If-Match 확인을 함께 통과한 두 요청 중 먼저 수정한 요청만 반영 (UPDATE ... WHERE updated_at = 확인한 값)
+def test_update_post_concurrent_if_match():
+    headers = get_auth_headers()
+    etag = post_client.get(f"/posts/{create_post_id}", headers=headers).headers["ETag"]
+    with SessionLocal() as db:
+        checked_post = db.get(Post, create_post_id)  # 두 번째 요청이 If-Match 확인 시 읽은 게시글
+        db.expunge(checked_post)
+    response = post_client.put(f"/posts/{create_post_id}", json={"title": "First", "content": "first writer"},
+                               headers={**headers, "If-Match": etag})
+    assert response.json()["success"] == True
+    with SessionLocal() as db:
+        stmt = update_post_stmt(checked_post, PostDTO(title="Second", content="second writer"), etag)
+        assert db.execute(stmt).scalars().first() is None
+        db.rollback()
+    assert post_client.get(f"/posts/{create_post_id}", headers=headers).json()["data"]["title"] == "First"
 
 # 잘못된 post_id로 게시글 업데이트 테스트
 def test_update_invalid_post():
@@ -141,9 +305,11 @@ def test_update_invalid_post():
 
 
 ### 시나리오 3. 유저 CRUD 테스트
-# 유저 생성 성공 테스트
+# 유저 생성 성공 테스트 (캐시된 전체 사용자 수는 생성 시 무효화되어야 함)
 def test_create_user():
     headers = get_auth_headers()
+    before = user_client.get("/users?count_strategy=cached", headers=headers).json()
+    assert before["count_strategy"] == "cached"
     response = user_client.post("/users", json={
         "login_email": "newuser@example.com",
         "password": "newpassword",
@@ -154,6 +320,34 @@ def test_create_user():
     }, headers=headers)
     assert response.status_code == 200
     assert response.json()["success"] == True
+    after = user_client.get("/users?count_strategy=cached", headers=headers).json()
+    assert after["total_count"] == before["total_count"] + 1
+
+# 유저 일괄 등록 테스트 (이미 있거나 요청 안에서 중복된 이메일은 실패 처리)
+def test_create_users_bulk():
+    headers = get_auth_headers()
+    row = {"password": "bulkpassword", "name": "Bulk User", "gender": "Male", "age": 20, "phone": "000"}
+    bulk_hashes = security_duration.snapshot().get(("hash_bulk",), (None, 0.0, 0))[2]
+    response = user_client.post("/users/bulk", json=[
+        {**row, "login_email": "bulk1@example.com"},
+        {**row, "login_email": "bulk1@example.com"},
+        {**row, "login_email": register_user_info["login_email"]},
+        {**row, "login_email": "bulk2@example.com"},
+    ], headers=headers)
+    data = response.json()["data"]
+    assert [result["success"] for result in data["results"]] == [True, False, False, True]
+    # 작업자 프로세스에서 해시해도 일괄 해시 시간은 이 프로세스의 지표에 기록
+    assert security_duration.snapshot()[("hash_bulk",)][2] == bulk_hashes + 1
+    login = auth_client.post("/auth/login", json={"login_email": "bulk2@example.com", "password": "bulkpassword"})
+    assert login.json()["success"] == True
+
+# 유저 내보내기 테스트 (비밀번호는 포함하지 않음, after_id 이후만 내보내기)
+def test_export_users():
+    headers = get_auth_headers()
+    rows = [json.loads(line) for line in user_client.get("/users/export", headers=headers).text.splitlines()]
+    assert rows and all("password" not in row for row in rows)
+    after = user_client.get(f"/users/export?after_id={rows[0]['id']}", headers=headers).text.splitlines()
+    assert len(after) == len(rows) - 1
 
 # 유저 정보 업데이트 성공 테스트
 def test_update_user():
@@ -193,3 +387,12 @@ def test_get_deleted_user():
     print(response.json())
     assert response.json()["status_code"] == 404  # 존재하지 않는 리소스에 대해 404 응답
     assert response.json()["success"] == False
+
+
+### 시나리오 4. 운영 API 테스트
+# 커넥션 풀 상태 조회 테스트
+def test_pool_stats():
+    for client in (auth_client, user_client, post_client):
+        response = client.get("/pool-stats")
+        assert response.status_code == 200
+        assert "pool_class" in response.json()["data"]
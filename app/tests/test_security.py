@@ -0,0 +1,44 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from common.security import VerifiedTokenCache, create_access_token, token_cache, verify_token
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+# 같은 토큰을 다시 검증하면 캐시에서 바로 반환
+def test_verify_token_uses_cache():
+    token = create_access_token(42)
+    hits = token_cache.hits
+    assert verify_token(bearer(token)) == 42
+    assert verify_token(bearer(token)) == 42
+    assert token_cache.hits == hits + 1
+
+
+# 만료 시각이 지난 항목과 용량을 넘은 오래된 항목은 제거
+def test_token_cache_expiry_and_lru():
+    cache = VerifiedTokenCache(max_size=2)
+    cache.put("expired", 1, time.time() - 1)
+    assert cache.get("expired") is None
+    cache.put("a", 1, time.time() + 60)
+    cache.put("b", 2, time.time() + 60)
+    cache.get("a")
+    cache.put("c", 3, time.time() + 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+# 캐시를 끄면 저장하지 않고, 잘못된 토큰은 캐시와 무관하게 401
+def test_token_cache_disabled_and_invalid_token():
+    cache = VerifiedTokenCache(max_size=2, enabled=False)
+    cache.put("a", 1, time.time() + 60)
+    assert cache.get("a") is None
+    with pytest.raises(HTTPException) as error:
+        verify_token(bearer("invalidtoken"))
+    assert error.value.status_code == 401
@@ -1,46 +1,193 @@
-from fastapi import FastAPI, APIRouter, Depends, Security, Query
-from fastapi.security import HTTPAuthorizationCredentials
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, APIRouter, Depends, Query, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from common.db_setup import get_db
-from common.entity import User, UserUpdateLog, UserDeleteLog
-from common.security import verify_token, security, get_password_hash
+from common.db_setup import get_db, get_async_db, get_read_db, get_async_read_db, USE_ASYNC_DB
+from common.entity import User
+from common.pagination import encode_cursor, decode_cursor, InvalidCursor
+from common.count_strategy import CountStrategy, count_rows, count_rows_async, invalidate_count
+from common.security import current_user_id, get_password_hash, get_password_hash_async, get_password_hashes_async
+from common.hashing_pool import hashing_pool, HashingPoolBusy
+from common.bulk import read_bulk_rows, run_bulk, row_failure, InvalidBulkRequest
 from common.dto.base_response_dto import ResponseDto
+from common.monitoring import router as monitoring_router, register_stats
+from common.metrics import MetricsMiddleware
+from common.read_replicas import ReadYourWritesMiddleware
+from common.audit import audit_writer
 from common.error_types import ErrorType
+from common.export import ExportFormat, export_response
+from common.conditional import content_etag, etag_matches, not_modified
 from common.dto.user_dto import CreateUserDTO, UpdateUserDTO
 
 
+# 감사 로그 writer (outbox 모드는 재시작 전에 남은 outbox도 옮기도록 시작 시 바로 실행)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_writer.start()
+    yield
+    audit_writer.stop()
+    hashing_pool.shutdown()
+
+
 app = FastAPI(
     title="User Service API",
     description="이용자 백엔드 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 router = APIRouter(prefix="/users")
+register_stats("audit", audit_writer.stats)
+
+
+# 사용자 목록 조회 쿼리 (잘못된 커서인 경우 None)
+def users_page_stmt(limit: int, offset: int, cursor: Optional[str]):
+    stmt = select(User).order_by(User.id)
+    if cursor:
+        if offset:
+            return None
+        try:
+            last_id = int(decode_cursor(cursor, ("id",))["id"])
+        except (InvalidCursor, TypeError, ValueError):
+            return None
+        stmt = stmt.where(User.id > last_id)
+    else:
+        stmt = stmt.offset(offset)
+    return stmt.limit(limit)
+
+
+def users_page_response(items, limit: int, total_count: int, used_strategy: CountStrategy):
+    # 페이지가 가득 찬 경우에만 다음 페이지 커서를 내려준다
+    next_cursor = encode_cursor({"id": items[-1].id}) if len(items) == limit else None
+    users = [item.to_dict() for item in items]
+    return ResponseDto.fast_success_response(data=users, total_count=total_count, next_cursor=next_cursor,
+                                             count_strategy=used_strategy.value)
+
+
+def user_detail_response(user: Optional[User], if_none_match: Optional[str]):
+    if not user:
+        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
+    # User에는 수정 시각 컬럼이 없으므로 응답 내용 전체로 ETag 생성
+    data = user.to_dict()
+    etag = content_etag(data)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return ResponseDto.fast_success_response(data=data, headers={"ETag": etag})
+
+
+# 사용자 내보내기 쿼리 (users에는 수정 시각 컬럼이 없으므로 증분 내보내기는 after_id 기준)
+def users_export_stmt(after_id: Optional[int]):
+    stmt = select(User.id, User.login_email, User.name, User.gender, User.age, User.phone).order_by(User.id)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    return stmt
+
+
+def existing_emails_stmt(emails):
+    return select(User.login_email).where(User.login_email.in_(emails))
+
+
+def find_existing_emails(db: Session, emails):
+    return set(db.execute(existing_emails_stmt(emails)).scalars())
+
+
+async def find_existing_emails_async(db: AsyncSession, emails):
+    return set((await db.execute(existing_emails_stmt(emails))).scalars())
+
+
+# 일괄 등록 전처리: 이미 있거나 요청 안에서 중복된 이메일을 제외하고, 나머지 비밀번호를 hashing_pool에서 병렬로 해시
+async def prepare_bulk_users(valid, existing_emails):
+    seen = set(existing_emails)
+    accepted, failed = [], []
+    for index, values in valid:
+        if values["login_email"] in seen:
+            failed.append(row_failure(index, "Email already exists"))
+            continue
+        seen.add(values["login_email"])
+        accepted.append((index, values))
+    try:
+        hashes = await get_password_hashes_async([values["password"] for _, values in accepted])
+    except HashingPoolBusy:
+        return [], failed + [row_failure(index, "Password hashing is busy") for index, _ in accepted]
+    return [(index, {**values, "password": hashed}) for (index, values), hashed in zip(accepted, hashes)], failed
+
+
+# 여러 사용자를 multi-row INSERT ... RETURNING으로 한 번에 저장 (id는 입력 순서대로 반환)
+def bulk_insert_users_stmt():
+    return insert(User).returning(User.id, sort_by_parameter_order=True)
+
+
+def insert_users(db: Session, values):
+    try:
+        ids = db.execute(bulk_insert_users_stmt(), values).scalars().all()
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    return ids
+
+
+async def insert_users_async(db: AsyncSession, values):
+    try:
+        ids = (await db.execute(bulk_insert_users_stmt(), values)).scalars().all()
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise
+    return ids
+
+
+# 변경된 필드를 반영하고 변경 내역을 {"필드": {"old": 이전 값, "new": 새 값}} 형태로 반환
+def apply_user_changes(existing_user: User, user: UpdateUserDTO):
+    changes = {}
+    for key, value in user.dict().items():
+        if getattr(existing_user, key) != value:
+            changes[key] = {"old": getattr(existing_user, key), "new": value}
+            setattr(existing_user, key, value)
+    return changes
+
 
 @router.get("/", description="User 목록 불러오기 API")
 def get_users(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db),
+    user_id: int = Depends(current_user_id),
+    db: Session = Depends(get_read_db),
     limit: int = Query(10, ge=1, le=100, description="Number of users to return"),
-    offset: int = Query(0, ge=0, description="Offset for pagination")
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor for keyset pagination (next_cursor of the previous page)"),
+    count_strategy: Optional[CountStrategy] = Query(None, description="How total_count is computed (default: USER_COUNT_STRATEGY)")
 ):
-    verify_token(credentials)
-    users = [item.to_dict() for item in db.query(User).offset(offset).limit(limit).all()]
-    total_count = db.query(User).count()
-    return ResponseDto.success_response(data=users, total_count=total_count)
+    stmt = users_page_stmt(limit, offset, cursor)
+    if stmt is None:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    items = db.execute(stmt).scalars().all()
+    total_count, used_strategy = count_rows(db, User, count_strategy)
+    return users_page_response(items, limit, total_count, used_strategy)
 
 # 유저 상세정보 조회 API
+# /{user_login_email} 보다 먼저 등록해야 export가 이메일로 해석되지 않는다
+@router.get("/export", description="User 전체 내보내기 API (NDJSON / CSV 스트리밍)")
+def export_users(
+    user_id: int = Depends(current_user_id),
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    after_id: Optional[int] = Query(None, description="Only users with id > this value (last id of the previous export)")
+):
+    return export_response(users_export_stmt(after_id), fmt, "users")
+
 @router.get("/{user_login_email}", description="User 상세정보 불러오기 API")
-def get_user(user_login_email: str, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    verify_token(credentials)
+def get_user(user_login_email: str, user_id: int = Depends(current_user_id), db: Session = Depends(get_read_db),
+             if_none_match: Optional[str] = Header(None)):
     user = db.query(User).filter(User.login_email == user_login_email).first()
-    if not user:
-        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
-    return ResponseDto.success_response(data=user.to_dict())
+    return user_detail_response(user, if_none_match)
 
 @router.post("/", description="User 생성 API")
-def create_user(user: CreateUserDTO, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    user_id = verify_token(credentials)
+def create_user(user: CreateUserDTO, user_id: int = Depends(current_user_id), db: Session = Depends(get_db)):
 
     # 사용자 중복 확인
     existing_user = db.query(User).filter(User.login_email == user.login_email).first()
@@ -53,42 +200,148 @@ def create_user(user: CreateUserDTO, credentials: HTTPAuthorizationCredentials =
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    invalidate_count(User)
     return ResponseDto.success_response(data=new_user.to_dict())
 
+@router.post("/bulk", description="User 일괄 등록 API (JSON 배열 또는 NDJSON)")
+async def create_users_bulk(request: Request, user_id: int = Depends(current_user_id), db: Session = Depends(get_db)):
+    try:
+        rows = await read_bulk_rows(request)
+    except InvalidBulkRequest:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+
+    async def prepare_chunk(valid):
+        existing_emails = await run_in_threadpool(find_existing_emails, db, [values["login_email"] for _, values in valid])
+        return await prepare_bulk_users(valid, existing_emails)
+
+    result = await run_bulk(rows, CreateUserDTO, lambda values: run_in_threadpool(insert_users, db, values), prepare_chunk)
+    if result["inserted"]:
+        invalidate_count(User)
+    return ResponseDto.fast_success_response(data=result, total_count=len(rows))
+
 @router.put("/", description="User 정보 수정 API")
-def update_user(user: UpdateUserDTO, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    user_id = verify_token(credentials)
+def update_user(user: UpdateUserDTO, user_id: int = Depends(current_user_id), db: Session = Depends(get_db)):
     existing_user = db.query(User).filter(User.id == user_id).first()
     if not existing_user:
         return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
 
     # 변경 사항 기록
-    changes = []
-    for key, value in user.dict().items():
-        if getattr(existing_user, key) != value:
-            changes.append(f"{key}: {getattr(existing_user, key)} -> {value}")
-            setattr(existing_user, key, value)
+    changes = apply_user_changes(existing_user, user)
     if changes:
-        db.add(UserUpdateLog(user_id=user_id, updated_by=user_id, changes=", ".join(changes)))
+        audit_writer.record(db, "update", {"user_id": user_id, "updated_by": str(user_id), "changes": changes})
     db.commit()
     db.refresh(existing_user)
     return ResponseDto.success_response(data=existing_user.to_dict())
 
 @router.delete("/", description="User 삭제 API")
-def delete_user(reason: str, credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
-    user_id = verify_token(credentials)
+def delete_user(reason: str, user_id: int = Depends(current_user_id), db: Session = Depends(get_db)):
     existing_user = db.query(User).filter(User.id == user_id).first()
     if not existing_user:
         return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
     # 삭제 이력 추가
-    db.add(UserDeleteLog(user_id=user_id, login_email=existing_user.login_email, reason=reason))
+    audit_writer.record(db, "delete", {"user_id": user_id, "login_email": existing_user.login_email, "reason": reason})
     # 사용자 삭제
     db.delete(existing_user)
     db.commit()
+    invalidate_count(User)
+    return ResponseDto.success_response(data={"reason": reason})
+
+
+# AsyncSession 기반 핸들러 (USE_ASYNC_DB=true 인 경우 위의 동기 핸들러 대신 사용)
+async_router = APIRouter(prefix="/users")
+
+@async_router.get("/", description="User 목록 불러오기 API")
+async def get_users_async(
+    user_id: int = Depends(current_user_id),
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(10, ge=1, le=100, description="Number of users to return"),
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor for keyset pagination (next_cursor of the previous page)"),
+    count_strategy: Optional[CountStrategy] = Query(None, description="How total_count is computed (default: USER_COUNT_STRATEGY)")
+):
+    stmt = users_page_stmt(limit, offset, cursor)
+    if stmt is None:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+    items = (await db.execute(stmt)).scalars().all()
+    total_count, used_strategy = await count_rows_async(db, User, count_strategy)
+    return users_page_response(items, limit, total_count, used_strategy)
+
+@async_router.get("/export", description="User 전체 내보내기 API (NDJSON / CSV 스트리밍)")
+async def export_users_async(
+    user_id: int = Depends(current_user_id),
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    after_id: Optional[int] = Query(None, description="Only users with id > this value (last id of the previous export)")
+):
+    return export_response(users_export_stmt(after_id), fmt, "users", async_session=True)
+
+@async_router.get("/{user_login_email}", description="User 상세정보 불러오기 API")
+async def get_user_async(user_login_email: str, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_read_db),
+                         if_none_match: Optional[str] = Header(None)):
+    user = (await db.execute(select(User).where(User.login_email == user_login_email))).scalars().first()
+    return user_detail_response(user, if_none_match)
+
+@async_router.post("/", description="User 생성 API")
+async def create_user_async(user: CreateUserDTO, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db)):
+
+    # 사용자 중복 확인
+    existing_user = (await db.execute(select(User.id).where(User.login_email == user.login_email))).first()
+    if existing_user:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+
+    new_user = User(**user.dict())
+    new_user.password = await get_password_hash_async(new_user.password)
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    invalidate_count(User)
+    return ResponseDto.success_response(data=new_user.to_dict())
+
+@async_router.post("/bulk", description="User 일괄 등록 API (JSON 배열 또는 NDJSON)")
+async def create_users_bulk_async(request: Request, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db)):
+    try:
+        rows = await read_bulk_rows(request)
+    except InvalidBulkRequest:
+        return ResponseDto.error_response(ErrorType.BAD_REQUEST)
+
+    async def prepare_chunk(valid):
+        existing_emails = await find_existing_emails_async(db, [values["login_email"] for _, values in valid])
+        return await prepare_bulk_users(valid, existing_emails)
+
+    result = await run_bulk(rows, CreateUserDTO, lambda values: insert_users_async(db, values), prepare_chunk)
+    if result["inserted"]:
+        invalidate_count(User)
+    return ResponseDto.fast_success_response(data=result, total_count=len(rows))
+
+@async_router.put("/", description="User 정보 수정 API")
+async def update_user_async(user: UpdateUserDTO, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db)):
+    existing_user = await db.get(User, user_id)
+    if not existing_user:
+        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
+
+    # 변경 사항 기록
+    changes = apply_user_changes(existing_user, user)
+    if changes:
+        audit_writer.record(db, "update", {"user_id": user_id, "updated_by": str(user_id), "changes": changes})
+    await db.commit()
+    await db.refresh(existing_user)
+    return ResponseDto.success_response(data=existing_user.to_dict())
+
+@async_router.delete("/", description="User 삭제 API")
+async def delete_user_async(reason: str, user_id: int = Depends(current_user_id), db: AsyncSession = Depends(get_async_db)):
+    existing_user = await db.get(User, user_id)
+    if not existing_user:
+        return ResponseDto.error_response(ErrorType.USER_NOT_FOUND)
+    # 삭제 이력 추가
+    audit_writer.record(db, "delete", {"user_id": user_id, "login_email": existing_user.login_email, "reason": reason})
+    # 사용자 삭제
+    await db.delete(existing_user)
+    await db.commit()
+    invalidate_count(User)
     return ResponseDto.success_response(data={"reason": reason})
 
-app.include_router(router)
+app.include_router(async_router if USE_ASYNC_DB else router)
+app.include_router(monitoring_router)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    from common.server import run
+    run(app, port=8002)
@@ -0,0 +1,154 @@
+"""
+user.py / post.py 동시 요청 측정
+
+서비스를 별도 프로세스(멀티 스레드 개발 서버)로 띄우고, 여러 클라이언트 스레드가 정해진 시간 동안
+조회(GET)와 수정(POST / PUT)을 섞어 보내면서 읽기 / 쓰기 RPS와 오류(database is locked -> 500) 비율을 측정한다.
+요청마다 연결을 여는 기존 방식(SQLITE_REUSE_CONNECTIONS=false)과 연결 재사용 + WAL 방식을 차례로 측정한다.
+
+    python benchmark.py --service user --clients 16 --seconds 10 --write-ratio 0.3
+
+측정 결과 (1 vCPU, 8초):
+
+| 서비스 / 설정 | 방식 | 읽기 RPS | 쓰기 RPS | 오류 비율 |
+| --- | --- | --- | --- | --- |
+| user, 16 clients, 쓰기 30% | per-request | 221.6 | 95.6 | 0% |
+| user, 16 clients, 쓰기 30% | reuse+wal | 281.4 | 123.0 | 0% |
+| post, 32 clients, 쓰기 70% | per-request | 75.4 | 182.4 | 0% |
+| post, 32 clients, 쓰기 70% | reuse+wal | 113.9 | 269.8 | 0% |
+
+CPU가 하나라 쓰기가 실제로 겹치는 경우가 적어 두 방식 모두 잠금 오류는 재현되지 않았다
+(기존 방식도 sqlite3.connect 기본 timeout 5초 동안은 잠금을 기다린다).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SERVICES = {
+    "user": {
+        "db_env": "USERS_DB",
+        "path": "/users",
+        "body": lambda i: {"name": f"user{i}", "gender": "M", "age": 20 + i % 50, "phone": f"010-{i:08d}"},
+    },
+    "post": {
+        "db_env": "POSTS_DB",
+        "path": "/posts",
+        "body": lambda i: {"title": f"title{i}", "content": "content " * 20, "author": f"author{i % 100}"},
+    },
+}
+
+MODES = {
+    "per-request": {"SQLITE_REUSE_CONNECTIONS": "false"},
+    "reuse+wal": {"SQLITE_REUSE_CONNECTIONS": "true"},
+}
+
+
+def serve(service, port):
+    from werkzeug.serving import make_server
+
+    module = __import__(service)
+    module.init_db()
+    make_server("127.0.0.1", port, module.app, threaded=True).serve_forever()
+
+
+def start_server(service, port, db_path, env):
+    process = subprocess.Popen([sys.executable, __file__, "--serve", service, "--port", str(port)], cwd=HERE,
+                               env={**os.environ, **env, SERVICES[service]["db_env"]: db_path},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}{SERVICES[service]['path']}/1", timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"{service} did not start")
+
+
+def run_clients(service, base_url, clients, seconds, write_ratio, seed_rows):
+    spec = SERVICES[service]
+    counts = {"read": 0, "write": 0, "read_errors": 0, "write_errors": 0}
+    lock = threading.Lock()
+    deadline = time.time() + seconds
+
+    def client(index):
+        rng = random.Random(index)
+        session = requests.Session()
+        local = dict.fromkeys(counts, 0)
+        while time.time() < deadline:
+            row_id = rng.randint(1, seed_rows)
+            if rng.random() < write_ratio:
+                kind = "write"
+                body = spec["body"](row_id)
+                if rng.random() < 0.5:
+                    response = session.post(f"{base_url}{spec['path']}", json=body)
+                else:
+                    response = session.put(f"{base_url}{spec['path']}/{row_id}", json=body)
+            else:
+                kind = "read"
+                response = session.get(f"{base_url}{spec['path']}/{row_id}")
+            local[kind] += 1
+            if response.status_code >= 500:
+                local[f"{kind}_errors"] += 1
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "read_rps": round(counts["read"] / seconds, 1),
+        "write_rps": round(counts["write"] / seconds, 1),
+        "read_error_rate": round(counts["read_errors"] / max(counts["read"], 1), 4),
+        "write_error_rate": round(counts["write_errors"] / max(counts["write"], 1), 4),
+    }
+
+
+def measure(service, mode, args):
+    with tempfile.TemporaryDirectory() as directory:
+        process = start_server(service, args.port, os.path.join(directory, f"{service}.db"), MODES[mode])
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            session = requests.Session()
+            for index in range(1, args.seed_rows + 1):
+                session.post(f"{base_url}{SERVICES[service]['path']}", json=SERVICES[service]["body"](index))
+            return run_clients(service, base_url, args.clients, args.seconds, args.write_ratio, args.seed_rows)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def main(args):
+    results = {mode: measure(args.service, mode, args) for mode in args.modes}
+    print(json.dumps({"service": args.service, "clients": args.clients, "write_ratio": args.write_ratio,
+                      **results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sqlite 연결 방식별 동시 요청 측정")
+    parser.add_argument("--service", choices=SERVICES, default="user")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--seed-rows", type=int, default=200)
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--serve", choices=SERVICES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port)
+    else:
+        main(args)
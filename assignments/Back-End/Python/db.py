@@ -0,0 +1,93 @@
+import os
+import queue
+import sqlite3
+
+from flask import g
+
+# 연결 재사용 여부 (false이면 요청마다 연결을 열고 닫는 기존 방식, 비교 측정용)
+SQLITE_REUSE_CONNECTIONS = os.getenv("SQLITE_REUSE_CONNECTIONS", "true").lower() == "true"
+# 쓰기 잠금을 기다리는 최대 시간 (이 시간 안에 잠금이 풀리면 database is locked 오류 없이 진행)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# WAL 모드에서 NORMAL은 커밋마다 fsync하지 않음 (전원 장애 시 마지막 커밋만 유실될 수 있고 DB는 손상되지 않음)
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# 연결별로 준비(prepare)된 SQL 문을 보관하는 수
+SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "64"))
+# 보관하는 유휴 연결 수 (요청 스레드 수보다 많이 동시에 필요하면 새로 열고, 반납 시 남는 연결은 닫음)
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "16"))
+
+
+class Database:
+    """sqlite 연결 관리자
+
+    요청 동안 쓸 연결을 풀에서 꺼내 Flask g에 두고, 요청이 끝나면(teardown) 풀에 반납한다.
+    개발 서버는 요청마다 새 스레드를 만들기 때문에 스레드별로 연결을 보관하면 재사용되지 않아,
+    스레드 대신 풀에 보관하고 한 연결은 한 번에 한 요청(스레드)만 사용한다.
+    """
+
+    def __init__(self, path: str, schema: str = None):
+        self.path = path
+        self.schema = schema
+        self._idle = queue.LifoQueue(maxsize=SQLITE_POOL_SIZE)
+
+    def init_app(self, app):
+        app.teardown_appcontext(self._teardown)
+
+    def connect(self):
+        if not SQLITE_REUSE_CONNECTIONS:
+            return sqlite3.connect(self.path)
+        conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                               cached_statements=SQLITE_CACHED_STATEMENTS, check_same_thread=False)
+        # WAL: 읽기가 쓰기를 기다리지 않음 (설정은 DB 파일에 유지됨)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        return conn
+
+    def init_db(self):
+        conn = self.connect()
+        try:
+            conn.execute(self.schema)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def acquire(self):
+        if not SQLITE_REUSE_CONNECTIONS:
+            return self.connect()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.connect()
+
+    def release(self, conn):
+        if not SQLITE_REUSE_CONNECTIONS:
+            conn.close()
+            return
+        # 커밋하지 않은 트랜잭션이 남아 있으면 잠금을 쥔 채로 반납되지 않도록 롤백
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    # 현재 요청의 연결 (요청 안에서는 같은 연결을 사용)
+    def get(self):
+        key = f"sqlite:{self.path}"
+        conn = g.get(key)
+        if conn is None:
+            conn = self.acquire()
+            setattr(g, key, conn)
+        return conn
+
+    def _teardown(self, exception):
+        conn = g.pop(f"sqlite:{self.path}", None)
+        if conn is not None:
+            self.release(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -1,37 +1,32 @@
 from flask import Flask, request, jsonify
-import sqlite3
+import os
+
+from db import Database
 
 app = Flask(__name__)
+db = Database(os.getenv("USERS_DB", "users.db"),
+              '''CREATE TABLE IF NOT EXISTS users
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, gender TEXT, age INTEGER, phone TEXT)''')
+db.init_app(app)
 
 # 데이터베이스 초기화
 def init_db():
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute('''CREATE TABLE IF NOT EXISTS users
-                      (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, gender TEXT, age INTEGER, phone TEXT)''')
-    conn.commit()
-    conn.close()
+    db.init_db()
 
 # 사용자 추가
 @app.route('/users', methods=['POST'])
 def add_user():
     data = request.get_json()
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO users (name, gender, age, phone) VALUES (?, ?, ?, ?)",
-                   (data['name'], data['gender'], data['age'], data['phone']))
+    conn = db.get()
+    conn.execute("INSERT INTO users (name, gender, age, phone) VALUES (?, ?, ?, ?)",
+                 (data['name'], data['gender'], data['age'], data['phone']))
     conn.commit()
-    conn.close()
     return jsonify({"message": "User added"}), 201
 
 # 사용자 정보 가져오기
 @app.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-    user = cursor.fetchone()
-    conn.close()
+    user = db.get().execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
     if user:
         return jsonify({"id": user[0], "name": user[1], "gender": user[2], "age": user[3], "phone": user[4]})
     else:
@@ -41,22 +36,18 @@ def get_user(user_id):
 @app.route('/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
     data = request.get_json()
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET name = ?, gender = ?, age = ?, phone = ? WHERE id = ?",
-                   (data['name'], data['gender'], data['age'], data['phone'], user_id))
+    conn = db.get()
+    conn.execute("UPDATE users SET name = ?, gender = ?, age = ?, phone = ? WHERE id = ?",
+                 (data['name'], data['gender'], data['age'], data['phone'], user_id))
     conn.commit()
-    conn.close()
     return jsonify({"message": "User updated"}), 200
 
 # 사용자 삭제
 @app.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
+    conn = db.get()
+    conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
     conn.commit()
-    conn.close()
     return jsonify({"message": "User deleted"}), 200
 
 if __name__ == '__main__':
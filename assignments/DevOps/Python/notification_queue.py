@@ -0,0 +1,352 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from user_client import UserServiceError
+
+logger = logging.getLogger(__name__)
+
+# 알림 큐 설정 (memory: 프로세스 내 큐, sqlite: 재시작해도 남는 큐)
+NOTIFY_QUEUE_BACKEND = os.getenv("NOTIFY_QUEUE_BACKEND", "memory").lower()
+NOTIFY_QUEUE_PATH = os.getenv("NOTIFY_QUEUE_PATH", "notifications.db")
+# memory 큐에 쌓아둘 수 있는 최대 알림 수 (가득 차면 /notify가 503으로 응답)
+NOTIFY_QUEUE_MAX_SIZE = int(os.getenv("NOTIFY_QUEUE_MAX_SIZE", "10000"))
+# sqlite 큐에서 꺼낸 알림을 처리 중으로 잡아두는 시간 (이 안에 완료되지 않으면 다시 꺼낼 수 있음)
+NOTIFY_QUEUE_LEASE_SECONDS = float(os.getenv("NOTIFY_QUEUE_LEASE_SECONDS", "60"))
+NOTIFY_WORKERS = int(os.getenv("NOTIFY_WORKERS", "4"))
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "100"))
+# 재시도 설정 (NOTIFY_RETRY_BASE_SECONDS * 2^(시도 횟수 - 1), 최대 NOTIFY_RETRY_MAX_SECONDS)
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "5"))
+NOTIFY_RETRY_BASE_SECONDS = float(os.getenv("NOTIFY_RETRY_BASE_SECONDS", "0.5"))
+NOTIFY_RETRY_MAX_SECONDS = float(os.getenv("NOTIFY_RETRY_MAX_SECONDS", "30"))
+
+
+def new_notification(user_id: int, title: str):
+    return {"user_id": user_id, "title": title, "enqueued_at": time.time(), "attempts": 0}
+
+
+class QueueFull(Exception):
+    """큐가 가득 차 알림을 받을 수 없는 경우"""
+
+
+class InMemoryQueue:
+    """프로세스 내 알림 큐 (재시도할 알림은 available_at 이후에 다시 꺼냄)
+
+    새 알림은 max_size까지만 받고(QueueFull), 이미 받은 알림의 재시도는 크기와 관계없이 다시 넣는다.
+    """
+
+    def __init__(self, max_size: int = NOTIFY_QUEUE_MAX_SIZE):
+        self.max_size = max_size
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def put(self, notification, delay: float = 0.0):
+        with self._condition:
+            if len(self._heap) >= self.max_size:
+                raise QueueFull(f"notification queue is full ({self.max_size})")
+            self._push(notification, delay)
+
+    def _push(self, notification, delay: float):
+        with self._condition:
+            heapq.heappush(self._heap, (time.time() + delay, next(self._sequence), notification))
+            self._condition.notify()
+
+    def get_batch(self, max_items: int, timeout: float):
+        """꺼낼 수 있는 알림을 최대 max_items개 반환 (없으면 timeout 동안 기다린 뒤 빈 목록)"""
+        deadline = time.time() + timeout
+        with self._condition:
+            while True:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    batch = []
+                    while self._heap and self._heap[0][0] <= now and len(batch) < max_items:
+                        batch.append(heapq.heappop(self._heap)[2])
+                    return batch
+                if now >= deadline:
+                    return []
+                wait = deadline - now
+                if self._heap:
+                    wait = min(wait, self._heap[0][0] - now)
+                self._condition.wait(wait)
+
+    def ack(self, notifications):
+        pass
+
+    def retry(self, notification, delay: float):
+        self._push(notification, delay)
+
+    def depth(self):
+        return len(self._heap)
+
+    def close(self):
+        pass
+
+
+class SqliteQueue:
+    """sqlite 파일에 저장하는 알림 큐
+
+    꺼낸 알림은 삭제하지 않고 lease 시간 동안 다른 작업자가 꺼내지 못하게만 하며, 처리가 끝나면(ack) 삭제한다.
+    처리 도중 프로세스가 종료되어도 lease가 지나면 다시 꺼내지므로 알림이 유실되지 않는다 (대신 중복 전송될 수 있음).
+    """
+
+    def __init__(self, path: str, lease_seconds: float = NOTIFY_QUEUE_LEASE_SECONDS):
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''CREATE TABLE IF NOT EXISTS notifications
+                              (id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL,
+                               available_at REAL NOT NULL)''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_notifications_available_at ON notifications (available_at)")
+
+    def put(self, notification, delay: float = 0.0):
+        with self._lock:
+            self._conn.execute("INSERT INTO notifications (payload, available_at) VALUES (?, ?)",
+                               (json.dumps(notification), time.time() + delay))
+        self._ready.set()
+
+    def _claim(self, max_items: int):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute("SELECT id, payload FROM notifications WHERE available_at <= ? "
+                                          "ORDER BY available_at LIMIT ?", (now, max_items)).fetchall()
+                self._conn.executemany("UPDATE notifications SET available_at = ? WHERE id = ?",
+                                       [(now + self.lease_seconds, row[0]) for row in rows])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [{**json.loads(payload), "id": row_id} for row_id, payload in rows]
+
+    def get_batch(self, max_items: int, timeout: float):
+        deadline = time.time() + timeout
+        while True:
+            self._ready.clear()
+            batch = self._claim(max_items)
+            remaining = deadline - time.time()
+            if batch or remaining <= 0:
+                return batch
+            # 새 알림이 들어오면 바로 깨어나고, 재시도 대기 중인 알림을 위해 주기적으로 다시 확인
+            self._ready.wait(min(remaining, 0.5))
+
+    def ack(self, notifications):
+        with self._lock:
+            self._conn.executemany("DELETE FROM notifications WHERE id = ?",
+                                   [(notification["id"],) for notification in notifications])
+
+    def retry(self, notification, delay: float):
+        payload = {key: value for key, value in notification.items() if key != "id"}
+        with self._lock:
+            self._conn.execute("UPDATE notifications SET payload = ?, available_at = ? WHERE id = ?",
+                               (json.dumps(payload), time.time() + delay, notification["id"]))
+
+    def depth(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_queue():
+    if NOTIFY_QUEUE_BACKEND == "sqlite":
+        return SqliteQueue(NOTIFY_QUEUE_PATH)
+    if NOTIFY_QUEUE_BACKEND == "memory":
+        return InMemoryQueue()
+    raise ValueError(f"Unknown NOTIFY_QUEUE_BACKEND: {NOTIFY_QUEUE_BACKEND}")
+
+
+def send_notification(user, notification):
+    print(f'Sending notification to {user["email"]}: New post titled "{notification["title"]}"')
+
+
+class NotificationDispatcher:
+    """큐에서 알림을 묶음으로 꺼내 전송하는 작업자 스레드 풀
+
+    한 묶음 안의 알림은 사용자별로 모아 묶음의 사용자 정보를 한 번의 요청으로 조회하고,
+    User 서비스 장애나 전송 실패 시에는 지수 백오프로 다시 큐에 넣는다 (NOTIFY_MAX_ATTEMPTS회 실패하면 버림).
+    예상하지 못한 오류로 작업자 스레드가 종료되면 다음 enqueue에서 다시 시작한다.
+    """
+
+    def __init__(self, queue, user_client, workers: int = NOTIFY_WORKERS, batch_size: int = NOTIFY_BATCH_SIZE,
+                 max_attempts: int = NOTIFY_MAX_ATTEMPTS, retry_base_seconds: float = NOTIFY_RETRY_BASE_SECONDS,
+                 retry_max_seconds: float = NOTIFY_RETRY_MAX_SECONDS, send=send_notification):
+        self.queue = queue
+        self.user_client = user_client
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.send = send
+        self._threads = []
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.not_found = 0
+        self.retried = 0
+        self.failed = 0
+        self.send_errors = 0
+        self.worker_errors = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_notifications = 0
+        self.max_batch_size = 0
+        self.user_lookups = 0
+        # 최근 전송한 알림의 큐 등록부터 전송까지 걸린 시간
+        self._latencies = deque(maxlen=1000)
+
+    def _new_worker(self, index: int):
+        thread = threading.Thread(target=self._run, name=f"notify-worker-{index}", daemon=True)
+        thread.start()
+        return thread
+
+    def ensure_started(self):
+        """작업자 스레드를 시작하고, 종료된 스레드가 있으면 새로 시작"""
+        if len(self._threads) == self.workers and all(thread.is_alive() for thread in self._threads):
+            return
+        with self._start_lock:
+            self._stop.clear()
+            threads = self._threads + [None] * (self.workers - len(self._threads))
+            self._threads = [thread if thread is not None and thread.is_alive() else self._new_worker(index)
+                             for index, thread in enumerate(threads)]
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, user_id: int, title: str):
+        """큐에 알림 추가 (큐가 가득 차면 QueueFull)"""
+        self.ensure_started()
+        try:
+            self.queue.put(new_notification(user_id, title))
+        except QueueFull:
+            self._count(rejected=1)
+            raise
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = self.queue.get_batch(self.batch_size, timeout=0.5)
+            except Exception:  # noqa: BLE001 - 큐 오류로 스레드가 종료되지 않도록 잠시 후 다시 시도
+                logger.exception("failed to read notification queue")
+                self._count(worker_errors=1)
+                self._stop.wait(1.0)
+                continue
+            if not batch:
+                continue
+            try:
+                self.process_batch(batch)
+            except Exception:  # noqa: BLE001 - 처리하지 못한 묶음은 백오프 후 다시 시도
+                logger.exception("failed to process notification batch")
+                self._count(worker_errors=1)
+                self._retry_or_fail(batch)
+
+    def _backoff(self, attempts: int):
+        delay = min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _retry_or_fail(self, notifications):
+        for notification in notifications:
+            notification["attempts"] += 1
+            try:
+                if notification["attempts"] >= self.max_attempts:
+                    self.queue.ack([notification])
+                    self._count(failed=1)
+                else:
+                    self.queue.retry(notification, self._backoff(notification["attempts"]))
+                    self._count(retried=1)
+            except Exception:  # noqa: BLE001 - sqlite 큐는 lease가 지나면 다시 꺼내짐
+                logger.exception("failed to reschedule notification")
+
+    def process_batch(self, batch):
+        self._count(batches=1, batched_notifications=len(batch))
+        with self._lock:
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+        by_user = {}
+        for notification in batch:
+            by_user.setdefault(notification["user_id"], []).append(notification)
+
+        # 묶음에 포함된 사용자를 한 번에 조회 (GET /users?ids=)
+        self._count(user_lookups=len(by_user))
+        try:
+            users = self.user_client.get_users(list(by_user))
+        except Exception as error:  # noqa: BLE001 - User 서비스 장애 외의 오류도 같은 방식으로 재시도
+            if not isinstance(error, UserServiceError):
+                logger.exception("failed to look up users for notifications")
+            self._retry_or_fail(batch)
+            return
+
+        for user_id, notifications in by_user.items():
+            user = users.get(user_id)
+            if user is None:
+                self.queue.ack(notifications)
+                self._count(not_found=len(notifications))
+                continue
+            delivered, undelivered = [], []
+            for notification in notifications:
+                try:
+                    self.send(user, notification)
+                except Exception:  # noqa: BLE001 - 전송에 실패한 알림만 백오프 후 다시 시도
+                    logger.exception("failed to send notification to user %s", user_id)
+                    undelivered.append(notification)
+                else:
+                    delivered.append(notification)
+            if undelivered:
+                self._count(send_errors=len(undelivered))
+                self._retry_or_fail(undelivered)
+            if not delivered:
+                continue
+            self.queue.ack(delivered)
+            now = time.time()
+            with self._lock:
+                self.sent += len(delivered)
+                self._latencies.extend(now - notification["enqueued_at"] for notification in delivered)
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+        return {
+            "queue_depth": self.queue.depth(),
+            "workers": sum(thread.is_alive() for thread in self._threads),
+            "sent": self.sent,
+            "not_found": self.not_found,
+            "retried": self.retried,
+            "failed": self.failed,
+            "send_errors": self.send_errors,
+            "worker_errors": self.worker_errors,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_notifications / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "user_lookups": self.user_lookups,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+        }
@@ -1,20 +1,32 @@
 from flask import Flask, request, jsonify
-import requests
+
+from notification_queue import NotificationDispatcher, QueueFull, create_queue
+from user_client import UserClient
 
 app = Flask(__name__)
+# User 서비스 조회 클라이언트 (연결 재사용, 제한 시간, 사용자 정보 캐시)
+user_client = UserClient()
+# 알림은 큐에 넣고 바로 응답하며, 작업자 스레드가 묶음으로 꺼내 전송
+dispatcher = NotificationDispatcher(create_queue(), user_client)
+# 재시작 전에 sqlite 큐에 남아 있던 알림도 새 요청을 기다리지 않고 바로 전송
+dispatcher.ensure_started()
 
 @app.route('/notify', methods=['POST'])
 def notify_user():
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data.get("userId"), int) or not isinstance(data.get("title"), str):
+        return jsonify({'error': 'userId and title are required'}), 400
+
+    try:
+        dispatcher.enqueue(data["userId"], data["title"])
+    except QueueFull:
+        # 큐가 가득 차면 받지 않고 잠시 후 다시 보내도록 응답 (backpressure)
+        return jsonify({'error': 'Notification queue is full'}), 503, {'Retry-After': '1'}
+    return jsonify({'message': 'Notification queued'}), 202
 
-    # User 서비스로부터 사용자 정보 조회
-    response = requests.get(f'http://user-service:5001/users/{data["userId"]}')
-    if response.status_code == 200:
-        user = response.json()
-        print(f'Sending notification to {user["email"]}: New post titled "{data["title"]}"')
-        return jsonify({'message': 'Notification sent'}), 200
-    else:
-        return jsonify({'error': 'User not found'}), 404
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({'user_cache': user_client.stats(), 'dispatcher': dispatcher.stats()})
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5003)
@@ -0,0 +1,172 @@
+import time
+
+import pytest
+
+import post
+from notification_queue import InMemoryQueue, NotificationDispatcher, SqliteQueue, new_notification
+from user_client import UserServiceError
+
+
+class StubUserClient:
+    """조회 횟수를 세는 User 서비스 클라이언트 대역 (failures번 실패한 뒤 정상 응답)"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.lookups = []
+
+    def get_user(self, user_id):
+        self.lookups.append(user_id)
+        if self.failures:
+            self.failures -= 1
+            raise UserServiceError("user-service unavailable")
+        return None if user_id >= 1000 else {"id": user_id, "email": f"user{user_id}@example.com"}
+
+    def get_users(self, user_ids):
+        return {user_id: self.get_user(user_id) for user_id in user_ids}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    queue = InMemoryQueue() if request.param == "memory" else SqliteQueue(str(tmp_path / "notifications.db"))
+    yield queue
+    queue.close()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+# 한 묶음 안의 알림은 사용자별로 한 번만 조회
+def test_batch_resolves_each_user_once(queue):
+    sent = []
+    dispatcher = NotificationDispatcher(queue, StubUserClient(), workers=1,
+                                        send=lambda user, notification: sent.append((user["id"], notification["title"])))
+    for index in range(6):
+        queue.put(new_notification(index % 2 + 1, f"post {index}"))
+    queue.put(new_notification(1000, "missing"))
+
+    dispatcher.process_batch(queue.get_batch(100, timeout=0))
+    assert sorted(dispatcher.user_client.lookups) == [1, 2, 1000]
+    assert len(sent) == 6
+    stats = dispatcher.stats()
+    assert (stats["sent"], stats["not_found"], stats["queue_depth"], stats["max_batch_size"]) == (6, 1, 0, 7)
+
+
+# User 서비스 장애 시 백오프 후 재시도하고, 최대 시도 횟수를 넘으면 버림
+def test_retries_with_backoff_then_fails(queue):
+    sent = []
+    dispatcher = NotificationDispatcher(queue, StubUserClient(failures=1), workers=2, retry_base_seconds=0.05,
+                                        send=lambda user, notification: sent.append(notification["title"]))
+    dispatcher.enqueue(1, "retried")
+    try:
+        wait_until(lambda: sent == ["retried"])
+    finally:
+        dispatcher.stop()
+    assert dispatcher.stats()["retried"] == 1
+    assert dispatcher.stats()["latency_p50_ms"] >= 25
+
+    failing = NotificationDispatcher(queue, StubUserClient(failures=10), max_attempts=2, retry_base_seconds=0.01)
+    queue.put(new_notification(1, "dropped"))
+    for _ in range(2):
+        failing.process_batch(queue.get_batch(100, timeout=1))
+    assert (failing.retried, failing.failed, queue.depth()) == (1, 1, 0)
+
+
+# 전송 중 예외가 나도 작업자는 계속 동작하고, 실패한 알림은 백오프 후 다시 전송
+def test_send_failure_is_retried_and_worker_survives(queue):
+    sent, failures = [], ["boom"]
+
+    def flaky_send(user, notification):
+        if failures and notification["title"] == "flaky":
+            raise RuntimeError(failures.pop())
+        sent.append(notification["title"])
+
+    dispatcher = NotificationDispatcher(queue, StubUserClient(), workers=1, retry_base_seconds=0.01, send=flaky_send)
+    dispatcher.enqueue(1, "flaky")
+    dispatcher.enqueue(2, "ok")
+    try:
+        wait_until(lambda: sorted(sent) == ["flaky", "ok"])
+        dispatcher.enqueue(3, "after")
+        wait_until(lambda: "after" in sent)
+        stats = dispatcher.stats()
+        assert (stats["send_errors"], stats["retried"], stats["failed"], stats["workers"]) == (1, 1, 0, 1)
+    finally:
+        dispatcher.stop()
+
+
+# 작업자 스레드가 종료되면 다음 enqueue에서 다시 시작
+def test_dead_worker_is_restarted():
+    dispatcher = NotificationDispatcher(InMemoryQueue(), StubUserClient(), workers=1)
+    dispatcher.ensure_started()
+    dispatcher._stop.set()
+    dispatcher._threads[0].join(5)
+    assert dispatcher.stats()["workers"] == 0
+
+    dispatcher.enqueue(1, "hello")
+    try:
+        assert dispatcher.stats()["workers"] == 1
+    finally:
+        dispatcher.stop()
+
+
+# sqlite 큐는 처리 중이던 알림도 lease가 지나면 다시 꺼낼 수 있음 (프로세스 재시작 대비)
+def test_sqlite_queue_survives_restart(tmp_path):
+    path = str(tmp_path / "notifications.db")
+    queue = SqliteQueue(path, lease_seconds=0.05)
+    queue.put(new_notification(1, "durable"))
+    assert [item["title"] for item in queue.get_batch(10, timeout=0)] == ["durable"]
+    queue.close()
+
+    reopened = SqliteQueue(path)
+    assert reopened.get_batch(10, timeout=0.5)[0]["title"] == "durable"
+    reopened.close()
+
+
+# post 서비스는 시작할 때 작업자를 띄우고, 새 enqueue 없이도 큐에 남아 있던 알림을 전송 (재시작 직후)
+def test_pending_notifications_drained_on_start(tmp_path):
+    assert post.dispatcher.stats()["workers"] == post.dispatcher.workers
+    path = str(tmp_path / "notifications.db")
+    queue = SqliteQueue(path)
+    queue.put(new_notification(1, "pending"))
+    queue.close()
+
+    sent = []
+    reopened = SqliteQueue(path)
+    dispatcher = NotificationDispatcher(reopened, StubUserClient(), workers=1,
+                                        send=lambda user, notification: sent.append(notification["title"]))
+    dispatcher.ensure_started()
+    try:
+        wait_until(lambda: sent == ["pending"])
+    finally:
+        dispatcher.stop()
+        reopened.close()
+
+
+def test_notify_enqueues_and_returns_202(monkeypatch):
+    queue = InMemoryQueue()
+    monkeypatch.setattr(post, "dispatcher", NotificationDispatcher(queue, StubUserClient(), workers=0))
+    client = post.app.test_client()
+    assert client.post("/notify", json={"userId": 1, "title": "hello"}).status_code == 202
+    assert client.post("/notify", json={"title": "hello"}).status_code == 400
+    assert queue.depth() == 1
+    assert client.get("/stats").get_json()["dispatcher"]["queue_depth"] == 1
+
+
+# memory 큐가 가득 차면 /notify는 503으로 응답 (재시도는 크기 제한과 관계없이 다시 넣음)
+def test_notify_returns_503_when_queue_is_full(monkeypatch):
+    queue = InMemoryQueue(max_size=1)
+    monkeypatch.setattr(post, "dispatcher", NotificationDispatcher(queue, StubUserClient(), workers=0))
+    client = post.app.test_client()
+    assert client.post("/notify", json={"userId": 1, "title": "first"}).status_code == 202
+    response = client.post("/notify", json={"userId": 2, "title": "second"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/stats").get_json()["dispatcher"]["rejected"] == 1
+
+    queue.retry(new_notification(3, "retried"), 0)
+    assert queue.depth() == 2
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import user
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    user.init_db()
+    client = user.app.test_client()
+    for index in range(5):
+        client.post("/users", json={"name": f"user{index}", "email": f"user{index}@example.com"})
+    return client
+
+
+# id 순 keyset 페이지, 다음 페이지가 있으면 X-Next-After-Id 헤더로 다음 after_id 전달
+def test_users_keyset_pagination(client):
+    first = client.get("/users?limit=2")
+    assert [row["id"] for row in first.get_json()] == [1, 2]
+    assert first.headers["X-Next-After-Id"] == "2"
+    last = client.get("/users?after_id=4&limit=2")
+    assert [row["id"] for row in last.get_json()] == [5]
+    assert "X-Next-After-Id" not in last.headers
+    assert client.get("/users?limit=0").status_code == 400
+
+
+# 페이지 파라미터가 없으면 전체 목록(JSON 배열 스트리밍), 정수가 아닌 after_id / limit는 400
+def test_users_without_paging_returns_all(client, monkeypatch):
+    monkeypatch.setattr(user, "DEFAULT_PAGE_SIZE", 2)
+    monkeypatch.setattr(user, "STREAM_CHUNK_SIZE", 2)
+    response = client.get("/users")
+    assert response.is_streamed
+    assert [row["id"] for row in json.loads(response.get_data(as_text=True))] == [1, 2, 3, 4, 5]
+    assert "X-Next-After-Id" not in response.headers
+    assert [row["id"] for row in client.get("/users?after_id=3").get_json()] == [4, 5]
+    assert client.get("/users?after_id=abc").status_code == 400
+    assert client.get("/users?format=ndjson&after_id=abc").status_code == 400
+    assert client.get("/users?limit=ten").status_code == 400
+
+
+def test_users_ndjson_stream(client, monkeypatch):
+    monkeypatch.setattr(user, "STREAM_CHUNK_SIZE", 2)
+    response = client.get("/users?format=ndjson&after_id=1")
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in response.get_data(as_text=True).splitlines()] == [2, 3, 4, 5]
+
+
+def test_users_bulk_lookup(client):
+    assert [row["name"] for row in client.get("/users?ids=3,1,3,99").get_json()] == ["user0", "user2"]
+    assert client.get("/users?ids=1,a").status_code == 400
@@ -0,0 +1,78 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+import requests
+from werkzeug.serving import make_server
+
+import user
+from user_client import AsyncUserClient, UserClient, UserServiceError
+
+
+# 임시 디렉터리의 users.db로 실제 user.py를 띄워 User 서비스 대역으로 사용
+@pytest.fixture(scope="module")
+def user_service(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(tmp_path_factory.mktemp("user-service"))
+        user.init_db()
+        server = make_server("127.0.0.1", 0, user.app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_port}"
+        server.shutdown()
+
+
+def create_user(base_url, name):
+    return requests.post(f"{base_url}/users", json={"name": name, "email": f"{name}@example.com"}).json()["id"]
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+# 같은 사용자는 TTL 동안 한 번만 조회하고, 없는 사용자(404)도 캐시
+def test_user_client_caches_users_and_not_found(user_service):
+    client = UserClient(user_service)
+    user_id = create_user(user_service, "cached")
+    assert client.get_user(user_id)["email"] == "cached@example.com"
+    assert client.get_user(user_id)["name"] == "cached"
+    assert client.get_user(999999) is None
+    assert client.get_user(999999) is None
+    assert client.stats() == {"size": 2, "hits": 1, "negative_hits": 1, "misses": 2}
+
+
+# 캐시에 없는 사용자만 GET /users?ids= 한 번으로 조회
+def test_user_client_bulk_lookup(user_service):
+    client = UserClient(user_service)
+    first, second = create_user(user_service, "bulk1"), create_user(user_service, "bulk2")
+    assert client.get_user(first)["name"] == "bulk1"
+    users = client.get_users([first, second, 999998, second])
+    assert {user_id: found and found["name"] for user_id, found in users.items()} == \
+        {first: "bulk1", second: "bulk2", 999998: None}
+    assert client.stats()["misses"] == 3
+    assert client.get_users([second, 999998]) == {second: users[second], 999998: None}
+
+
+def test_user_client_raises_when_service_is_down():
+    with pytest.raises(UserServiceError):
+        UserClient(closed_port_url()).get_user(1)
+
+
+def test_async_user_client(user_service):
+    user_id = create_user(user_service, "async")
+
+    async def lookup():
+        client = AsyncUserClient(user_service)
+        try:
+            users = await asyncio.gather(*(client.get_user(user_id) for _ in range(3)), client.get_user(999999))
+            return users, client.stats()
+        finally:
+            await client.aclose()
+
+    users, stats = asyncio.run(lookup())
+    assert [found and found["name"] for found in users] == ["async", "async", "async", None]
+    assert stats["size"] == 2
+
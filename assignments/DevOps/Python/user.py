@@ -1,8 +1,15 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+import json
 import sqlite3
 
 app = Flask(__name__)
 
+# 목록 조회 설정 (한 페이지 기본 / 최대 크기, 한 번에 조회할 수 있는 최대 ID 수, 스트리밍 시 한 번에 읽는 행 수)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BULK_IDS = 1000
+STREAM_CHUNK_SIZE = 500
+
 def init_db():
     conn = sqlite3.connect('users.db')
     c = conn.cursor()
@@ -34,14 +41,104 @@ def get_user(id):
     else:
         return jsonify({'error': 'User not found'}), 404
 
+def user_to_dict(row):
+    return {'id': row[0], 'name': row[1], 'email': row[2]}
+
+# ?ids=1,2,3 -> [1, 2, 3] (형식이 잘못되면 None)
+def parse_ids(value):
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+    except ValueError:
+        return None
+    return ids if 0 < len(ids) <= MAX_BULK_IDS else None
+
+# 여러 사용자 한 번에 조회 (없는 ID는 결과에서 빠짐)
+def get_users_by_ids(ids):
+    conn = sqlite3.connect('users.db')
+    c = conn.cursor()
+    c.execute(f"SELECT * FROM users WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id", ids)
+    users = c.fetchall()
+    conn.close()
+    return jsonify([user_to_dict(row) for row in users])
+
+# id 순으로 커서에서 STREAM_CHUNK_SIZE씩 읽어 사용자 목록 반환 (메모리 사용량이 일정)
+def iter_user_chunks(after_id):
+    conn = sqlite3.connect('users.db')
+    try:
+        c = conn.cursor()
+        c.execute("SELECT * FROM users WHERE id > ? ORDER BY id", (after_id,))
+        while True:
+            rows = c.fetchmany(STREAM_CHUNK_SIZE)
+            if not rows:
+                break
+            yield [user_to_dict(row) for row in rows]
+    finally:
+        conn.close()
+
+# 전체 사용자를 한 줄에 한 명씩(NDJSON) 스트리밍
+def stream_users(after_id):
+    def generate():
+        for users in iter_user_chunks(after_id):
+            yield ''.join(json.dumps(user) + '\n' for user in users)
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+# 전체 사용자를 기존과 같은 JSON 배열로 스트리밍 (전체 목록을 메모리에 올리지 않음)
+def stream_users_array():
+    def generate():
+        yield '['
+        separator = ''
+        for users in iter_user_chunks(0):
+            yield separator + ','.join(json.dumps(user) for user in users)
+            separator = ','
+        yield ']'
+
+    return Response(generate(), mimetype='application/json')
+
+# 정수 쿼리 파라미터 (없으면 default, 정수가 아니면 None)
+def int_arg(name, default):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+# 사용자 목록 조회
+# - 기본: 전체 목록 (기존 응답과 같은 JSON 배열을 스트리밍)
+# - ?after_id=&limit=: id 순 keyset 페이지, 다음 페이지가 있으면 X-Next-After-Id 헤더로 다음 after_id 전달
+# - ?ids=1,2,3: 여러 사용자 한 번에 조회
+# - ?format=ndjson: 전체 목록 스트리밍
 @app.route('/users', methods=['GET'])
 def get_all_users():
+    if 'ids' in request.args:
+        ids = parse_ids(request.args['ids'])
+        if ids is None:
+            return jsonify({'error': f'ids must be 1 to {MAX_BULK_IDS} comma separated integers'}), 400
+        return get_users_by_ids(ids)
+
+    after_id = int_arg('after_id', 0)
+    if after_id is None:
+        return jsonify({'error': 'after_id must be an integer'}), 400
+    if request.args.get('format') == 'ndjson':
+        return stream_users(after_id)
+
+    if 'after_id' not in request.args and 'limit' not in request.args:
+        return stream_users_array()
+
+    limit = int_arg('limit', DEFAULT_PAGE_SIZE)
+    if limit is None or not 0 < limit <= MAX_PAGE_SIZE:
+        return jsonify({'error': f'limit must be an integer between 1 and {MAX_PAGE_SIZE}'}), 400
     conn = sqlite3.connect('users.db')
     c = conn.cursor()
-    c.execute("SELECT * FROM users")
+    c.execute("SELECT * FROM users WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit))
     users = c.fetchall()
     conn.close()
-    return jsonify([{'id': row[0], 'name': row[1], 'email': row[2]} for row in users])
+    response = jsonify([user_to_dict(row) for row in users])
+    if len(users) == limit:
+        response.headers['X-Next-After-Id'] = str(users[-1][0])
+    return response
 
 if __name__ == '__main__':
     init_db()
@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# User 서비스 주소와 요청 제한 시간 (연결, 응답)
+USER_SERVICE_URL = os.getenv("USER_SERVICE_URL", "http://user-service:5001")
+USER_SERVICE_CONNECT_TIMEOUT = float(os.getenv("USER_SERVICE_CONNECT_TIMEOUT", "1"))
+USER_SERVICE_READ_TIMEOUT = float(os.getenv("USER_SERVICE_READ_TIMEOUT", "2"))
+# keep-alive로 유지하는 최대 연결 수 (Flask 워커 스레드 수 이상)
+USER_SERVICE_POOL_SIZE = int(os.getenv("USER_SERVICE_POOL_SIZE", "32"))
+# 사용자 정보 캐시 (없는 사용자(404)는 더 짧게 보관, TTL이 0이면 캐시 사용 안 함)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("USER_CACHE_NEGATIVE_TTL_SECONDS", "10"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+# GET /users?ids= 한 번에 조회하는 최대 사용자 수 (user.py의 MAX_BULK_IDS 이하)
+USER_BULK_SIZE = int(os.getenv("USER_BULK_SIZE", "500"))
+
+
+class UserServiceError(Exception):
+    """User 서비스가 응답하지 않거나 오류(5xx 등)를 반환한 경우"""
+
+
+# 캐시에 "없는 사용자"를 저장할 때 쓰는 값 (None은 캐시에 없음을 뜻함)
+NOT_FOUND = object()
+
+
+class TTLCache:
+    """항목마다 만료 시각을 가진 LRU 캐시"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if entry[0] is NOT_FOUND:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl: float):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        return {"size": len(self._entries), "hits": self.hits, "negative_hits": self.negative_hits,
+                "misses": self.misses}
+
+
+class BaseUserClient:
+    def __init__(self, base_url: str = None, cache: TTLCache = None, ttl: float = None, negative_ttl: float = None):
+        self.base_url = (base_url or USER_SERVICE_URL).rstrip("/")
+        self.cache = cache or TTLCache(USER_CACHE_SIZE)
+        self.ttl = USER_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.negative_ttl = USER_CACHE_NEGATIVE_TTL_SECONDS if negative_ttl is None else negative_ttl
+        self.timeout = (USER_SERVICE_CONNECT_TIMEOUT, USER_SERVICE_READ_TIMEOUT)
+
+    def _cached(self, user_id: int):
+        return self.cache.get(user_id)
+
+    # 응답을 캐시에 저장하고 사용자 정보(없으면 None) 반환
+    def _store(self, user_id: int, status_code: int, body):
+        if status_code == 404:
+            self.cache.set(user_id, NOT_FOUND, self.negative_ttl)
+            return None
+        if status_code != 200:
+            raise UserServiceError(f"user-service returned {status_code}")
+        self.cache.set(user_id, body, self.ttl)
+        return body
+
+    # 캐시에 있는 사용자와 조회가 필요한 사용자 ID로 나눔
+    def _split_cached(self, user_ids):
+        users, missing = {}, []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self._cached(user_id)
+            if cached is None:
+                missing.append(user_id)
+            else:
+                users[user_id] = None if cached is NOT_FOUND else cached
+        return users, missing
+
+    def _chunks(self, user_ids):
+        for start in range(0, len(user_ids), USER_BULK_SIZE):
+            yield user_ids[start:start + USER_BULK_SIZE]
+
+    # 여러 사용자 조회 결과를 캐시에 저장 (응답에 없는 ID는 없는 사용자로 저장)
+    def _store_bulk(self, users, user_ids, status_code: int, body):
+        if status_code != 200:
+            raise UserServiceError(f"user-service returned {status_code}")
+        found = {user["id"]: user for user in body}
+        for user_id in user_ids:
+            users[user_id] = self._store(user_id, 200 if user_id in found else 404, found.get(user_id))
+
+    def stats(self):
+        return self.cache.stats()
+
+
+class UserClient(BaseUserClient):
+    """User 서비스 조회 클라이언트 (keep-alive 연결 재사용, 제한 시간, TTL 캐시)"""
+
+    def __init__(self, base_url: str = None, pool_size: int = None, **kwargs):
+        super().__init__(base_url, **kwargs)
+        pool_size = pool_size or USER_SERVICE_POOL_SIZE
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_user(self, user_id: int):
+        """사용자 정보 반환 (없는 사용자면 None, User 서비스 장애 시 UserServiceError)"""
+        cached = self._cached(user_id)
+        if cached is not None:
+            return None if cached is NOT_FOUND else cached
+        try:
+            response = self.session.get(f"{self.base_url}/users/{user_id}", timeout=self.timeout)
+        except requests.RequestException as error:
+            raise UserServiceError(str(error)) from error
+        return self._store(user_id, response.status_code, response.json() if response.status_code == 200 else None)
+
+    def get_users(self, user_ids):
+        """여러 사용자 정보를 한 번에 조회 ({ID: 사용자 정보 또는 None}, 캐시에 없는 사용자만 GET /users?ids=로 조회)"""
+        users, missing = self._split_cached(user_ids)
+        for chunk in self._chunks(missing):
+            try:
+                response = self.session.get(f"{self.base_url}/users", params={"ids": ",".join(map(str, chunk))},
+                                            timeout=self.timeout)
+            except requests.RequestException as error:
+                raise UserServiceError(str(error)) from error
+            self._store_bulk(users, chunk, response.status_code, response.json() if response.status_code == 200 else None)
+        return users
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncUserClient(BaseUserClient):
+    """UserClient의 asyncio 버전 (httpx.AsyncClient, 이벤트 루프 하나에서 사용)"""
+
+    def __init__(self, base_url: str = None, pool_size: int = None, **kwargs):
+        import httpx
+
+        super().__init__(base_url, **kwargs)
+        pool_size = pool_size or USER_SERVICE_POOL_SIZE
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(USER_SERVICE_READ_TIMEOUT, connect=USER_SERVICE_CONNECT_TIMEOUT),
+        )
+
+    async def get_user(self, user_id: int):
+        cached = self._cached(user_id)
+        if cached is not None:
+            return None if cached is NOT_FOUND else cached
+        try:
+            response = await self.client.get(f"{self.base_url}/users/{user_id}")
+        except self._httpx.HTTPError as error:
+            raise UserServiceError(str(error)) from error
+        return self._store(user_id, response.status_code, response.json() if response.status_code == 200 else None)
+
+    async def get_users(self, user_ids):
+        users, missing = self._split_cached(user_ids)
+        for chunk in self._chunks(missing):
+            try:
+                response = await self.client.get(f"{self.base_url}/users", params={"ids": ",".join(map(str, chunk))})
+            except self._httpx.HTTPError as error:
+                raise UserServiceError(str(error)) from error
+            self._store_bulk(users, chunk, response.status_code, response.json() if response.status_code == 200 else None)
+        return users
+
+    async def aclose(self):
+        await self.client.aclose()